@@ -0,0 +1,12 @@
+"""
+Crawler benchmarks
+
+Run from the backend directory, e.g.:
+
+    uv run python -m benchmarks.bench_link_extraction --pages path/to/homepages
+"""
+import os
+
+# Benchmarks never reach the database or Gemini, but importing src loads settings
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://localhost/benchmark")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
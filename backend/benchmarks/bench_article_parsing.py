@@ -0,0 +1,66 @@
+"""
+Benchmark: html.parser full trees vs lxml + SubtreeStrainer for article pages
+
+Expects saved article pages in one sub-directory per crawler module in --pages,
+e.g. tuoi_tre/*.html, bbc/*.html. Every page is extracted in both modes; the
+resulting ArticleData must be identical, mismatches are listed.
+
+    uv run python -m benchmarks.bench_article_parsing --pages saved_articles/
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from .bench_link_extraction import SITES
+
+
+def _measure(crawler, url: str, html: bytes):
+    """Extract a page, returning (article, milliseconds, peak KiB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    article = crawler._parse_article(url, html)
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return article, elapsed, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", required=True, type=Path, help="Directory with saved article pages per site")
+    args = parser.parse_args()
+
+    print(f"{'site':<12} {'pages':>5} {'full ms':>9} {'fast ms':>9} {'full KiB':>9} {'fast KiB':>9} {'mismatch':>8}")
+    for site, (crawler_cls, source_url) in SITES.items():
+        pages = sorted((args.pages / site).glob("*.html"))
+        if not pages:
+            continue
+
+        full_crawler = crawler_cls(source_url)
+        full_crawler.fast_parse = False
+        fast_crawler = crawler_cls(source_url)
+        fast_crawler.fast_parse = True
+
+        totals = [0.0, 0.0, 0.0, 0.0]
+        mismatches = []
+        for page in pages:
+            html = page.read_bytes()
+            url = f"{source_url.rstrip('/')}/{page.stem}.htm"
+            full_article, full_ms, full_kib = _measure(full_crawler, url, html)
+            fast_article, fast_ms, fast_kib = _measure(fast_crawler, url, html)
+            totals = [totals[0] + full_ms, totals[1] + fast_ms, max(totals[2], full_kib), max(totals[3], fast_kib)]
+            if full_article != fast_article:
+                mismatches.append(page.name)
+
+        count = len(pages)
+        print(
+            f"{site:<12} {count:>5} {totals[0] / count:>9.2f} {totals[1] / count:>9.2f} "
+            f"{totals[2]:>9.0f} {totals[3]:>9.0f} {len(mismatches):>8}"
+        )
+        for name in mismatches:
+            print(f"  mismatch: {site}/{name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: generic main-content extraction
+
+Extracts the article text of generated pages of every fixture site (menus,
+inline scripts, related-link lists and footers around the content) with the
+readability extractor and with the previous RSS fallback (first of a few
+common selectors, else the whole body), and compares both with the
+paragraphs of the known content container:
+
+- precision: share of the extracted words that are article text
+- recall:    share of the article words that were extracted
+- words:     words per page, what a summary prompt pays for
+- ms:        extraction time per page
+
+    uv run python -m benchmarks.bench_content_extraction
+    uv run python -m benchmarks.bench_content_extraction --articles 50 --json after.json --baseline before.json
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.services.crawler.parsing import make_soup
+from src.services.crawler.readability import extract_main_content
+from .bench_crawler import compare
+from .fixtures import FIXTURE_SOURCES, HTML, page_key, synthetic_pages
+
+# Host -> container of the article paragraphs in the generated pages
+REFERENCE_SELECTORS = {
+    "thanhnien.vn": ".detail-content",
+    "tuoitre.vn": "[data-role=content]",
+    "vietnamnet.vn": ".main-content",
+    "www.bbc.com": "[data-testid=article-body]",
+    "vnexpress.net": "article.fck_detail",
+}
+
+
+def legacy_extract(html: bytes) -> Optional[str]:
+    """The former RSS full-article extraction: common selectors, else the whole body"""
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style", "nav", "header", "footer"]):
+        element.decompose()
+    for selector in ("article", ".article-content", ".post-content", ".entry-content", "main", "#main-content", ".content"):
+        content = soup.select_one(selector)
+        if content:
+            break
+    else:
+        content = soup.find("body")
+    return " ".join(content.get_text().split()) if content else None
+
+
+def generic_extract(html: bytes) -> Optional[str]:
+    return extract_main_content(make_soup(html))
+
+
+def _reference(host: str, html: bytes) -> Optional[str]:
+    container = make_soup(html).select_one(REFERENCE_SELECTORS[host])
+    if container is None:
+        return None
+    return " ".join(p.get_text(" ") for p in container.find_all("p"))
+
+
+def _samples(articles: int) -> Dict[str, List[Tuple[bytes, Counter]]]:
+    """Article pages of every fixture site with the words of their reference text"""
+    homepages = {page_key(source.url) for source in FIXTURE_SOURCES}
+    samples: Dict[str, List[Tuple[bytes, Counter]]] = {}
+    for key, (body, content_type) in synthetic_pages(articles).items():
+        host = key.split("/", 1)[0]
+        if content_type != HTML or key in homepages or host not in REFERENCE_SELECTORS:
+            continue
+        reference = _reference(host, body)
+        if reference:
+            samples.setdefault(host, []).append((body, Counter(reference.split())))
+    return samples
+
+
+def _measure(extract: Callable[[bytes], Optional[str]], pages: List[Tuple[bytes, Counter]]) -> Dict[str, float]:
+    extracted_words = reference_words = matched = 0
+    elapsed = 0.0
+    for html, reference in pages:
+        start = time.perf_counter()
+        text = extract(html) or ""
+        elapsed += time.perf_counter() - start
+        words = Counter(text.split())
+        extracted_words += sum(words.values())
+        reference_words += sum(reference.values())
+        matched += sum((words & reference).values())
+    return {
+        "precision": matched / extracted_words if extracted_words else 0.0,
+        "recall": matched / reference_words if reference_words else 0.0,
+        "words_per_page": extracted_words / len(pages),
+        "ms_per_page": elapsed / len(pages) * 1000,
+    }
+
+
+def bench(articles: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results = {}
+    for host, pages in _samples(articles).items():
+        results[host] = {
+            "generic": _measure(generic_extract, pages),
+            "legacy": _measure(legacy_extract, pages),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20, help="Article pages per site")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with the results of a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression against the baseline")
+    args = parser.parse_args()
+
+    results = bench(args.articles)
+    print(f"{'site':<14} {'extractor':<8} {'precision':>9} {'recall':>7} {'words':>7} {'ms/page':>8}")
+    for host, extractors in results.items():
+        for name, metrics in extractors.items():
+            print(
+                f"{host:<14} {name:<8} {metrics['precision']:>9.3f} {metrics['recall']:>7.3f} "
+                f"{metrics['words_per_page']:>7.0f} {metrics['ms_per_page']:>8.2f}"
+            )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Benchmark: crawler throughput against a local fixture server
+
+Serves recorded pages (an archive written with CRAWL_ARCHIVE_DIR) or
+generated pages for Thanh Niên, Tuổi Trẻ, VietnamNet, BBC and an RSS feed
+from a local HTTP server with optional latency and errors, then measures:
+
+- parse: link extraction and article parsing in ms/page
+- crawl: all sources crawled concurrently through the crawl engine, no database
+- e2e:   CrawlerService.crawl_all_sources, cold then warm runs (--e2e only)
+
+Results can be written as JSON and compared with a previous run; the exit
+status is 1 when a metric regresses by more than --tolerance.
+
+    uv run python -m benchmarks.bench_crawler
+    uv run python -m benchmarks.bench_crawler --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+    uv run python -m benchmarks.bench_crawler --archive /data/archive --json after.json --baseline before.json
+
+--e2e stores articles, so DATABASE_URL must point at a scratch database
+without other sources; the benchmark sources are deleted afterwards.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import feedparser
+
+from src.config.settings import settings
+from src.services.crawler.engine import CrawlEngine
+from src.services.crawler.extraction import shutdown_extraction_pool
+from src.services.crawler.parsing import make_soup
+from src.services.crawler.validator_cache import ValidatorCache
+from src.services.crawler.service import create_crawler
+from src.services.crawler.base_crawler import HomepageCrawler
+from .fixture_server import FixtureServer
+from .fixtures import FIXTURE_SOURCES, FixtureSource, Pages, archived_pages, page_key, synthetic_pages
+
+# Metrics where a higher value is better, the others regress when they grow
+HIGHER_IS_BETTER = ("pages_per_sec", "precision", "recall")
+
+
+def _peak_rss_mib(who: int = resource.RUSAGE_SELF) -> float:
+    """Peak resident set size (ru_maxrss is in KiB on Linux)"""
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def bench_parse(pages: Pages) -> Dict[str, Dict[str, float]]:
+    """Time link extraction and article parsing of every source in this process"""
+    results = {}
+    for source in FIXTURE_SOURCES:
+        crawler = create_crawler(source)
+        entry = pages.get(page_key(source.url))
+        if entry is None:
+            continue
+
+        start = time.perf_counter()
+        if isinstance(crawler, HomepageCrawler):
+            strainer = crawler.link_extractor.strainer() if crawler._fast_parse_enabled() else None
+            links = crawler._extract_article_links(make_soup(entry[0], strainer))
+        else:
+            links = [item.get("link", "") for item in feedparser.parse(entry[0]).entries]
+        index_ms = (time.perf_counter() - start) * 1000
+
+        articles = [(link, pages[page_key(link)][0]) for link in links if page_key(link) in pages]
+        parsed = 0
+        start = time.perf_counter()
+        for url, html in articles:
+            if isinstance(crawler, HomepageCrawler):
+                parsed += crawler._parse_article(url, html) is not None
+            else:
+                parsed += crawler._extract_full_article(html) is not None
+        parse_ms = (time.perf_counter() - start) * 1000
+
+        results[source.slug] = {
+            "links": len(links),
+            "index_ms": index_ms,
+            "articles": len(articles),
+            "parsed": parsed,
+            "parse_ms_per_page": parse_ms / len(articles) if articles else 0.0,
+        }
+    return results
+
+
+async def _crawl_once(server: FixtureServer, sources: List[FixtureSource]) -> Dict[str, float]:
+    crawlers = [create_crawler(source) for source in sources]
+    requests_before, errors_before = server.requests, server.errors
+
+    start = time.perf_counter()
+    async with CrawlEngine(validators=ValidatorCache(), transport=server.transport()) as engine:
+        results = await asyncio.gather(*(crawler.crawl(engine) for crawler in crawlers), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    requests = server.requests - requests_before
+    return {
+        "seconds": elapsed,
+        "requests": requests,
+        "injected_errors": server.errors - errors_before,
+        "articles": sum(len(result) for result in results if isinstance(result, list)),
+        "failed_sources": sum(isinstance(result, Exception) for result in results),
+        "pages_per_sec": requests / elapsed if elapsed else 0.0,
+    }
+
+
+def bench_crawl(server: FixtureServer, warmup: int = 1) -> Dict[str, float]:
+    """
+    Crawl every source concurrently through the crawl engine, without the database
+
+    Warm-up runs start the extraction pool and fill the worker crawler
+    caches first, as in the long-running app.
+    """
+    for _ in range(warmup):
+        asyncio.run(_crawl_once(server, FIXTURE_SOURCES))
+    return asyncio.run(_crawl_once(server, FIXTURE_SOURCES))
+
+
+def bench_e2e(server: FixtureServer, runs: int) -> Optional[List[Dict[str, float]]]:
+    """Run CrawlerService.crawl_all_sources on a scratch database"""
+    from src.database.connection import get_db_session
+    from src.database.migrations import init_db_with_migrations
+    from src.database.models import Article, HttpValidator, SourceCrawlState
+    from src.repositories import SourceRepository
+    from src.services.crawler.service import CrawlerService
+
+    init_db_with_migrations()
+    fixture_urls = {source.url for source in FIXTURE_SOURCES}
+
+    with get_db_session() as db:
+        repo = SourceRepository(db)
+        others = [source for source in repo.get_all() if source.url not in fixture_urls]
+        if others:
+            print(f"e2e skipped: the database has {len(others)} other sources, use a scratch database", file=sys.stderr)
+            return None
+
+        sources = [repo.get_by_url(source.url) or repo.create(source.name, source.url, source.slug)
+                   for source in FIXTURE_SOURCES]
+        source_ids = [source.id for source in sources]
+
+        def cleanup():
+            db.query(Article).filter(Article.source_id.in_(source_ids)).delete(synchronize_session=False)
+            db.query(SourceCrawlState).filter(SourceCrawlState.source_id.in_(source_ids)).delete(synchronize_session=False)
+            db.query(HttpValidator).filter(HttpValidator.url.in_(fixture_urls)).delete(synchronize_session=False)
+            db.commit()
+
+        cleanup()
+        results = []
+        try:
+            for run in range(runs):
+                # The engine closes its transport at the end of a run
+                service = CrawlerService(db, transport=server.transport())
+                requests_before = server.requests
+                start = time.perf_counter()
+                stored = asyncio.run(service.crawl_all_sources())
+                elapsed = time.perf_counter() - start
+                requests = server.requests - requests_before
+                results.append({
+                    "run": "cold" if run == 0 else "warm",
+                    "seconds": elapsed,
+                    "requests": requests,
+                    "stored": stored,
+                    "pages_per_sec": requests / elapsed if elapsed else 0.0,
+                })
+        finally:
+            cleanup()
+            for source_id in source_ids:
+                repo.delete(source_id)
+    return results
+
+
+def _flatten(results: Dict) -> Dict[str, float]:
+    """Comparable metrics of a result tree, keyed by path"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update({f"{key}.{name}": metric for name, metric in _flatten(value).items()})
+        elif isinstance(value, list):
+            for number, item in enumerate(value):
+                if isinstance(item, dict):
+                    flat.update({f"{key}.{number}.{name}": metric for name, metric in _flatten(item).items()})
+        elif isinstance(value, (int, float)) and key.endswith(("_ms", "_us", "_ms_per_page", "seconds", "pages_per_sec", "_mib")):
+            flat[key] = value
+    return flat
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """List the metrics that regressed by more than tolerance (a fraction) against the baseline"""
+    current, previous = _flatten(results), _flatten(baseline)
+    regressions = []
+    for name, value in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        change = (value - before) / before
+        if name.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{name}: {before:.2f} -> {value:.2f} ({change:+.0%} worse)")
+    return regressions
+
+
+def _print_results(results: Dict) -> None:
+    print(f"{'source':<16} {'links':>5} {'index ms':>9} {'pages':>5} {'parsed':>6} {'ms/page':>8}")
+    for slug, parse in results["parse"].items():
+        print(
+            f"{slug:<16} {parse['links']:>5} {parse['index_ms']:>9.2f} {parse['articles']:>5} "
+            f"{parse['parsed']:>6} {parse['parse_ms_per_page']:>8.2f}"
+        )
+
+    crawl = results["crawl"]
+    print(
+        f"\ncrawl: {crawl['requests']} requests in {crawl['seconds']:.2f}s = {crawl['pages_per_sec']:.1f} pages/sec, "
+        f"{crawl['articles']} articles, {crawl['injected_errors']} injected errors"
+    )
+    for run in results.get("e2e") or []:
+        print(
+            f"e2e {run['run']}: crawl_all_sources {run['seconds']:.2f}s, {run['requests']} requests, "
+            f"{run['stored']} stored, {run['pages_per_sec']:.1f} pages/sec"
+        )
+    print(f"peak RSS: {results['peak_rss_mib']:.0f} MiB, extraction workers {results['workers_peak_rss_mib']:.0f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", help="Replay pages recorded in this archive instead of generated ones")
+    parser.add_argument("--articles", type=int, default=30, help="Generated articles per source")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- variation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing (503 or reset)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of generated pages and injected errors")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed crawl runs before the measured one")
+    parser.add_argument("--e2e", action="store_true", help="Also time crawl_all_sources on a scratch database")
+    parser.add_argument("--runs", type=int, default=2, help="crawl_all_sources runs with --e2e (first is cold)")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with the results of a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression against the baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    pages = archived_pages(args.archive) if args.archive else synthetic_pages(args.articles, args.seed)
+
+    results = {"config": {
+        "pages": "archive" if args.archive else "synthetic",
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "extract_workers": settings.crawl_extract_workers,
+        "fast_parse": settings.crawl_fast_parse,
+    }}
+    results["parse"] = bench_parse(pages)
+
+    with FixtureServer(pages, args.latency_ms, args.jitter_ms, args.error_rate, args.seed) as server:
+        results["crawl"] = bench_crawl(server, args.warmup)
+        if args.e2e:
+            results["e2e"] = bench_e2e(server, args.runs)
+        results["peak_rss_mib"] = _peak_rss_mib()
+        shutdown_extraction_pool()
+        results["workers_peak_rss_mib"] = _peak_rss_mib(resource.RUSAGE_CHILDREN)
+
+    _print_results(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
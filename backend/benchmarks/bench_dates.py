@@ -0,0 +1,124 @@
+"""
+Benchmark: published-date parsing
+
+Parses a corpus of date strings as they appear on the crawled sites (meta
+tags, visible bylines, RSS, sitemaps, article URLs) with the date module
+and with the previous approach (dateutil first, ISO as fallback), and
+reports the time per date and the values the two disagree on.
+
+    uv run python -m benchmarks.bench_dates
+    uv run python -m benchmarks.bench_dates --repeat 2000 --json after.json --baseline before.json
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from dateutil import parser as date_parser
+
+from src.services.crawler.dates import ensure_aware, get_timezone, parse_date
+from src.services.crawler.site_profile import load_profiles
+from .bench_crawler import compare
+
+# (profile, date string) as found on the sites
+CORPUS = (
+    ("thanh_nien", "2025-12-29T22:32:00+07:00"),
+    ("thanh_nien", "2025-12-29T22:32:00"),
+    ("thanh_nien", "2025-12-30T06:05:12.487+07:00"),
+    ("tuoi_tre", "2025-12-29T22:32:00+07:00"),
+    ("tuoi_tre", "29/12/2025 22:32 GMT+7"),
+    ("tuoi_tre", "30/12/2025 06:05 GMT+7"),
+    ("tuoi_tre", " 01/01/2026 00:15 GMT+7 "),
+    ("vietnamnet", "2025-12-29T22:32:00+07:00"),
+    ("vietnamnet", "Thứ Hai, 29/12/2025 - 22:32"),
+    ("vietnamnet", "Thứ Ba, 30/12/2025 - 06:05 (GMT+07:00)"),
+    ("vietnamnet", "29/12/2025 22:32"),
+    ("vietnamnet", "22:32 29/12/2025"),
+    ("bbc", "2025-12-29T15:32:10.123Z"),
+    ("bbc", "2025-12-29T15:32:10Z"),
+    ("bbc", "29 December 2025"),
+    ("bbc", "29 Dec 2025"),
+    ("rss", "Mon, 29 Dec 2025 22:32:00 +0700"),
+    ("rss", "Tue, 30 Dec 2025 06:05:12 GMT"),
+    ("sitemap", "2025-12-29T22:32:00+07:00"),
+    ("sitemap", "2025-12-29T22:32+07:00"),
+    ("sitemap", "2025-12-29"),
+)
+
+
+def legacy_parse(value: str) -> Optional[datetime]:
+    """The former profile date parsing: dateutil first, then ISO"""
+    try:
+        return date_parser.parse(value, dayfirst=True)
+    except (ValueError, OverflowError):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+
+def _time_us(parse, items, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for args in items:
+            parse(*args)
+    return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+
+def bench(repeat: int) -> Dict:
+    profiles = load_profiles()
+    items = []
+    for site, value in CORPUS:
+        profile = profiles.get(site)
+        formats = tuple(fmt for rule in profile.date_rules for fmt in rule.formats) if profile else ()
+        items.append((value, formats, profile.timezone if profile else get_timezone()))
+
+    mismatches = []
+    unparsed = 0
+    for (site, value), (_, formats, tz) in zip(CORPUS, items):
+        new = parse_date(value, formats, tz)
+        old = legacy_parse(value.strip())
+        if new is None:
+            unparsed += 1
+        if old is not None and new != ensure_aware(old, tz):
+            mismatches.append(f"{site} {value!r}: {old} -> {new}")
+
+    return {
+        "dates": len(CORPUS),
+        "unparsed": unparsed,
+        "mismatches": mismatches,
+        "parse_us": _time_us(parse_date, items, repeat),
+        "legacy_parse_us": _time_us(legacy_parse, [(value.strip(),) for _, value in CORPUS], repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="Passes over the corpus")
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with the results of a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression against the baseline")
+    args = parser.parse_args()
+
+    results = bench(args.repeat)
+    new_us, legacy_us = results["parse_us"], results["legacy_parse_us"]
+    print(f"{results['dates']} dates, {results['unparsed']} unparsed")
+    print(f"date module: {new_us:.1f} us/date, previous parsing: {legacy_us:.1f} us/date ({legacy_us / new_us:.1f}x)")
+    for mismatch in results["mismatches"]:
+        print(f"differs: {mismatch}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
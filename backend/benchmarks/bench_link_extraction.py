@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: single-pass LinkExtractor vs the legacy multi-select extraction
+
+Expects saved homepages named after the crawler modules in --pages:
+thanh_nien.html, tuoi_tre.html, vietnamnet.html, bbc.html (missing ones are skipped).
+
+    uv run python -m benchmarks.bench_link_extraction --pages saved_homepages/ --repeat 50
+"""
+import argparse
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.services.crawler.news_sites import ThanhNienCrawler, TuoiTreCrawler, VietnamNetCrawler, BBCCrawler
+from .legacy_links import LEGACY_EXTRACTORS
+
+SITES = {
+    "thanh_nien": (ThanhNienCrawler, "https://thanhnien.vn/"),
+    "tuoi_tre": (TuoiTreCrawler, "https://tuoitre.vn/"),
+    "vietnamnet": (VietnamNetCrawler, "https://vietnamnet.vn/"),
+    "bbc": (BBCCrawler, "https://www.bbc.com/news"),
+}
+
+
+def _time_per_call(func, repeat: int) -> float:
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", required=True, type=Path, help="Directory with saved homepages")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per extractor")
+    args = parser.parse_args()
+
+    print(f"{'site':<12} {'legacy ms':>10} {'new ms':>10} {'speedup':>8} {'legacy':>7} {'new':>5} {'common':>7}")
+    for site, (crawler_cls, source_url) in SITES.items():
+        page = args.pages / f"{site}.html"
+        if not page.exists():
+            print(f"{site:<12} skipped (no {page.name})")
+            continue
+
+        soup = BeautifulSoup(page.read_bytes(), "html.parser")
+        legacy = LEGACY_EXTRACTORS[site](source_url)
+        crawler = crawler_cls(source_url)
+
+        legacy_ms = _time_per_call(lambda: legacy._extract_article_links(soup), args.repeat)
+        new_ms = _time_per_call(lambda: crawler._extract_article_links(soup), args.repeat)
+
+        legacy_links = set(legacy._extract_article_links(soup))
+        new_links = set(crawler._extract_article_links(soup))
+        print(
+            f"{site:<12} {legacy_ms:>10.2f} {new_ms:>10.2f} {legacy_ms / new_ms:>7.1f}x "
+            f"{len(legacy_links):>7} {len(new_links):>5} {len(legacy_links & new_links):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Local HTTP server replaying fixture pages, with injected latency and errors
+
+The server runs in its own process so it does not compete with the crawler
+for the GIL or show up in its memory. FixtureTransport sends every request
+of a crawl engine to it while keeping the original Host header, so sources
+keep their real URLs (and their link rules keep matching).
+"""
+import hashlib
+import multiprocessing
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import httpx
+
+from src.config.settings import settings
+from src.services.crawler.http_client import PooledTransport
+from .fixtures import Pages
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_FixtureHTTPServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.requests.get_lock():
+            server.requests.value += 1
+
+        delay = server.latency + server.rng.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if server.rng.random() < server.error_rate:
+            with server.errors.get_lock():
+                server.errors.value += 1
+            if server.rng.random() < 0.5:
+                # Drop the connection without a response
+                self.close_connection = True
+                return
+            self._send(503, b"Service Unavailable", "text/plain")
+            return
+
+        page = server.pages.get(f"{self.headers.get('Host', '').lower()}{self.path}")
+        if page is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        body, content_type = page
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", content_type, etag)
+            return
+        self._send(200, body, content_type, etag)
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+class _FixtureHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def _serve(pages: Pages, latency: float, jitter: float, error_rate: float, seed: int,
+           requests, errors, port, ready) -> None:
+    server = _FixtureHTTPServer(("127.0.0.1", 0), _Handler)
+    server.pages = pages
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    # Shared by the handler threads: injection is reproducible in rate, not per request
+    server.rng = random.Random(seed)
+    server.requests = requests
+    server.errors = errors
+    port.value = server.server_address[1]
+    ready.set()
+    server.serve_forever()
+
+
+class FixtureServer:
+    """
+    Fixture pages served from a child process.
+
+    Args:
+        pages: Pages keyed by host and path
+        latency_ms: Delay added to every response
+        jitter_ms: Random +/- variation of the delay
+        error_rate: Fraction of requests failing (half 503, half dropped connections)
+        seed: Seed of the latency and error injection
+    """
+
+    def __init__(self, pages: Pages, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, seed: int = 0):
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Value("l", 0)
+        self._errors = context.Value("l", 0)
+        self._port = context.Value("i", 0)
+        self._ready = context.Event()
+        self._process = context.Process(
+            target=_serve,
+            args=(pages, latency_ms / 1000, jitter_ms / 1000, error_rate, seed,
+                  self._requests, self._errors, self._port, self._ready),
+            daemon=True,
+        )
+
+    def __enter__(self) -> "FixtureServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._process.start()
+        if not self._ready.wait(timeout=30):
+            raise RuntimeError("Fixture server did not start")
+
+    def stop(self) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    @property
+    def port(self) -> int:
+        return self._port.value
+
+    @property
+    def requests(self) -> int:
+        """Requests received so far"""
+        return self._requests.value
+
+    @property
+    def errors(self) -> int:
+        """Injected errors so far"""
+        return self._errors.value
+
+    def transport(self) -> "FixtureTransport":
+        """Create an HTTP transport sending requests to this server"""
+        return FixtureTransport(self.port)
+
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """
+    Pooled transport redirecting every request to the fixture server.
+
+    The Host header still carries the requested host, which the server uses
+    to pick the page.
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self._transport = PooledTransport(
+            limits=httpx.Limits(
+                max_connections=settings.crawl_max_concurrency,
+                max_keepalive_connections=settings.crawl_max_concurrency,
+                keepalive_expiry=settings.crawl_keepalive_expiry,
+            ),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self.port)
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,272 @@
+"""
+Fixture pages for the crawler benchmarks
+
+Pages are keyed by "host/path" and come either from a page archive recorded
+with CRAWL_ARCHIVE_DIR (real pages) or from a deterministic generator that
+mimics the markup of each supported site (homepage, robots.txt, news
+sitemap and article pages) plus an RSS feed with short descriptions, so
+every crawler takes its usual code path.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape
+
+from src.services.crawler.archive import PageArchive
+
+# key -> (body, content type)
+Pages = Dict[str, Tuple[bytes, str]]
+
+HTML = "text/html; charset=utf-8"
+XML = "application/xml; charset=utf-8"
+RSS = "application/rss+xml; charset=utf-8"
+TEXT = "text/plain; charset=utf-8"
+
+
+@dataclass(frozen=True)
+class FixtureSource:
+    """A source crawled by the benchmarks"""
+    name: str
+    slug: str
+    url: str
+
+
+FIXTURE_SOURCES = [
+    FixtureSource("Thanh Niên", "bao-thanh-nien", "https://thanhnien.vn/"),
+    FixtureSource("Tuổi Trẻ", "bao-tuoi-tre", "https://tuoitre.vn/"),
+    FixtureSource("VietnamNet", "vietnamnet", "https://vietnamnet.vn/"),
+    FixtureSource("BBC News", "bbc-news", "https://www.bbc.com/news"),
+    FixtureSource("VnExpress", "vnexpress", "https://vnexpress.net/rss/tin-moi-nhat.rss"),
+]
+
+_WORDS = (
+    "chính phủ kinh tế người dân thành phố dự án giáo dục y tế giao thông thị trường doanh nghiệp "
+    "năm nay tăng trưởng chính sách phát triển hạ tầng đầu tư quốc hội bộ trưởng cho biết theo báo cáo "
+    "trong khi đó ngoài ra đồng thời khu vực trung tâm nông nghiệp xuất khẩu công nghệ số hóa"
+).split()
+# Unaccented words for URLs
+_SLUG_WORDS = (
+    "chinh-phu kinh-te nguoi-dan thanh-pho du-an giao-duc y-te giao-thong thi-truong doanh-nghiep "
+    "tang-truong chinh-sach phat-trien ha-tang dau-tu quoc-hoi bo-truong bao-cao nong-nghiep xuat-khau"
+).split()
+_ENGLISH_WORDS = (
+    "government economy people city project education health transport market business this year "
+    "growth policy development infrastructure investment parliament minister said according report "
+    "meanwhile however region central agriculture exports technology digital"
+).split()
+
+
+def page_key(url: str) -> str:
+    """Key of a page: host and path with query, without scheme"""
+    parsed = urlparse(url)
+    path = parsed.path or "/"
+    return f"{parsed.netloc.lower()}{path}{'?' + parsed.query if parsed.query else ''}"
+
+
+class _Writer:
+    """Deterministic text and page chrome shared by the site generators"""
+
+    def __init__(self, rng: random.Random, words: Tuple[str, ...] = tuple(_WORDS),
+                 slug_words: Tuple[str, ...] = tuple(_SLUG_WORDS)):
+        self.rng = rng
+        self.words = words
+        self.slug_words = slug_words
+
+    def sentence(self, min_words: int = 12, max_words: int = 30) -> str:
+        words = self.rng.choices(self.words, k=self.rng.randint(min_words, max_words))
+        return " ".join(words).capitalize() + "."
+
+    def paragraphs(self, count: int) -> List[str]:
+        return [" ".join(self.sentence() for _ in range(self.rng.randint(2, 5))) for _ in range(count)]
+
+    def slug(self) -> str:
+        return "-".join(self.rng.choices(self.slug_words, k=self.rng.randint(3, 6)))
+
+    def chrome(self, host: str) -> Tuple[str, str]:
+        """Header (navigation, inline scripts) and footer around the content, like real news pages"""
+        menu = "".join(f'<li><a href="/chuyen-muc/{self.slug()}/">{self.sentence(1, 3)}</a></li>' for _ in range(120))
+        script = "<script>var config = {" + ",".join(f'"k{i}": "{self.slug()}"' for i in range(400)) + "};</script>"
+        header = f'<header><nav class="menu"><ul>{menu}</ul></nav></header>{script}'
+        footer = (
+            f'<aside class="related"><ul>{menu[:4000]}</ul></aside>'
+            f"<footer><p>© {host}. {self.sentence()}</p></footer>"
+            '<script src="/static/app.js"></script>'
+        )
+        return header, footer
+
+
+def _thanh_nien_article(writer: _Writer, host: str, title: str, published: datetime) -> str:
+    header, footer = writer.chrome(host)
+    body = "".join(f"<p>{text}</p>" for text in writer.paragraphs(12))
+    return (
+        f'<html><head><title>{title}</title>'
+        f'<meta property="article:published_time" content="{published.isoformat()}"></head>'
+        f'<body>{header}<div class="detail-cate"><a href="/thoi-su.htm">Thời sự</a></div>'
+        f'<h1 class="detail-title">{title}</h1><div class="detail-content">{body}</div>{footer}</body></html>'
+    )
+
+
+def _tuoi_tre_article(writer: _Writer, host: str, title: str, published: datetime) -> str:
+    header, footer = writer.chrome(host)
+    body = "".join(f"<p>{text}</p>" for text in writer.paragraphs(12))
+    return (
+        f'<html><head><title>{title}</title></head><body>{header}'
+        f'<h1 class="detail-title article-title" data-role="title">{title}</h1>'
+        f'<div data-role="publishdate">{published.strftime("%d/%m/%Y %H:%M")} GMT+7</div>'
+        f'<div class="detail-content afcbc-body" data-role="content">{body}'
+        f'<p>Xem thêm: {writer.sentence()}</p></div>{footer}</body></html>'
+    )
+
+
+def _vietnamnet_article(writer: _Writer, host: str, title: str, published: datetime) -> str:
+    header, footer = writer.chrome(host)
+    body = "".join(f"<p>{text}</p>" for text in writer.paragraphs(12))
+    return (
+        f'<html><head><title>{title} | Báo VietNamNet</title>'
+        f'<meta property="article:published_time" content="{published.isoformat()}"></head><body>{header}'
+        f'<h1 class="content-detail-title">{title}</h1>'
+        f'<div class="main-content content-detail"><figure><img src="/a.jpg"><figcaption>{writer.sentence()}</figcaption></figure>'
+        f"{body}</div>{footer}</body></html>"
+    )
+
+
+def _bbc_article(writer: _Writer, host: str, title: str, published: datetime) -> str:
+    header, footer = writer.chrome(host)
+    blocks = "".join(
+        f'<div data-component="text-block"><p>{text}</p></div>' for text in writer.paragraphs(12)
+    )
+    return (
+        f'<html><head><title>{title} - BBC News</title></head><body>{header}'
+        f'<main><article data-testid="article"><h1 data-testid="headline">{title}</h1>'
+        f'<time data-testid="timestamp" datetime="{published.isoformat()}">{published:%d %B %Y}</time>'
+        f'<div data-testid="article-body">{blocks}</div></article></main>{footer}</body></html>'
+    )
+
+
+def _rss_article(writer: _Writer, host: str, title: str, published: datetime) -> str:
+    header, footer = writer.chrome(host)
+    body = "".join(f'<p class="Normal">{text}</p>' for text in writer.paragraphs(10))
+    return (
+        f'<html><head><title>{title}</title></head><body>{header}'
+        f'<h1 class="title-detail">{title}</h1><article class="fck_detail">{body}</article>{footer}</body></html>'
+    )
+
+
+def _homepage_link(site: str, url: str, title: str) -> str:
+    if site == "thanh_nien":
+        return f'<h3 class="box-title-text"><a class="box-category-link-title" href="{url}">{title}</a></h3>'
+    return f'<h3 class="box-title"><a href="{url}">{title}</a></h3>'
+
+
+# site -> (article path template, article builder, text words, URL words)
+_SITES: Dict[str, Tuple[str, Callable, Tuple[str, ...], Tuple[str, ...]]] = {
+    "thanh_nien": ("/{slug}-185{id:09d}.htm", _thanh_nien_article, tuple(_WORDS), tuple(_SLUG_WORDS)),
+    "tuoi_tre": ("/{slug}-{date:%Y%m%d%H%M}{id:05d}.htm", _tuoi_tre_article, tuple(_WORDS), tuple(_SLUG_WORDS)),
+    "vietnamnet": ("/{slug}-{id:07d}.html", _vietnamnet_article, tuple(_WORDS), tuple(_SLUG_WORDS)),
+    "bbc": ("/news/articles/{slug}-{id:08d}", _bbc_article, tuple(_ENGLISH_WORDS), tuple(_ENGLISH_WORDS)),
+}
+
+
+def _site_pages(site: str, source: FixtureSource, articles: int, now: datetime, rng: random.Random) -> Pages:
+    """Homepage, robots.txt, news sitemap and article pages of a site"""
+    path_template, build_article, words, slug_words = _SITES[site]
+    writer = _Writer(rng, words, slug_words)
+    parsed = urlparse(source.url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    pages: Pages = {}
+
+    links, sitemap_urls = [], []
+    for number in range(articles):
+        published = now - timedelta(minutes=17 * number + rng.randint(0, 10))
+        path = path_template.format(slug=writer.slug(), id=rng.randint(10 ** 6, 10 ** 7) + number, date=published)
+        title = writer.sentence(8, 14).rstrip(".")
+        pages[page_key(origin + path)] = (build_article(writer, parsed.netloc, title, published).encode(), HTML)
+        links.append(_homepage_link(site, path, title))
+        sitemap_urls.append(
+            f"<url><loc>{origin}{path}</loc><news:news><news:publication_date>{published.isoformat()}"
+            f"</news:publication_date><news:title>{escape(title)}</news:title></news:news></url>"
+        )
+
+    header, footer = writer.chrome(parsed.netloc)
+    homepage = f"<html><head><title>{source.name}</title></head><body>{header}<main>{''.join(links)}</main>{footer}</body></html>"
+    pages[page_key(source.url)] = (homepage.encode(), HTML)
+    pages[page_key(origin + "/robots.txt")] = (
+        f"User-agent: *\nDisallow: /search\nSitemap: {origin}/sitemaps/news.xml\n".encode(), TEXT
+    )
+    pages[page_key(origin + "/sitemaps/news.xml")] = (
+        (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+            f"{''.join(sitemap_urls)}</urlset>"
+        ).encode(),
+        XML,
+    )
+    return pages
+
+
+def _feed_pages(source: FixtureSource, articles: int, now: datetime, rng: random.Random) -> Pages:
+    """RSS feed whose short descriptions make the parser fetch every full article"""
+    writer = _Writer(rng)
+    parsed = urlparse(source.url)
+    pages: Pages = {}
+
+    items = []
+    for number in range(articles):
+        published = now - timedelta(minutes=23 * number)
+        url = f"{parsed.scheme}://{parsed.netloc}/{writer.slug()}-{4800000 + number}.html"
+        title = writer.sentence(8, 14).rstrip(".")
+        pages[page_key(url)] = (_rss_article(writer, parsed.netloc, title, published).encode(), HTML)
+        items.append(
+            f"<item><title>{escape(title)}</title><link>{url}</link>"
+            f"<description>{escape(writer.sentence(8, 16))}</description>"
+            f"<pubDate>{published:%a, %d %b %Y %H:%M:%S} +0000</pubDate></item>"
+        )
+
+    feed = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{source.name}</title><link>{parsed.scheme}://{parsed.netloc}/</link>{''.join(items)}</channel></rss>"
+    )
+    pages[page_key(source.url)] = (feed.encode(), RSS)
+    return pages
+
+
+def synthetic_pages(articles_per_source: int = 30, seed: int = 0) -> Pages:
+    """
+    Generate fixture pages for every benchmark source
+
+    Args:
+        articles_per_source: Article pages per site and feed items
+        seed: Random seed, the same seed gives the same pages
+
+    Returns:
+        Pages keyed by host and path
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    sites = dict(zip(("thanh_nien", "tuoi_tre", "vietnamnet", "bbc"), FIXTURE_SOURCES))
+
+    pages: Pages = {}
+    for site, source in sites.items():
+        pages.update(_site_pages(site, source, articles_per_source, now, rng))
+    pages.update(_feed_pages(FIXTURE_SOURCES[-1], articles_per_source, now, rng))
+    return pages
+
+
+def archived_pages(directory: str) -> Pages:
+    """
+    Load recorded pages from a page archive (written with CRAWL_ARCHIVE_DIR)
+
+    Args:
+        directory: Archive directory
+
+    Returns:
+        Latest recording of every archived URL, keyed by host and path
+    """
+    archive = PageArchive(directory)
+    return {
+        page_key(url): (archive.read(entry), entry.content_type)
+        for url, entry in archive.latest().items()
+    }
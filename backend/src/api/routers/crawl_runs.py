@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from ...repositories import CrawlRunRepository
+from ...schemas import CrawlRunResponse
+from ...api.dependencies import get_db, get_admin_user
+from ...database.models import User
+
+router = APIRouter(prefix="/crawl-runs", tags=["crawl-runs"])
+
+
+@router.get("", response_model=List[CrawlRunResponse])
+def list_crawl_runs(
+    limit: int = Query(20, ge=1, le=200),
+    admin_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Metrics of the latest crawl runs, newest first (Admin only)"""
+    return CrawlRunRepository(db).get_recent(limit)
+
+
+@router.get("/{run_id}", response_model=CrawlRunResponse)
+def get_crawl_run(
+    run_id: int,
+    admin_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Metrics of a crawl run (Admin only)"""
+    run = CrawlRunRepository(db).get_by_id(run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Crawl run with ID {run_id} not found"
+        )
+    return run
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
 
-from ...repositories import SourceRepository
-from ...schemas import SourceCreate, SourceUpdate, SourceResponse
+from ...repositories import SourceRepository, SourceCrawlStateRepository
+from ...schemas import SourceCreate, SourceUpdate, SourceResponse, SourceHealthResponse
 from ...api.dependencies import get_db, get_admin_user
-from ...database.models import User
+from ...database.models import User, Source, SourceCrawlState
+from ...services.crawler.resilience import circuit_status
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
@@ -20,6 +22,50 @@ def list_sources(
     return repo.get_all()
 
 
+def _source_health(source: Source, state: Optional[SourceCrawlState], now: datetime) -> SourceHealthResponse:
+    return SourceHealthResponse(
+        source_id=source.id,
+        name=source.name,
+        url=source.url,
+        circuit=circuit_status(state, now),
+        consecutive_failures=state.consecutive_failures if state else 0,
+        circuit_open_until=state.circuit_open_until if state else None,
+        last_failure_at=state.last_failure_at if state else None,
+        last_error=state.last_error if state else None,
+        last_crawled_at=state.last_crawled_at if state else None,
+        next_crawl_at=state.next_crawl_at if state else None,
+    )
+
+
+@router.get("/health", response_model=List[SourceHealthResponse])
+def list_source_health(
+    admin_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Crawl health and circuit breaker state of all sources (Admin only)"""
+    sources = SourceRepository(db).get_all()
+    states = SourceCrawlStateRepository(db).get_by_source_ids([source.id for source in sources])
+    now = datetime.now(timezone.utc)
+    return [_source_health(source, states.get(source.id), now) for source in sources]
+
+
+@router.post("/{source_id}/circuit/reset", response_model=SourceHealthResponse)
+def reset_source_circuit(
+    source_id: int,
+    admin_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Close the circuit of a source so the next run crawls it (Admin only)"""
+    source = SourceRepository(db).get_by_id(source_id)
+    if not source:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Source with ID {source_id} not found"
+        )
+    state = SourceCrawlStateRepository(db).reset_circuit(source_id)
+    return _source_health(source, state, datetime.now(timezone.utc))
+
+
 @router.get("/slug/{slug}", response_model=SourceResponse)
 def get_source_by_slug(slug: str, db: Session = Depends(get_db)):
     """Get source by slug"""
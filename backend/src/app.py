@@ -14,9 +14,12 @@ from .api.routers import (
     articles,
     article_notifications,
     summaries,
+    crawl_runs,
 )
 from .database.migrations import init_db_with_migrations
 from .services.scheduler.job_scheduler import JobScheduler
+from .services.crawler.extraction import shutdown_extraction_pool
+from .services.crawler.site_profile import load_profiles
 from .config.settings import settings
 from .middleware import SwaggerAuthMiddleware, RateLimitMiddleware
 
@@ -41,6 +44,9 @@ async def lifespan(app: FastAPI):
     init_db_with_migrations()
     logger.info("Database initialized")
     
+    # Compile site extraction profiles once, failing fast on invalid ones
+    load_profiles()
+    
     # Start scheduler
     logger.info("Starting scheduler...")
     scheduler = JobScheduler()
@@ -53,6 +59,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down scheduler...")
     if scheduler:
         await scheduler.shutdown()
+    shutdown_extraction_pool()
     logger.info("Application shutdown complete")
 
 
@@ -94,6 +101,7 @@ api_router.include_router(categories.router)
 api_router.include_router(articles.router)
 api_router.include_router(article_notifications.router)
 api_router.include_router(summaries.router)
+api_router.include_router(crawl_runs.router)
 
 app.include_router(api_router)
 
@@ -16,13 +16,66 @@ class Settings(BaseSettings):
     # Scheduler
     crawl_at_hours: str = "8,17"  # Crawl at 8h and 17h daily
     crawl_at_minutes: str = "0"
+    crawl_adaptive_schedule: bool = True  # Crawl each source when due instead of all sources at crawl_at_hours
+    crawl_tick_minutes: int = 5  # How often due sources are checked
+    crawl_min_interval_minutes: int = 15  # Shortest interval between two crawls of a source
+    crawl_max_interval_minutes: int = 720  # Longest interval between two crawls of a source
+    crawl_target_new_articles: int = 10  # New articles a crawl should find on average
     timezone: str = "Asia/Ho_Chi_Minh"
     
     # AI Batch Processing
     summary_batch_size: int = 5  # Number of articles per batch for summarization
+    summary_flush_seconds: int = 30  # Summarize a partial batch of streamed articles after this idle time
     
     # Crawler Settings
     crawl_articles_limit: int = 30  # Maximum number of articles to crawl per source per run
+    crawl_run_budget: int = 0  # Article pages fetched per run across all sources, shared equally (0 = no global limit)
+    crawl_write_batch_size: int = 10  # Crawled articles stored per insert while a source is still being crawled
+    crawl_max_concurrency: int = 16  # Maximum concurrent requests across all sources
+    crawl_per_host_concurrency: int = 4  # Maximum concurrent requests to a single host
+    crawl_request_timeout: int = 30  # Timeout in seconds for a single request
+    crawl_max_page_mb: int = 5  # Responses larger than this are aborted instead of downloaded
+    crawl_connect_timeout: float = 5.0  # Timeout in seconds for opening a connection, so dead hosts fail fast
+    crawl_retry_attempts: int = 2  # Retries of a request failing with a transient error (network, 429, 5xx)
+    crawl_retry_backoff: float = 0.5  # Delay in seconds before the first retry, doubled on each retry
+    crawl_retry_max_backoff: float = 8.0  # Longest delay between two retries
+    crawl_host_failure_budget: int = 5  # Failed requests to a host after which a run stops fetching from it
+    crawl_circuit_failure_threshold: int = 3  # Consecutive failed runs after which a source is skipped
+    crawl_circuit_cooldown_minutes: int = 30  # Wait before probing a skipped source, doubled while probes fail
+    crawl_circuit_max_cooldown_minutes: int = 720  # Longest wait between two probes of a skipped source
+    crawl_http2: bool = True  # Negotiate HTTP/2 when the server supports it
+    crawl_keepalive_expiry: float = 30.0  # Seconds an idle pooled connection is kept open
+    crawl_dns_cache_ttl: int = 300  # Seconds the resolved addresses of a host are cached (0 disables)
+    crawl_fast_parse: bool = True  # Parse with lxml and strainers on sites that enable it
+    crawl_sitemap_discovery: bool = True  # Discover links from news sitemaps on sites that declare them
+    crawl_sitemap_max_children: int = 5  # Sitemap index children read per run
+    crawl_rss_fetch_concurrency: int = 8  # Full-article pages fetched at once per RSS feed
+    crawl_rss_fetch_deadline: int = 60  # Seconds after which short RSS entries are kept without their full article
+    crawl_extract_workers: int = 2  # Processes extracting articles from HTML (0 extracts in the app process)
+    crawl_archive_dir: Optional[str] = None  # Directory archiving raw fetched pages (disabled if empty)
+    crawl_archive_segment_mb: int = 256  # Size at which archive segment files are rotated
+    
+    # Distributed crawling
+    crawl_frontier_enabled: bool = False  # Homepage sources only discover links; crawl workers fetch the pages from crawl_frontier
+    crawl_worker_batch_size: int = 20  # Frontier entries leased by a worker at a time
+    crawl_worker_lease_seconds: int = 300  # Entries of a worker that died are taken by others after this
+    crawl_worker_idle_seconds: float = 5.0  # Wait of a worker finding the frontier empty
+    crawl_frontier_max_attempts: int = 3  # Fetches of an entry before it is marked failed
+    crawl_frontier_retry_minutes: int = 5  # Wait before retrying a failed entry, doubled on each attempt
+    crawl_frontier_retention_days: int = 7  # Failed entries are deleted (and can be found again) after this
+    crawl_runs_retention_days: int = 30  # Metrics of crawl runs are kept this long
+    
+    # Article revisits
+    revisit_enabled: bool = True  # Re-fetch recent articles to pick up updated stories
+    revisit_window_hours: int = 24  # Articles crawled within this window are revisited
+    revisit_interval_minutes: int = 60  # Minimum time between two revisits of an article
+    revisit_batch_size: int = 50  # Articles revisited per crawl job
+    revisit_min_change: float = 0.15  # Share of the content that must change for a new summary
+    
+    # Near-duplicate detection
+    dedup_enabled: bool = True  # Link copies of the same story so only one is summarized and notified
+    dedup_similarity: float = 0.6  # Minimum estimated shingle similarity (Jaccard) of duplicates
+    dedup_window_days: int = 3  # How far back earlier copies of a story are searched
     
     # Logging
     log_level: str = "INFO"
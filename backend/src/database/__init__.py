@@ -1,5 +1,5 @@
 from .connection import get_db_session, init_db
-from .models import Base, Source, Article, Summary, DiscordMessage, User
+from .models import Base, Source, Article, Summary, DiscordMessage, User, HttpValidator, SourceCrawlState, ArticleFingerprintBand
 
-__all__ = ["get_db_session", "init_db", "Base", "Source", "Article", "Summary", "DiscordMessage", "User"]
+__all__ = ["get_db_session", "init_db", "Base", "Source", "Article", "Summary", "DiscordMessage", "User", "HttpValidator", "SourceCrawlState", "ArticleFingerprintBand"]
 
@@ -341,6 +341,148 @@ def migrate_add_article_notifications_table():
             raise
 
 
+def migrate_add_crawl_schedule_columns():
+    """Add adaptive scheduling columns to source_crawl_states table if they don't exist"""
+    columns = {
+        "last_crawled_at": "TIMESTAMP WITH TIME ZONE",
+        "next_crawl_at": "TIMESTAMP WITH TIME ZONE",
+        "crawl_interval_minutes": "DOUBLE PRECISION",
+        "new_article_rate": "DOUBLE PRECISION",
+        "empty_runs": "INTEGER NOT NULL DEFAULT 0",
+    }
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name='source_crawl_states'
+            """))
+            existing = {row[0] for row in result}
+            
+            missing = [name for name in columns if name not in existing]
+            if not missing:
+                logger.info("Crawl schedule columns already exist in source_crawl_states table")
+                return
+            
+            for name in missing:
+                conn.execute(text(f"ALTER TABLE source_crawl_states ADD COLUMN {name} {columns[name]}"))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_source_crawl_states_next_crawl_at 
+                ON source_crawl_states(next_crawl_at)
+            """))
+            conn.commit()
+            logger.info(f"Successfully added {', '.join(missing)} to source_crawl_states table")
+            
+    except ProgrammingError as e:
+        logger.error(f"Error adding crawl schedule columns: {e}")
+        if "already exists" not in str(e).lower():
+            raise
+
+
+def migrate_add_article_dedup_columns():
+    """Add near-duplicate columns to articles table if they don't exist"""
+    columns = {
+        "minhash": "BYTEA",
+        "canonical_article_id": "INTEGER REFERENCES articles(id) ON DELETE SET NULL",
+    }
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name='articles'
+            """))
+            existing = {row[0] for row in result}
+            
+            missing = [name for name in columns if name not in existing]
+            if not missing:
+                logger.info("Near-duplicate columns already exist in articles table")
+                return
+            
+            for name in missing:
+                conn.execute(text(f"ALTER TABLE articles ADD COLUMN {name} {columns[name]}"))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_articles_canonical_article_id 
+                ON articles(canonical_article_id)
+            """))
+            conn.commit()
+            logger.info(f"Successfully added {', '.join(missing)} to articles table")
+            
+    except ProgrammingError as e:
+        logger.error(f"Error adding near-duplicate columns: {e}")
+        if "already exists" not in str(e).lower():
+            raise
+
+
+def migrate_add_article_revisit_columns():
+    """Add content-change columns to articles table if they don't exist"""
+    columns = {
+        "content_hash": "VARCHAR(64)",
+        "content_updated_at": "TIMESTAMP WITH TIME ZONE",
+        "last_revisited_at": "TIMESTAMP WITH TIME ZONE",
+    }
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name='articles'
+            """))
+            existing = {row[0] for row in result}
+            
+            missing = [name for name in columns if name not in existing]
+            if not missing:
+                logger.info("Revisit columns already exist in articles table")
+                return
+            
+            for name in missing:
+                conn.execute(text(f"ALTER TABLE articles ADD COLUMN {name} {columns[name]}"))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_articles_last_revisited_at 
+                ON articles(last_revisited_at)
+            """))
+            conn.commit()
+            logger.info(f"Successfully added {', '.join(missing)} to articles table")
+            
+    except ProgrammingError as e:
+        logger.error(f"Error adding revisit columns: {e}")
+        if "already exists" not in str(e).lower():
+            raise
+
+
+def migrate_add_circuit_breaker_columns():
+    """Add circuit breaker columns to source_crawl_states table if they don't exist"""
+    columns = {
+        "consecutive_failures": "INTEGER NOT NULL DEFAULT 0",
+        "circuit_open_until": "TIMESTAMP WITH TIME ZONE",
+        "last_failure_at": "TIMESTAMP WITH TIME ZONE",
+        "last_error": "VARCHAR(500)",
+    }
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name='source_crawl_states'
+            """))
+            existing = {row[0] for row in result}
+            
+            missing = [name for name in columns if name not in existing]
+            if not missing:
+                logger.info("Circuit breaker columns already exist in source_crawl_states table")
+                return
+            
+            for name in missing:
+                conn.execute(text(f"ALTER TABLE source_crawl_states ADD COLUMN {name} {columns[name]}"))
+            conn.commit()
+            logger.info(f"Successfully added {', '.join(missing)} to source_crawl_states table")
+            
+    except ProgrammingError as e:
+        logger.error(f"Error adding circuit breaker columns: {e}")
+        if "already exists" not in str(e).lower():
+            raise
+
+
 def init_db_with_migrations():
     """Initialize database and run migrations"""
     from .connection import init_db
@@ -357,6 +499,10 @@ def init_db_with_migrations():
         migrate_add_unique_user_provider_constraint()
         migrate_add_notification_hours()
         migrate_add_article_notifications_table()
+        migrate_add_crawl_schedule_columns()
+        migrate_add_article_dedup_columns()
+        migrate_add_article_revisit_columns()
+        migrate_add_circuit_breaker_columns()
     except Exception as e:
         logger.warning(f"Migration failed (might be expected if column/table already exists): {e}")
 
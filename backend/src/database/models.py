@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, func, JSON, Table, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, Float, LargeBinary, String, DateTime, Text, ForeignKey, Boolean, func, JSON, Table, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -61,6 +61,12 @@ class Article(Base):
     crawled_at = Column(DateTime(timezone=True), server_default=func.now())
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False, index=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
+    minhash = Column(LargeBinary)  # MinHash signature of the content (near-duplicate detection)
+    # Earlier article of the same story; duplicates are not summarized or notified
+    canonical_article_id = Column(Integer, ForeignKey("articles.id", ondelete="SET NULL"), nullable=True, index=True)
+    content_hash = Column(String(64))  # sha256 hex digest of the normalized content
+    content_updated_at = Column(DateTime(timezone=True))  # Last significant content change, triggers a new summary
+    last_revisited_at = Column(DateTime(timezone=True), index=True)
     
     source = relationship("Source", back_populates="articles")
     category = relationship("Category", back_populates="articles")
@@ -70,6 +76,18 @@ class Article(Base):
         return f"<Article(id={self.id}, title='{self.title[:50]}...', url='{self.url}')>"
 
 
+class ArticleUrlAlias(Base):
+    """Model for other URLs of a stored article (the link fetched when the page's rel=canonical differs)"""
+    __tablename__ = "article_url_aliases"
+    
+    url = Column(String(500), primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ArticleUrlAlias(url='{self.url}', article_id={self.article_id})>"
+
+
 class Summary(Base):
     """Model for AI-generated summaries"""
     __tablename__ = "summaries"
@@ -173,3 +191,102 @@ class ArticleNotification(Base):
     def __repr__(self):
         return f"<ArticleNotification(id={self.id}, article_id={self.article_id}, user_id={self.user_id}, channel_id={self.channel_id})>"
 
+
+
+class HttpValidator(Base):
+    """Model for HTTP cache validators of crawled URLs (conditional GET)"""
+    __tablename__ = "http_validators"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String(500), nullable=False, unique=True, index=True)
+    etag = Column(String(255))
+    last_modified = Column(String(100))
+    body_hash = Column(String(64))  # sha256 hex digest of the last response body
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<HttpValidator(id={self.id}, url='{self.url}', etag='{self.etag}')>"
+
+
+class SourceCrawlState(Base):
+    """Model for per-source crawl bookkeeping carried between runs"""
+    __tablename__ = "source_crawl_states"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source_id = Column(Integer, ForeignKey("sources.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    sitemap_watermark = Column(DateTime(timezone=True))  # Newest sitemap lastmod/publication date already crawled
+    last_crawled_at = Column(DateTime(timezone=True))
+    next_crawl_at = Column(DateTime(timezone=True), index=True)
+    crawl_interval_minutes = Column(Float)
+    new_article_rate = Column(Float)  # Smoothed new articles per hour
+    empty_runs = Column(Integer, default=0, nullable=False)  # Consecutive runs without new articles
+    consecutive_failures = Column(Integer, default=0, nullable=False)  # Consecutive failed runs
+    circuit_open_until = Column(DateTime(timezone=True))  # Source is skipped until then (circuit breaker)
+    last_failure_at = Column(DateTime(timezone=True))
+    last_error = Column(String(500))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    source = relationship("Source")
+    
+    def __repr__(self):
+        return f"<SourceCrawlState(id={self.id}, source_id={self.source_id}, next_crawl_at={self.next_crawl_at})>"
+
+
+class ArticleFingerprintBand(Base):
+    """Model for the LSH band index of article MinHash signatures (near-duplicate lookup)"""
+    __tablename__ = "article_fingerprint_bands"
+    
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    value = Column(BigInteger, nullable=False)  # Hash of the band's signature rows
+    
+    __table_args__ = (
+        Index("ix_article_fingerprint_bands_band_value", "band", "value"),
+    )
+    
+    def __repr__(self):
+        return f"<ArticleFingerprintBand(article_id={self.article_id}, band={self.band}, value={self.value})>"
+
+
+class CrawlFrontierEntry(Base):
+    """Model for article pages waiting to be fetched by crawl workers"""
+    __tablename__ = "crawl_frontier"
+    
+    id = Column(BigInteger, primary_key=True)
+    url = Column(String(500), nullable=False, unique=True)
+    source_id = Column(Integer, ForeignKey("sources.id", ondelete="CASCADE"), nullable=False, index=True)
+    priority = Column(Float, nullable=False, default=0)  # Higher is fetched first
+    status = Column(String(20), default="pending", nullable=False)  # pending, leased, failed
+    lease_owner = Column(String(100))  # Worker holding the lease
+    lease_expires_at = Column(DateTime(timezone=True))  # Expired leases (crashed workers) are taken again
+    next_attempt_at = Column(DateTime(timezone=True))  # Retries wait until then
+    attempts = Column(SmallInteger, default=0, nullable=False)
+    last_error = Column(String(500))
+    discovered_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    source = relationship("Source")
+    
+    __table_args__ = (
+        Index("ix_crawl_frontier_status_priority", "status", "priority"),
+    )
+    
+    def __repr__(self):
+        return f"<CrawlFrontierEntry(id={self.id}, url='{self.url}', status='{self.status}')>"
+
+
+class CrawlRun(Base):
+    """Model for the metrics of a crawl run"""
+    __tablename__ = "crawl_runs"
+    
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    finished_at = Column(DateTime(timezone=True))
+    duration_seconds = Column(Float, nullable=False, default=0)
+    sources = Column(Integer, nullable=False, default=0)
+    requests = Column(Integer, nullable=False, default=0)
+    bytes = Column(BigInteger, nullable=False, default=0)
+    articles_stored = Column(Integer, nullable=False, default=0)
+    metrics = Column(JSON, nullable=False)  # Totals and per-source metrics, see CrawlRunMetrics.summary
+    
+    def __repr__(self):
+        return f"<CrawlRun(id={self.id}, started_at={self.started_at}, articles_stored={self.articles_stored})>"
@@ -2,5 +2,11 @@ from .source_repository import SourceRepository
 from .user_repository import UserRepository
 from .notification_repository import NotificationRepository
 from .category_repository import CategoryRepository
+from .http_validator_repository import HttpValidatorRepository
+from .article_repository import ArticleRepository
+from .source_crawl_state_repository import SourceCrawlStateRepository
+from .article_fingerprint_repository import ArticleFingerprintRepository
+from .crawl_frontier_repository import CrawlFrontierRepository
+from .crawl_run_repository import CrawlRunRepository
 
-__all__ = ["SourceRepository", "UserRepository", "NotificationRepository", "CategoryRepository"]
+__all__ = ["SourceRepository", "UserRepository", "NotificationRepository", "CategoryRepository", "HttpValidatorRepository", "ArticleRepository", "SourceCrawlStateRepository", "ArticleFingerprintRepository", "CrawlFrontierRepository", "CrawlRunRepository"]
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from ..database.models import Article, ArticleFingerprintBand
+
+
+class ArticleFingerprintRepository:
+    """Repository for the MinHash LSH band index of articles"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def find_by_bands(self, bands: Iterable[Tuple[int, int]], since: datetime) -> List[Tuple[int, bytes, Optional[int]]]:
+        """
+        Find recent articles sharing at least one LSH band, in one query
+        
+        Args:
+            bands: (band, value) pairs to look up
+            since: Only articles crawled after this time
+            
+        Returns:
+            (article ID, MinHash signature, canonical article ID) of each match
+        """
+        bands = list(set(bands))
+        if not bands:
+            return []
+        stmt = (
+            select(Article.id, Article.minhash, Article.canonical_article_id)
+            .join(ArticleFingerprintBand, ArticleFingerprintBand.article_id == Article.id)
+            .where(
+                tuple_(ArticleFingerprintBand.band, ArticleFingerprintBand.value).in_(bands),
+                Article.crawled_at >= since,
+                Article.minhash.is_not(None),
+            )
+            .distinct()
+        )
+        return [tuple(row) for row in self.session.execute(stmt).all()]
+    
+    def add_bands(self, article_bands: Dict[int, List[int]]) -> None:
+        """Index (or re-index) the LSH band values of articles (band number is the list position)"""
+        rows = [
+            {"article_id": article_id, "band": band, "value": value}
+            for article_id, values in article_bands.items()
+            for band, value in enumerate(values)
+        ]
+        if not rows:
+            return
+        stmt = insert(ArticleFingerprintBand)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArticleFingerprintBand.article_id, ArticleFingerprintBand.band],
+            set_={"value": stmt.excluded.value},
+        )
+        self.session.execute(stmt, rows)
@@ -0,0 +1,186 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, update, delete, union
+from sqlalchemy.dialects.postgresql import insert
+
+from ..database.models import Article, ArticleNotification, ArticleUrlAlias, Summary
+
+
+class ArticleRepository:
+    """Repository for Article operations"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def get_existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of URLs that are already stored, as article URL or alias, in one query"""
+        urls = list(set(urls))
+        if not urls:
+            return set()
+        stmt = union(
+            select(Article.url).where(Article.url.in_(urls)),
+            select(ArticleUrlAlias.url).where(ArticleUrlAlias.url.in_(urls)),
+        )
+        return set(self.session.scalars(stmt).all())
+    
+    def add_url_aliases(self, aliases: Dict[str, str]) -> int:
+        """
+        Record other URLs of stored articles, so links to them count as known
+        
+        Args:
+            aliases: Alias URL -> URL of the stored article
+            
+        Returns:
+            Number of aliases added (existing ones and unknown articles are skipped)
+        """
+        aliases = {alias: url for alias, url in aliases.items() if alias != url}
+        if not aliases:
+            return 0
+        ids = dict(self.session.execute(
+            select(Article.url, Article.id).where(Article.url.in_(set(aliases.values())))
+        ).all())
+        rows = [{"url": alias, "article_id": ids[url]} for alias, url in aliases.items() if url in ids]
+        if not rows:
+            return 0
+        stmt = (
+            insert(ArticleUrlAlias)
+            .on_conflict_do_nothing(index_elements=[ArticleUrlAlias.url])
+            .returning(ArticleUrlAlias.url)
+        )
+        return len(self.session.scalars(stmt, rows).all())
+    
+    def get_by_urls(self, urls: Iterable[str]) -> Dict[str, Article]:
+        """Get stored articles of a list of URLs in one query, keyed by URL"""
+        urls = list(set(urls))
+        if not urls:
+            return {}
+        stmt = select(Article).where(Article.url.in_(urls))
+        return {article.url: article for article in self.session.scalars(stmt).all()}
+    
+    def get_due_for_revisit(self, source_ids: Iterable[int], crawled_since: datetime,
+                            revisited_before: datetime, limit: int) -> List[Article]:
+        """
+        Get recent articles whose last fetch (crawl or revisit) is older than revisited_before
+        
+        Args:
+            source_ids: Only articles of these sources
+            crawled_since: Only articles crawled after this time
+            revisited_before: Articles revisited after this time are not due yet
+            limit: Maximum number of articles
+            
+        Returns:
+            Due articles, least recently fetched first
+        """
+        source_ids = list(source_ids)
+        if not source_ids:
+            return []
+        last_fetched_at = func.coalesce(Article.last_revisited_at, Article.crawled_at)
+        stmt = (
+            select(Article)
+            .where(
+                Article.source_id.in_(source_ids),
+                Article.crawled_at >= crawled_since,
+                last_fetched_at < revisited_before,
+            )
+            .order_by(last_fetched_at.asc())
+            .limit(limit)
+        )
+        return list(self.session.scalars(stmt).all())
+    
+    def insert_new(self, rows: List[Dict[str, Any]]) -> List[Article]:
+        """
+        Insert a batch of articles in one statement, skipping existing URLs
+        
+        Uses INSERT ... ON CONFLICT (url) DO NOTHING RETURNING, so concurrent
+        runs inserting the same URL never fail the whole batch.
+        
+        Args:
+            rows: Article column values, one dict per article
+            
+        Returns:
+            Only the articles that were actually inserted
+        """
+        # Keep the first row per URL
+        seen_urls = set()
+        unique_rows = []
+        for row in rows:
+            if row["url"] not in seen_urls:
+                seen_urls.add(row["url"])
+                unique_rows.append(row)
+        
+        if not unique_rows:
+            return []
+        
+        stmt = (
+            insert(Article)
+            .on_conflict_do_nothing(index_elements=[Article.url])
+            .returning(Article)
+        )
+        return list(self.session.scalars(stmt, unique_rows).all())
+    
+    def get_all_urls(self) -> List[Tuple[int, str, int]]:
+        """Get (id, url, source_id) of every article, oldest first"""
+        stmt = select(Article.id, Article.url, Article.source_id).order_by(Article.id)
+        return [tuple(row) for row in self.session.execute(stmt).all()]
+    
+    def merge_duplicates(self, keeper: Article, duplicate_ids: List[int], url: str) -> None:
+        """
+        Merge stored copies of an article into one
+        
+        Summaries, notifications, URL aliases and near-duplicate links of the
+        copies are moved to the keeper (a user notified of several copies keeps one
+        notification), then the copies are deleted and the keeper gets the
+        canonical URL. Does not commit.
+        
+        Args:
+            keeper: Article kept
+            duplicate_ids: IDs of the other copies
+            url: Canonical URL of the article
+        """
+        if duplicate_ids:
+            copies = [keeper.id, *duplicate_ids]
+            notifications = self.session.scalars(
+                select(ArticleNotification)
+                .where(ArticleNotification.article_id.in_(copies))
+                .order_by(ArticleNotification.article_id != keeper.id, ArticleNotification.id)
+            ).all()
+            notified = set()
+            for notification in notifications:
+                key = (notification.user_id, notification.channel_id)
+                if key in notified:
+                    self.session.delete(notification)
+                else:
+                    notified.add(key)
+                    notification.article_id = keeper.id
+            self.session.flush()
+            
+            self.session.execute(
+                update(Summary).where(Summary.article_id.in_(duplicate_ids))
+                .values(article_id=keeper.id).execution_options(synchronize_session=False)
+            )
+            self.session.execute(
+                update(ArticleUrlAlias).where(ArticleUrlAlias.article_id.in_(duplicate_ids))
+                .values(article_id=keeper.id).execution_options(synchronize_session=False)
+            )
+            self.session.execute(
+                update(Article)
+                .where(Article.canonical_article_id.in_(duplicate_ids), Article.id != keeper.id)
+                .values(canonical_article_id=keeper.id).execution_options(synchronize_session=False)
+            )
+            if keeper.canonical_article_id in duplicate_ids:
+                keeper.canonical_article_id = None
+            if keeper.category_id is None:
+                keeper.category_id = self.session.scalar(
+                    select(Article.category_id)
+                    .where(Article.id.in_(duplicate_ids), Article.category_id.isnot(None))
+                    .limit(1)
+                )
+            self.session.execute(
+                delete(Article).where(Article.id.in_(duplicate_ids)).execution_options(synchronize_session=False)
+            )
+        
+        # The canonical URL is the article's own now, not an alias
+        self.session.execute(delete(ArticleUrlAlias).where(ArticleUrlAlias.url == url))
+        keeper.url = url
+        self.session.flush()
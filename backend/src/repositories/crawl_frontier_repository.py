@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from ..database.models import CrawlFrontierEntry
+
+
+class CrawlFrontierRepository:
+    """Repository for CrawlFrontierEntry operations"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def enqueue(self, source_id: int, links: List[Tuple[str, float]]) -> int:
+        """
+        Add article links of a source, skipping URLs already in the frontier
+
+        Args:
+            source_id: Source the links were found on
+            links: (url, priority) pairs
+
+        Returns:
+            Number of links added
+        """
+        rows = {url: priority for url, priority in links}
+        if not rows:
+            return 0
+        stmt = (
+            insert(CrawlFrontierEntry)
+            .values([{"url": url, "source_id": source_id, "priority": priority} for url, priority in rows.items()])
+            .on_conflict_do_nothing(index_elements=[CrawlFrontierEntry.url])
+            .returning(CrawlFrontierEntry.id)
+        )
+        return len(self.session.execute(stmt).all())
+
+    def get_queued_urls(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of URLs that are in the frontier (pending, leased or failed), in one query"""
+        urls = list(set(urls))
+        if not urls:
+            return set()
+        stmt = select(CrawlFrontierEntry.url).where(CrawlFrontierEntry.url.in_(urls))
+        return set(self.session.scalars(stmt).all())
+
+    def lease(self, worker_id: str, limit: int, lease_seconds: int, max_attempts: int,
+              now: datetime) -> List[CrawlFrontierEntry]:
+        """
+        Lease the highest-priority ready entries to a worker
+
+        Ready entries are pending ones due for an attempt, and leased ones
+        whose lease expired (their worker died) with attempts left. Rows
+        locked by another worker's lease are skipped (FOR UPDATE SKIP
+        LOCKED), so any number of workers can lease concurrently without
+        handing out a URL twice. Commit right after to release the row locks.
+
+        Args:
+            worker_id: Lease owner
+            limit: Maximum number of entries
+            lease_seconds: Lease duration
+            max_attempts: Attempts after which an expired lease is not taken again
+            now: Current time
+
+        Returns:
+            The leased entries
+        """
+        ready = (
+            select(CrawlFrontierEntry.id)
+            .where(or_(
+                and_(
+                    CrawlFrontierEntry.status == "pending",
+                    or_(CrawlFrontierEntry.next_attempt_at.is_(None), CrawlFrontierEntry.next_attempt_at <= now),
+                ),
+                and_(
+                    CrawlFrontierEntry.status == "leased",
+                    CrawlFrontierEntry.lease_expires_at < now,
+                    CrawlFrontierEntry.attempts < max_attempts,
+                ),
+            ))
+            .order_by(CrawlFrontierEntry.priority.desc(), CrawlFrontierEntry.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("ready")
+        )
+        stmt = (
+            update(CrawlFrontierEntry)
+            .where(CrawlFrontierEntry.id.in_(select(ready.c.id)))
+            .values(
+                status="leased",
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=CrawlFrontierEntry.attempts + 1,
+            )
+            .returning(CrawlFrontierEntry)
+            .execution_options(synchronize_session=False)
+        )
+        return list(self.session.scalars(stmt).all())
+
+    def complete(self, worker_id: str, entry_ids: Iterable[int]) -> int:
+        """
+        Remove fetched entries, their articles are stored
+
+        Entries whose lease expired and went to another worker are left to it.
+
+        Returns:
+            Number of entries removed
+        """
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return 0
+        stmt = (
+            delete(CrawlFrontierEntry)
+            .where(
+                CrawlFrontierEntry.id.in_(entry_ids),
+                CrawlFrontierEntry.status == "leased",
+                CrawlFrontierEntry.lease_owner == worker_id,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount
+
+    def release(self, worker_id: str, entry: CrawlFrontierEntry, error: str, max_attempts: int,
+                retry_after: timedelta, now: datetime) -> bool:
+        """
+        Return a failed entry to the frontier
+
+        The entry is retried after `retry_after` (doubled with each
+        attempt), or marked failed once it used `max_attempts` attempts.
+        Nothing changes if the lease expired and the entry went to another worker.
+
+        Returns:
+            Whether the worker still held the lease
+        """
+        values = {"lease_owner": None, "lease_expires_at": None, "last_error": error[:500]}
+        if entry.attempts >= max_attempts:
+            values["status"] = "failed"
+        else:
+            values["status"] = "pending"
+            values["next_attempt_at"] = now + retry_after * 2 ** (entry.attempts - 1)
+        stmt = (
+            update(CrawlFrontierEntry)
+            .where(
+                CrawlFrontierEntry.id == entry.id,
+                CrawlFrontierEntry.status == "leased",
+                CrawlFrontierEntry.lease_owner == worker_id,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount > 0
+
+    def expire_exhausted(self, max_attempts: int, now: datetime) -> int:
+        """Mark entries whose last lease expired after their final attempt as failed"""
+        stmt = (
+            update(CrawlFrontierEntry)
+            .where(
+                CrawlFrontierEntry.status == "leased",
+                CrawlFrontierEntry.lease_expires_at < now,
+                CrawlFrontierEntry.attempts >= max_attempts,
+            )
+            .values(status="failed", lease_owner=None, last_error="Lease expired")
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount
+
+    def purge_failed(self, discovered_before: datetime) -> int:
+        """Delete failed entries discovered before a date, so their URLs can be found again"""
+        stmt = (
+            delete(CrawlFrontierEntry)
+            .where(CrawlFrontierEntry.status == "failed", CrawlFrontierEntry.discovered_at < discovered_before)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Get the number of entries per status"""
+        stmt = select(CrawlFrontierEntry.status, func.count()).group_by(CrawlFrontierEntry.status)
+        return {status: count for status, count in self.session.execute(stmt).all()}
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+
+from ..database.models import CrawlRun
+
+
+class CrawlRunRepository:
+    """Repository for CrawlRun operations"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create(self, **values) -> CrawlRun:
+        """Add the metrics of a crawl run"""
+        run = CrawlRun(**values)
+        self.session.add(run)
+        self.session.flush()
+        return run
+
+    def get_by_id(self, run_id: int) -> Optional[CrawlRun]:
+        """Get a crawl run by ID"""
+        return self.session.get(CrawlRun, run_id)
+
+    def get_recent(self, limit: int = 20) -> List[CrawlRun]:
+        """Get the latest crawl runs, newest first"""
+        stmt = select(CrawlRun).order_by(CrawlRun.started_at.desc()).limit(limit)
+        return list(self.session.scalars(stmt).all())
+
+    def delete_older_than(self, started_before: datetime) -> int:
+        """Delete the runs started before a date"""
+        stmt = (
+            delete(CrawlRun)
+            .where(CrawlRun.started_at < started_before)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount
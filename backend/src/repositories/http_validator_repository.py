@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+
+from ..database.models import HttpValidator
+
+
+class HttpValidatorRepository:
+    """Repository for HttpValidator operations"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def get_by_url(self, url: str) -> Optional[HttpValidator]:
+        """Get validators stored for a URL"""
+        stmt = select(HttpValidator).where(HttpValidator.url == url)
+        return self.session.scalar(stmt)
+    
+    def get_by_urls(self, urls: Iterable[str]) -> List[HttpValidator]:
+        """Get validators stored for a list of URLs in one query"""
+        urls = list(urls)
+        if not urls:
+            return []
+        stmt = select(HttpValidator).where(HttpValidator.url.in_(urls))
+        return list(self.session.scalars(stmt).all())
+    
+    def upsert(self, url: str, etag: Optional[str], last_modified: Optional[str], body_hash: Optional[str]) -> HttpValidator:
+        """Create or update validators for a URL"""
+        validator = self.get_by_url(url)
+        if validator is None:
+            validator = HttpValidator(url=url)
+            self.session.add(validator)
+        
+        validator.etag = etag
+        validator.last_modified = last_modified
+        validator.body_hash = body_hash
+        self.session.flush()
+        return validator
+    
+    def delete_not_updated_since(self, since: datetime, keep_urls: Iterable[str] = ()) -> int:
+        """Delete validators not refreshed since a time, except for the given URLs"""
+        stmt = delete(HttpValidator).where(HttpValidator.updated_at < since)
+        keep_urls = list(keep_urls)
+        if keep_urls:
+            stmt = stmt.where(HttpValidator.url.not_in(keep_urls))
+        return self.session.execute(stmt).rowcount
@@ -0,0 +1,42 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+from ..database.models import SourceCrawlState
+
+
+class SourceCrawlStateRepository:
+    """Repository for SourceCrawlState operations"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def get_by_source_ids(self, source_ids: Iterable[int]) -> Dict[int, SourceCrawlState]:
+        """Get crawl states of a list of sources in one query, keyed by source ID"""
+        source_ids = list(source_ids)
+        if not source_ids:
+            return {}
+        stmt = select(SourceCrawlState).where(SourceCrawlState.source_id.in_(source_ids))
+        return {state.source_id: state for state in self.session.scalars(stmt).all()}
+    
+    def get_or_create(self, source_id: int) -> SourceCrawlState:
+        """Get the crawl state of a source, creating an empty one if needed"""
+        stmt = select(SourceCrawlState).where(SourceCrawlState.source_id == source_id)
+        state = self.session.scalar(stmt)
+        if state is None:
+            state = SourceCrawlState(source_id=source_id)
+            self.session.add(state)
+            self.session.flush()
+        return state
+    
+    def reset_circuit(self, source_id: int) -> Optional[SourceCrawlState]:
+        """Close the circuit of a source so it is crawled on the next run"""
+        stmt = select(SourceCrawlState).where(SourceCrawlState.source_id == source_id)
+        state = self.session.scalar(stmt)
+        if state is None:
+            return None
+        state.consecutive_failures = 0
+        state.circuit_open_until = None
+        state.next_crawl_at = None
+        self.session.flush()
+        return state
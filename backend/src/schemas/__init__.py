@@ -1,13 +1,15 @@
-from .source import SourceCreate, SourceUpdate, SourceResponse
+from .source import SourceCreate, SourceUpdate, SourceResponse, SourceHealthResponse
 from .article import ArticleResponse
 from .summary import SummaryResponse
 from .user import UserLogin, UserResponse, UserUpdate
 from .category import CategoryCreate, CategoryUpdate, CategoryResponse, UserCategoryPreferenceUpdate
+from .crawl_run import CrawlRunResponse
 
 __all__ = [
     "SourceCreate",
     "SourceUpdate",
     "SourceResponse",
+    "SourceHealthResponse",
     "ArticleResponse",
     "SummaryResponse",
     "UserLogin",
@@ -16,6 +18,7 @@ __all__ = [
     "CategoryCreate",
     "CategoryUpdate",
     "CategoryResponse",
-    "UserCategoryPreferenceUpdate"
+    "UserCategoryPreferenceUpdate",
+    "CrawlRunResponse"
 ]
 
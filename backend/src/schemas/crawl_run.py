@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class CrawlRunResponse(BaseModel):
+    """Metrics of a crawl run: totals and per-source requests, latencies, statuses and extraction results"""
+    id: int
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_seconds: float
+    sources: int
+    requests: int
+    bytes: int
+    articles_stored: int
+    metrics: Dict[str, Any]
+    
+    class Config:
+        from_attributes = True
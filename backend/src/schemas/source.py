@@ -27,3 +27,17 @@ class SourceResponse(SourceBase):
     class Config:
         from_attributes = True
 
+
+
+class SourceHealthResponse(BaseModel):
+    """Crawl health and circuit breaker state of a source"""
+    source_id: int
+    name: str
+    url: str
+    circuit: str  # closed, open or half_open
+    consecutive_failures: int = 0
+    circuit_open_until: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    last_crawled_at: Optional[datetime] = None
+    next_crawl_at: Optional[datetime] = None
@@ -1,5 +1,7 @@
-from .base_crawler import BaseCrawler
+from .base_crawler import BaseCrawler, HomepageCrawler
+from .engine import CrawlEngine
 from .rss_parser import RSSParser
+from .profile_crawler import ProfileCrawler
 
-__all__ = ["BaseCrawler", "RSSParser"]
+__all__ = ["BaseCrawler", "HomepageCrawler", "CrawlEngine", "RSSParser", "ProfileCrawler"]
 
@@ -0,0 +1,203 @@
+"""
+Append-only, content-addressed archive of raw crawled pages
+
+Pages are stored as WARC/1.1 records, each compressed as an independent
+zstd frame, in size-rotated segment files (archive-00001.warc.zst). A body
+is stored once per sha256 digest; fetching identical bytes again only adds
+a small revisit record. index.tsv maps every fetch to the segment offset of
+its payload, so any page can be decompressed without scanning a segment.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+import fcntl
+import hashlib
+import logging
+import uuid
+
+from ...config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.tsv"
+SEGMENT_PATTERN = "archive-{:05d}.warc.zst"
+REVISIT_PROFILE = "http://netpreserve.org/warc/1.1/revisit/identical-payload-digest"
+
+
+@dataclass
+class ArchiveEntry:
+    """One archived fetch and the location of its payload record"""
+    url: str
+    digest: str  # sha256 hex of the body
+    segment: str
+    offset: int
+    length: int  # Compressed size of the payload record
+    fetched_at: str
+    content_type: str
+
+    def to_line(self) -> str:
+        return "\t".join([
+            self.digest, self.url, self.segment, str(self.offset), str(self.length), self.fetched_at, self.content_type
+        ]) + "\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> "ArchiveEntry":
+        digest, url, segment, offset, length, fetched_at, content_type = line.rstrip("\n").split("\t")
+        return cls(url, digest, segment, int(offset), int(length), fetched_at, content_type)
+
+
+def _warc_record(headers: Dict[str, str], payload: bytes) -> bytes:
+    lines = ["WARC/1.1"] + [f"{name}: {value}" for name, value in headers.items()]
+    lines.append(f"Content-Length: {len(payload)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + payload + b"\r\n\r\n"
+
+
+class PageArchive:
+    """
+    Raw page archive stored in a directory.
+
+    Writes take an exclusive file lock, so several crawler processes (and
+    threads) can share an archive directory; under the lock the index lines
+    appended by the others are read before deduplicating a body.
+    """
+
+    def __init__(self, directory: str, segment_size: Optional[int] = None):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("The page archive needs the 'zstandard' package (httpx[zstd])") from e
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size or settings.crawl_archive_segment_mb * 1024 * 1024
+        self._compressor = zstandard.ZstdCompressor(level=10)
+        self._decompressor = zstandard.ZstdDecompressor()
+        # digest -> entry of the stored payload
+        self._payloads: Dict[str, ArchiveEntry] = {}
+        # Bytes of the index already read into _payloads
+        self._index_offset = 0
+        self._read_new_entries()
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_FILE
+
+    def entries(self) -> Iterator[ArchiveEntry]:
+        """Iterate over every archived fetch in write order"""
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield ArchiveEntry.from_line(line)
+
+    def latest(self) -> Dict[str, ArchiveEntry]:
+        """Get the most recent fetch of every archived URL"""
+        return {entry.url: entry for entry in self.entries()}
+
+    def _read_new_entries(self) -> None:
+        """Add the payloads indexed since the last read, by this or another process"""
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        # Lines are appended under the lock; a partial line (read without it at startup) is read next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            if line.strip():
+                entry = ArchiveEntry.from_line(line)
+                self._payloads.setdefault(entry.digest, entry)
+        self._index_offset += end
+
+    def _current_segment(self) -> Path:
+        segments = sorted(self.directory.glob(SEGMENT_PATTERN.replace("{:05d}", "*")))
+        if segments and segments[-1].stat().st_size < self.segment_size:
+            return segments[-1]
+        return self.directory / SEGMENT_PATTERN.format(len(segments) + 1)
+
+    def store(self, url: str, body: bytes, content_type: Optional[str] = None) -> ArchiveEntry:
+        """
+        Archive a fetched page
+
+        Args:
+            url: Fetched URL
+            body: Raw response body
+            content_type: Response Content-Type
+
+        Returns:
+            Index entry pointing at the page's payload
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        content_type = (content_type or "text/html").replace("\t", " ")
+        headers = {
+            "WARC-Record-ID": f"<urn:uuid:{uuid.uuid4()}>",
+            "WARC-Date": fetched_at,
+            "WARC-Target-URI": url,
+            "WARC-Payload-Digest": f"sha256:{digest}",
+        }
+
+        with open(self.index_path, "ab") as index:
+            fcntl.flock(index, fcntl.LOCK_EX)
+            try:
+                self._read_new_entries()
+                payload = self._payloads.get(digest)
+                if payload:
+                    # Identical body already stored: record the fetch only
+                    headers.update({
+                        "WARC-Type": "revisit",
+                        "WARC-Profile": REVISIT_PROFILE,
+                        "WARC-Refers-To-Target-URI": payload.url,
+                    })
+                    self._append(_warc_record(headers, b""))
+                    entry = ArchiveEntry(url, digest, payload.segment, payload.offset, payload.length, fetched_at, content_type)
+                else:
+                    headers.update({"WARC-Type": "resource", "Content-Type": content_type})
+                    segment, offset, length = self._append(_warc_record(headers, body))
+                    entry = ArchiveEntry(url, digest, segment, offset, length, fetched_at, content_type)
+                    self._payloads[digest] = entry
+
+                index.write(entry.to_line().encode("utf-8"))
+                index.flush()
+                self._index_offset = index.tell()
+            finally:
+                fcntl.flock(index, fcntl.LOCK_UN)
+
+        return entry
+
+    def _append(self, record: bytes):
+        """Append a compressed record to the current segment, returning its location"""
+        frame = self._compressor.compress(record)
+        path = self._current_segment()
+        with open(path, "ab") as segment:
+            offset = segment.tell()
+            segment.write(frame)
+        return path.name, offset, len(frame)
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """Read the body of an archived page"""
+        with open(self.directory / entry.segment, "rb") as segment:
+            segment.seek(entry.offset)
+            record = self._decompressor.decompress(segment.read(entry.length))
+
+        head, _, rest = record.partition(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        return rest[:length]
+
+
+_archive: Optional[PageArchive] = None
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """Get the archive configured by crawl_archive_dir, or None if archiving is off"""
+    global _archive
+    if _archive is None and settings.crawl_archive_dir:
+        _archive = PageArchive(settings.crawl_archive_dir)
+        logger.info(f"Archiving crawled pages to {settings.crawl_archive_dir}")
+    return _archive
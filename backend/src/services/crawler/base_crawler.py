@@ -1,7 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+from dataclasses import dataclass, field
 from datetime import datetime
+from urllib.parse import urlparse
+import asyncio
+import logging
+import time
+
+from bs4 import BeautifulSoup
+
+from ...config.settings import settings
+from .canonical import CanonicalRules, UrlCanonicalizer, get_canonicalizer
+from .extraction import run_extraction
+from .frontier import LinkFrontier
+from .metrics import current_metrics
+from .link_extractor import LinkExtractor, LinkRules
+from .parsing import SubtreeStrainer, make_soup
+from .sitemap import SitemapDiscovery
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+    from .known_urls import KnownUrls
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -11,24 +32,61 @@ class ArticleData:
     title: str
     content: str
     published_date: Optional[datetime] = None
+    # Canonical form of the fetched link, when the page's rel=canonical URL differs from it
+    link_url: Optional[str] = None
+
+
+@dataclass
+class ParseResult:
+    """Outcome of parsing an article page"""
+    article: Optional[ArticleData]
+    failure: Optional[str] = None  # What could not be extracted, if the page gave no article
+    # Field -> index of the matching fallback, "generic" for the readability extractor
+    matches: Dict[str, Union[int, str, None]] = field(default_factory=dict)
+    parse_ms: float = 0.0
 
 
 class BaseCrawler(ABC):
     """Base class for news crawlers"""
-    
+
+    # URL canonicalization of the site, generic rules if not set
+    canonical_rules: Optional[CanonicalRules] = None
+
     def __init__(self, source_url: str):
         self.source_url = source_url
-    
+        self.canonicalizer: UrlCanonicalizer = get_canonicalizer(self.canonical_rules)
+
     @abstractmethod
-    def crawl(self) -> List[ArticleData]:
+    def stream(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"] = None) -> AsyncIterator[ArticleData]:
+        """
+        Crawl articles from the source, yielding each one as soon as it is parsed
+
+        Args:
+            engine: Crawl engine used for all network I/O
+            known_urls: Filter dropping already stored links before fetching
+
+        Yields:
+            ArticleData objects, in completion order
+        """
+        pass
+
+    async def crawl(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"] = None) -> List[ArticleData]:
         """
         Crawl articles from the source
-        
+
+        Args:
+            engine: Crawl engine used for all network I/O
+            known_urls: Filter dropping already stored links before fetching
+
         Returns:
             List of ArticleData objects
         """
-        pass
-    
+        return [article async for article in self.stream(engine, known_urls=known_urls)]
+
+    def init_args(self) -> Tuple[type, tuple]:
+        """Class and constructor arguments rebuilding this crawler in another process"""
+        return type(self), (self.source_url,)
+
     def clean_text(self, text: str) -> str:
         """Clean and normalize text content"""
         if not text:
@@ -37,3 +95,240 @@ class BaseCrawler(ABC):
         text = " ".join(text.split())
         return text.strip()
 
+
+class HomepageCrawler(BaseCrawler):
+    """
+    Base class for crawlers that discover article links on a homepage.
+
+    Subclasses only implement parsing (`link_rules` and `_parse_article`);
+    fetching is delegated to the crawl engine so the homepage and article
+    pages of every source are downloaded concurrently.
+    """
+
+    site_name = "homepage"
+    link_rules: Optional[LinkRules] = None
+    # Subtrees read by the article extractor; with fast_parse pages are parsed
+    # by lxml and only these subtrees are built
+    article_strainer: Optional[SubtreeStrainer] = None
+    fast_parse = False
+    # News sitemaps (URLs or paths) used for discovery instead of the homepage
+    sitemaps: Tuple[str, ...] = ()
+    sitemaps_from_robots = False
+    # Article pages are not downloaded past this marker, everything extracted comes before it
+    stop_after: Optional[bytes] = None
+
+    def __init__(self, source_url: str):
+        super().__init__(source_url)
+        # Extract base URL from source_url
+        parsed = urlparse(source_url)
+        self.base_url = f"{parsed.scheme}://{parsed.netloc}"
+        self.link_extractor = LinkExtractor(self.base_url, self.link_rules or LinkRules(), self.canonicalizer)
+        # Set by the caller from the stored crawl state, advanced over the sitemap entries stored this run
+        self.sitemap_watermark: Optional[datetime] = None
+        # Dated sitemap entries of this run, oldest first, and the new ones not stored yet
+        self._sitemap_entries: List[Tuple[datetime, str]] = []
+        self._sitemap_pending: Set[str] = set()
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+
+    async def stream(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"] = None) -> AsyncIterator[ArticleData]:
+        """Crawl new articles found in the news sitemaps or on the homepage"""
+        crawled = 0
+
+        try:
+            article_links = await self.discover(engine, known_urls)
+            if article_links is None:
+                return
+
+            async def crawl_link(link: str) -> Tuple[str, Optional[ArticleData]]:
+                return link, await self._crawl_article(engine, link)
+
+            # Crawl articles concurrently, the engine enforces the limits
+            tasks = [asyncio.ensure_future(crawl_link(link)) for link in article_links]
+            try:
+                for next_article in asyncio.as_completed(tasks):
+                    link, article = await next_article
+                    if article:
+                        crawled += 1
+                        yield article
+                        # The consumer stored it (or failed and keeps the old crawl state)
+                        self.mark_links_done([link])
+            finally:
+                # The consumer stopped early (or failed): do not leave downloads running
+                for task in tasks:
+                    task.cancel()
+
+            logger.info(f"Crawled {crawled} articles from {self.site_name}")
+
+        except Exception as e:
+            logger.error(f"Error crawling {self.site_name} {self.source_url}: {e}")
+
+    async def discover(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"] = None) -> Optional[List[str]]:
+        """
+        Find the new article links to crawl this run, best first
+
+        Returns:
+            Links within the crawl limit and budget, or None if the homepage is unchanged
+        """
+        if self._sitemap_discovery_enabled():
+            try:
+                article_links = await self._discover_sitemap_links(engine, known_urls)
+                if article_links is not None:
+                    return article_links
+            except Exception as e:
+                logger.warning(f"Sitemap discovery failed for {self.site_name}, using homepage: {e}")
+
+        homepage_links = await self._discover_homepage_links(engine, known_urls)
+        if homepage_links is None:
+            return None
+        return self._select_links(engine, homepage_links)
+
+    async def _discover_homepage_links(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"]) -> Optional[List[str]]:
+        """Find new article links on the homepage, None if it did not change"""
+        html = await engine.fetch_if_changed(self.source_url, headers=self.headers)
+        if html is None:
+            logger.info(f"{self.site_name} homepage unchanged, skipping")
+            return None
+
+        soup = make_soup(html, self.link_extractor.strainer() if self._fast_parse_enabled() else None)
+
+        # Find all article links
+        article_links = self._extract_article_links(soup)
+
+        logger.info(f"Found {len(article_links)} article links on homepage")
+
+        # Skip stored articles so only new links use the crawl budget
+        if known_urls:
+            article_links = known_urls.filter_new(article_links)
+
+        return article_links
+
+    def _sitemap_discovery_enabled(self) -> bool:
+        """Check whether links are discovered from news sitemaps"""
+        return settings.crawl_sitemap_discovery and bool(self.sitemaps or self.sitemaps_from_robots)
+
+    async def _discover_sitemap_links(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"]) -> Optional[List[str]]:
+        """
+        Find new article links in the news sitemaps
+
+        Takes the oldest unseen entries first, up to the crawl limit and the
+        pages granted by the run's crawl budget. `sitemap_watermark` only
+        advances over entries that are stored (see mark_links_done), so
+        entries that fail or exceed the limit are found again next run and
+        a backlog larger than the limit is caught up over the next runs.
+
+        Returns:
+            New article links, or None if the site has no news sitemap
+        """
+        discovery = SitemapDiscovery(engine, headers=self.headers)
+        sitemap_urls = await discovery.find_sitemaps(self.base_url, list(self.sitemaps), self.sitemaps_from_robots)
+        if not sitemap_urls:
+            return None
+
+        entries = await discovery.discover(sitemap_urls, self.sitemap_watermark)
+        for entry in entries:
+            entry.url = self.canonicalizer.canonicalize(entry.url)
+        entries = [entry for entry in entries if self.link_extractor.is_article_url(entry.url)]
+
+        urls = [entry.url for entry in entries]
+        new_urls = set(known_urls.filter_new(urls)) if known_urls else set(urls)
+
+        limit = engine.crawl_budget.allocate(self.source_url, min(len(new_urls), settings.crawl_articles_limit))
+        self._sitemap_entries = [(entry.published, entry.url) for entry in entries if entry.published]
+        self._sitemap_pending = set(new_urls)
+        article_links = []
+        for entry in entries:
+            if entry.url in new_urls:
+                if len(article_links) >= limit:
+                    break
+                article_links.append(entry.url)
+                # Variants of the same article share the canonical URL
+                new_urls.discard(entry.url)
+        # Entries already stored lead the way
+        self.mark_links_done([])
+
+        logger.info(f"Found {len(article_links)} new article links in {self.site_name} sitemaps")
+        return article_links
+
+    def mark_links_done(self, urls: List[str]) -> None:
+        """
+        Record discovered links whose article is stored (or queued for crawl workers)
+
+        The sitemap watermark advances to the newest date before the
+        oldest sitemap entry that is still not stored.
+        """
+        self._sitemap_pending.difference_update(urls)
+        done = 0
+        for published, url in self._sitemap_entries:
+            if url in self._sitemap_pending:
+                break
+            if self.sitemap_watermark is None or published > self.sitemap_watermark:
+                self.sitemap_watermark = published
+            done += 1
+        del self._sitemap_entries[:done]
+
+    def _select_links(self, engine: "CrawlEngine", links: List[str]) -> List[str]:
+        """
+        Pick the homepage links worth crawling this run
+
+        Links are scored in a frontier and taken best first, up to the crawl
+        limit and the pages granted by the run's crawl budget; the others
+        stay new and compete again on the next run. For that the homepage
+        validators of this run are not kept, so the next run parses the
+        homepage again even if it did not change.
+        """
+        frontier = LinkFrontier(self.link_extractor.rules, self.url_date)
+        frontier.extend(links)
+        allowed = engine.crawl_budget.allocate(self.source_url, min(len(frontier), settings.crawl_articles_limit))
+        selected = frontier.pop(allowed)
+        if len(frontier):
+            engine.validators.discard(self.source_url)
+        return selected
+
+    def url_date(self, url: str) -> Optional[datetime]:
+        """Publication date encoded in an article URL, if the site has one"""
+        return None
+
+    async def _crawl_article(self, engine: "CrawlEngine", url: str) -> Optional[ArticleData]:
+        """Fetch and parse a single article page"""
+        try:
+            html = await engine.fetch(url, headers=self.headers, stop_after=self.stop_after)
+            # Parsing is CPU-bound, run it in the extraction pool
+            result = await run_extraction(self, "parse_page", url, html)
+            metrics = current_metrics()
+            if metrics:
+                metrics.record_parse(result)
+            return result.article
+        except Exception as e:
+            logger.error(f"Error crawling article {url}: {e}")
+            return None
+
+    def _fast_parse_enabled(self) -> bool:
+        """Check whether this site is parsed with lxml and strainers"""
+        return settings.crawl_fast_parse and self.fast_parse and self.article_strainer is not None
+
+    def _make_article_soup(self, html: bytes) -> BeautifulSoup:
+        """Parse an article page"""
+        return make_soup(html, self.article_strainer if self._fast_parse_enabled() else None)
+
+    def _extract_article_links(self, soup: BeautifulSoup) -> List[str]:
+        """Extract article links from homepage"""
+        return self.link_extractor.extract(soup)
+
+    def parse_page(self, url: str, html: bytes) -> ParseResult:
+        """Parse a downloaded article page, timing the extraction"""
+        start = time.perf_counter()
+        result = self._parse_page(url, html)
+        result.parse_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def _parse_page(self, url: str, html: bytes) -> ParseResult:
+        """Parse a downloaded article page; crawlers reporting their selector matches override this"""
+        article = self._parse_article(url, html)
+        return ParseResult(article, None if article else "article")
+
+    @abstractmethod
+    def _parse_article(self, url: str, html: bytes) -> Optional[ArticleData]:
+        """Parse a downloaded article page"""
+        pass
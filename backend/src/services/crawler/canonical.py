@@ -0,0 +1,122 @@
+"""
+URL canonicalization
+
+Every article URL is reduced to one canonical form before it is checked
+against the stored articles and before it is inserted, so tracking
+parameters, fragments, AMP/mobile variants, trailing slashes and host
+aliases (bbc.co.uk and bbc.com) do not store the same article twice.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import re
+
+# Query parameters that only identify a campaign, a click or an app
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "gclsrc", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref", "ref_src", "cmpid", "ocid", "amp", "outputtype", "zarsrc", "gidzl", "fb_source",
+})
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "itm_")
+
+# AMP pages: "/amp", "/amp/" or ".amp" at the end of the path
+_AMP_PATH = re.compile(r"(?:/amp/?|\.amp)$")
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+
+@dataclass(frozen=True)
+class CanonicalRules:
+    """
+    Site-specific canonicalization
+
+    Attributes:
+        host_aliases: (alias, host) pairs, e.g. mobile and regional hosts of the site
+        keep_params: Only these query parameters are kept (all non-tracking ones if empty)
+        path_strip: Regexes removed from the path, e.g. site-specific AMP markers
+        https: Rewrite http URLs to https (for sites serving every page over https)
+    """
+    host_aliases: Tuple[Tuple[str, str], ...] = ()
+    keep_params: Tuple[str, ...] = ()
+    path_strip: Tuple[str, ...] = ()
+    https: bool = False
+
+
+class UrlCanonicalizer:
+    """Reduces absolute URLs to their canonical form with a compiled rule set"""
+
+    def __init__(self, rules: Optional[CanonicalRules] = None):
+        self.rules = rules or CanonicalRules()
+        self._aliases = dict(self.rules.host_aliases)
+        self._keep_params = frozenset(name.lower() for name in self.rules.keep_params)
+        self._path_strip: Optional[Pattern] = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in self.rules.path_strip))
+            if self.rules.path_strip else None
+        )
+
+    def canonical_host(self, host: str) -> str:
+        """Lowercased host without AMP prefix, with aliases resolved"""
+        host = host.lower().rstrip(".")
+        if host.startswith("amp."):
+            host = host[4:]
+        return self._aliases.get(host, host)
+
+    def _keep_param(self, name: str) -> bool:
+        name = name.lower()
+        if self._keep_params:
+            return name in self._keep_params
+        return name not in TRACKING_PARAMS and not name.startswith(TRACKING_PREFIXES)
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Canonical form of an absolute URL
+
+        Args:
+            url: Absolute http(s) URL
+
+        Returns:
+            The URL with lowercased scheme, canonical host, no default port, no
+            fragment, no tracking parameters (the others sorted), no AMP
+            suffix and no trailing slash; other URLs are returned unchanged
+        """
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            return url
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            return url
+
+        if self.rules.https:
+            scheme = "https"
+        netloc = parts.netloc.rsplit("@", 1)[-1].lower()
+        port = ""
+        if ":" in netloc and not netloc.endswith("]"):
+            netloc, port = netloc.rsplit(":", 1)
+            port = f":{port}" if f":{port}" != _DEFAULT_PORTS.get(parts.scheme.lower()) else ""
+        netloc = self.canonical_host(netloc) + port
+
+        path = parts.path or "/"
+        if self._path_strip:
+            path = self._path_strip.sub("", path) or "/"
+        path = _AMP_PATH.sub("", path) or "/"
+        if len(path) > 1:
+            path = path.rstrip("/") or "/"
+
+        query = ""
+        if parts.query:
+            params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                      if self._keep_param(name)]
+            query = urlencode(sorted(params))
+
+        return urlunsplit((scheme, netloc, path, query, ""))
+
+
+@lru_cache(maxsize=None)
+def get_canonicalizer(rules: Optional[CanonicalRules] = None) -> UrlCanonicalizer:
+    """Canonicalizer of a rule set, compiled once per process"""
+    return UrlCanonicalizer(rules)
+
+
+def canonicalize_url(url: str, rules: Optional[CanonicalRules] = None) -> str:
+    """Canonical form of a URL with the given (default: generic) rules"""
+    return get_canonicalizer(rules).canonicalize(url)
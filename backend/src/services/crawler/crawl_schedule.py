@@ -0,0 +1,75 @@
+"""
+Adaptive per-source crawl scheduling
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ...config.settings import settings
+from ...database.models import SourceCrawlState
+
+# Weight of the latest run in the smoothed new-article rate
+RATE_SMOOTHING = 0.3
+# Interval growth after a run without new articles
+EMPTY_RUN_BACKOFF = 1.5
+
+
+def _clamp_interval(minutes: float) -> float:
+    return min(max(minutes, settings.crawl_min_interval_minutes), settings.crawl_max_interval_minutes)
+
+
+def is_due(state: Optional[SourceCrawlState], now: datetime) -> bool:
+    """Check whether a source should be crawled now"""
+    return state is None or state.next_crawl_at is None or state.next_crawl_at <= now
+
+
+def update_crawl_schedule(state: SourceCrawlState, new_articles: int, now: datetime) -> None:
+    """
+    Learn the source's publishing rate from a run and schedule the next one
+
+    The new-article rate (per hour) is an exponentially weighted moving
+    average, and the interval is chosen so a poll is expected to find
+    `crawl_target_new_articles`. Empty runs back the interval off; runs
+    that hit `crawl_articles_limit` (the rate is underestimated) halve it.
+
+    Args:
+        state: Crawl state of the source, updated in place
+        new_articles: Number of new articles stored by the run
+        now: Time of the run
+    """
+    previous_interval = state.crawl_interval_minutes or settings.crawl_min_interval_minutes
+
+    if state.last_crawled_at:
+        elapsed_hours = (now - state.last_crawled_at).total_seconds() / 3600
+    else:
+        elapsed_hours = previous_interval / 60
+    observed_rate = new_articles / max(elapsed_hours, 1 / 60)
+
+    if state.new_article_rate is None:
+        rate = observed_rate
+    else:
+        rate = RATE_SMOOTHING * observed_rate + (1 - RATE_SMOOTHING) * state.new_article_rate
+
+    if rate > 0:
+        interval = settings.crawl_target_new_articles / rate * 60
+    else:
+        interval = previous_interval
+
+    if new_articles == 0:
+        state.empty_runs = (state.empty_runs or 0) + 1
+        interval = max(interval, previous_interval * EMPTY_RUN_BACKOFF)
+    else:
+        state.empty_runs = 0
+        if new_articles >= settings.crawl_articles_limit:
+            interval = min(interval, previous_interval / 2)
+
+    interval = _clamp_interval(interval)
+    state.new_article_rate = rate
+    state.crawl_interval_minutes = interval
+    state.last_crawled_at = now
+    state.next_crawl_at = now + timedelta(minutes=interval)
+
+
+def postpone_crawl(state: SourceCrawlState, now: datetime) -> None:
+    """Schedule a retry after a failed run without changing the learned rate"""
+    interval = state.crawl_interval_minutes or settings.crawl_min_interval_minutes
+    state.next_crawl_at = now + timedelta(minutes=_clamp_interval(interval))
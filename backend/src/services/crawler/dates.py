@@ -0,0 +1,192 @@
+"""
+Published-date normalization
+
+Dates found on pages are parsed by the cheapest method that understands
+them: ISO 8601 (C parser), then precompiled strptime-like formats, then
+RFC 2822; the generic dateutil parser is the last resort. Every result is
+timezone-aware, naive values are taken in the site's timezone.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional, Pattern, Sequence
+from zoneinfo import ZoneInfo
+import re
+
+from dateutil import parser as date_parser
+
+from ...config.settings import settings
+
+# Regex of each supported format directive
+_DIRECTIVES = {
+    "d": r"(?P<day>\d{1,2})",
+    "m": r"(?P<month>\d{1,2})",
+    "Y": r"(?P<year>\d{4})",
+    "y": r"(?P<short_year>\d{2})",
+    "H": r"(?P<hour>\d{1,2})",
+    "M": r"(?P<minute>\d{2})",
+    "S": r"(?P<second>\d{2})",
+    # +07:00, +0700 or +7 (as in "GMT+7")
+    "z": r"(?P<offset>[+-]\d{1,2}(?::?\d{2})?)",
+}
+
+
+@dataclass(frozen=True)
+class DateFormat:
+    """A strptime-like format compiled to a regex, matched anywhere in the text"""
+    format: str
+    pattern: Pattern
+
+    def parse(self, value: str, tz: tzinfo) -> Optional[datetime]:
+        """Parse the first match of the format in value, or None"""
+        match = self.pattern.search(value)
+        if not match:
+            return None
+        parts = match.groupdict()
+        year = int(parts["year"]) if parts.get("year") else 2000 + int(parts.get("short_year") or 0)
+        offset = parts.get("offset")
+        try:
+            return datetime(
+                year,
+                int(parts.get("month") or 1),
+                int(parts.get("day") or 1),
+                int(parts.get("hour") or 0),
+                int(parts.get("minute") or 0),
+                int(parts.get("second") or 0),
+                tzinfo=_parse_offset(offset) if offset else tz,
+            )
+        except ValueError:
+            return None
+
+
+def _parse_offset(value: str) -> timezone:
+    sign = -1 if value[0] == "-" else 1
+    digits = value[1:].replace(":", "")
+    hours, minutes = (int(digits[:-2]), int(digits[-2:])) if len(digits) > 2 else (int(digits), 0)
+    return timezone(sign * timedelta(hours=hours, minutes=minutes))
+
+
+def compile_format(fmt: str) -> DateFormat:
+    """
+    Compile a date format
+
+    Supports %d %m %Y %y %H %M %S %z and %%; any whitespace in the format
+    matches any whitespace run, other characters match literally.
+
+    Raises:
+        ValueError: On an unsupported directive
+    """
+    parts = []
+    i = 0
+    while i < len(fmt):
+        char = fmt[i]
+        if char == "%":
+            directive = fmt[i + 1:i + 2]
+            if directive == "%":
+                parts.append("%")
+            elif directive in _DIRECTIVES:
+                parts.append(_DIRECTIVES[directive])
+            else:
+                raise ValueError(f"Unsupported date format directive %{directive} in '{fmt}'")
+            i += 2
+            continue
+        parts.append(r"\s+" if char.isspace() else re.escape(char))
+        i += 1
+    return DateFormat(fmt, re.compile("".join(parts)))
+
+
+# Formats used by Vietnamese news sites, tried after a site's own formats
+DEFAULT_FORMATS = tuple(compile_format(fmt) for fmt in (
+    "%d/%m/%Y %H:%M GMT%z",        # 29/12/2025 22:32 GMT+7
+    "%d/%m/%Y %H:%M (GMT%z)",      # Thứ Hai, 29/12/2025 22:32 (GMT+7)
+    "%d/%m/%Y - %H:%M",            # 29/12/2025 - 22:32
+    "%d/%m/%Y %H:%M",
+    "%H:%M %d/%m/%Y",              # 22:32 29/12/2025
+    "%H:%M - %d/%m/%Y",
+    "%d-%m-%Y %H:%M",
+    "%d/%m/%Y",
+))
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: Optional[str] = None) -> tzinfo:
+    """Timezone by name, defaulting to the app timezone"""
+    return ZoneInfo(name or settings.timezone)
+
+
+def ensure_aware(value: datetime, tz: Optional[tzinfo] = None) -> datetime:
+    """Attach tz (default: app timezone) to a naive datetime"""
+    if value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=tz or get_timezone())
+
+
+def parse_iso(value: str, tz: Optional[tzinfo] = None) -> Optional[datetime]:
+    """Parse an ISO 8601 / W3C datetime, or None"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            # Forms the C parser rejects, e.g. reduced precision ("2025-12")
+            parsed = date_parser.isoparse(value)
+        except (ValueError, OverflowError):
+            return None
+    return ensure_aware(parsed, tz)
+
+
+def parse_date(value: str, formats: Sequence[DateFormat] = (), tz: Optional[tzinfo] = None,
+               dayfirst: bool = True, fallback: bool = True) -> Optional[datetime]:
+    """
+    Parse a published date
+
+    Args:
+        value: Date text or attribute value
+        formats: Site formats, tried before DEFAULT_FORMATS
+        tz: Timezone of values without an offset (default: app timezone)
+        dayfirst: Read ambiguous dates as day/month in the dateutil fallback
+        fallback: Fall back to the generic (slow) dateutil parser
+
+    Returns:
+        Timezone-aware datetime, or None if the value is not a date
+    """
+    value = value.strip()
+    if not value:
+        return None
+    tz = tz or get_timezone()
+
+    if value[:4].isdigit() and value[4:5] == "-":
+        parsed = parse_iso(value, tz)
+        if parsed:
+            return parsed
+
+    for date_format in (*formats, *DEFAULT_FORMATS):
+        parsed = date_format.parse(value, tz)
+        if parsed:
+            return parsed
+
+    if value[:3].isalpha() and "," in value:
+        # RFC 2822, as in feeds: "Mon, 29 Dec 2025 22:32:00 +0700"
+        try:
+            return ensure_aware(parsedate_to_datetime(value), tz)
+        except (TypeError, ValueError):
+            pass
+
+    if not fallback:
+        return None
+    try:
+        return ensure_aware(date_parser.parse(value, dayfirst=dayfirst), tz)
+    except (ValueError, OverflowError):
+        return None
+
+
+def date_from_parts(parts: Sequence[str], tz: Optional[tzinfo] = None) -> Optional[datetime]:
+    """
+    Build a date from regex groups (year, month, day[, hour, minute])
+
+    Used for dates in article URLs, e.g. the Tuổi Trẻ timestamp "-202512292232".
+    """
+    try:
+        return datetime(*(int(part) for part in parts), tzinfo=tz or get_timezone())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,163 @@
+"""
+Near-duplicate article detection with MinHash-LSH
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from array import array
+import hashlib
+import logging
+import random
+import re
+import unicodedata
+
+from ...config.settings import settings
+from ...database.models import Article
+from ...repositories import ArticleFingerprintRepository
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 64
+# LSH banding: articles sharing all rows of any band are candidates. With
+# 16 bands of 4 rows, pairs above ~0.5 similarity are found almost surely.
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+# Shorter texts give unstable signatures and are never matched
+MIN_SHINGLES = 30
+
+_MASK64 = (1 << 64) - 1
+# Multiply-shift hash functions (odd multiplier, high bits kept). Fixed seed:
+# stored signatures are only comparable with the same functions.
+_permutation_rng = random.Random(20240917)
+_PERMUTATIONS = [
+    (_permutation_rng.getrandbits(64) | 1, _permutation_rng.getrandbits(64))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _shingle_hashes(text: str) -> set:
+    """64-bit hashes of the overlapping word n-grams of the normalized text"""
+    words = _WORD_RE.findall(unicodedata.normalize("NFC", text).lower())
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8"), digest_size=8).digest(), "big")
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    """
+    Compute the MinHash signature of a text
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the texts' word shingles.
+
+    Args:
+        text: Article content
+
+    Returns:
+        NUM_PERMUTATIONS 32-bit values, or None if the text is too short
+    """
+    shingles = _shingle_hashes(text)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    shingles = list(shingles)
+    return [min([(a * shingle + b) & _MASK64 for shingle in shingles]) >> 32 for a, b in _PERMUTATIONS]
+
+
+def similarity(signature: List[int], other: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(a == b for a, b in zip(signature, other)) / NUM_PERMUTATIONS
+
+
+def lsh_bands(signature: List[int]) -> List[int]:
+    """Hash each band of a signature to a signed 64-bit value"""
+    bands = []
+    for band in range(LSH_BANDS):
+        rows = array("I", signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]).tobytes()
+        bands.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "big", signed=True))
+    return bands
+
+
+def pack_signature(signature: List[int]) -> bytes:
+    """Serialize a signature for the articles.minhash column"""
+    return array("I", signature).tobytes()
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    """Read a signature from the articles.minhash column"""
+    return array("I", data).tolist()
+
+
+class NearDuplicateDetector:
+    """
+    Links new articles to an earlier copy of the same story.
+
+    Signatures are indexed by LSH band in article_fingerprint_bands:
+    candidate matches are the recent articles sharing a band, and a
+    candidate is a duplicate if the estimated similarity reaches
+    `dedup_similarity`. Duplicates point to the cluster's canonical (first
+    seen) article.
+    """
+
+    def __init__(self, repo: ArticleFingerprintRepository, threshold: Optional[float] = None,
+                 window_days: Optional[int] = None):
+        self.repo = repo
+        self.threshold = threshold or settings.dedup_similarity
+        self.window_days = window_days or settings.dedup_window_days
+
+    def link_duplicates(self, articles: List[Article]) -> int:
+        """
+        Fingerprint new articles, index them and set their canonical article
+
+        Args:
+            articles: Newly stored articles (with IDs), updated in place
+
+        Returns:
+            Number of articles marked as near-duplicates
+        """
+        signatures: Dict[int, List[int]] = {}
+        for article in articles:
+            signature = minhash(article.content or "")
+            if signature is not None:
+                signatures[article.id] = signature
+        if not signatures:
+            return 0
+
+        bands = {article_id: lsh_bands(signature) for article_id, signature in signatures.items()}
+        since = datetime.now(timezone.utc) - timedelta(days=self.window_days)
+        stored = self.repo.find_by_bands(
+            {(band, value) for values in bands.values() for band, value in enumerate(values)}, since
+        )
+        # article ID -> (band values, signature, canonical article ID), new articles are added in order
+        candidates: Dict[int, Tuple[List[int], List[int], Optional[int]]] = {}
+        for article_id, data, canonical_id in stored:
+            if article_id not in signatures:
+                signature = unpack_signature(data)
+                candidates[article_id] = (lsh_bands(signature), signature, canonical_id)
+
+        duplicates = 0
+        for article in articles:
+            signature = signatures.get(article.id)
+            if signature is None:
+                continue
+
+            best = None
+            for article_id, (candidate_bands, candidate, canonical_id) in candidates.items():
+                if all(a != b for a, b in zip(bands[article.id], candidate_bands)):
+                    continue
+                score = similarity(signature, candidate)
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, canonical_id or article_id)
+
+            if best:
+                article.canonical_article_id = best[1]
+                duplicates += 1
+                logger.info(f"Article {article.id} is a near-duplicate of article {best[1]} (similarity {best[0]:.2f})")
+
+            article.minhash = pack_signature(signature)
+            candidates[article.id] = (bands[article.id], signature, article.canonical_article_id)
+
+        self.repo.add_bands(bands)
+        return duplicates
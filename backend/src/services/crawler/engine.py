@@ -0,0 +1,326 @@
+"""
+Async crawl engine shared by all crawlers of a run
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from ...config.settings import settings
+from .archive import PageArchive, get_page_archive
+from .frontier import CrawlBudget
+from .http_client import create_http_client
+from .metrics import current_metrics
+from .resilience import FailureBudget, HostUnavailableError, RETRYABLE_STATUS_CODES, host_of, retry_delay
+from .validator_cache import CachedValidator, ValidatorCache
+
+logger = logging.getLogger(__name__)
+
+# Content types crawlers can parse, other responses (PDF, video, images) are not downloaded
+TEXT_CONTENT_TYPES = ("text/", "html", "xml")
+# Streamed XML files may also be gzipped (sitemap.xml.gz), often served as a generic binary type
+STREAM_CONTENT_TYPES = TEXT_CONTENT_TYPES + ("gzip", "octet-stream")
+# Leading bytes of binary files that servers label as text/html
+BINARY_SIGNATURES = (b"%PDF", b"PK\x03\x04", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"ID3", b"OggS", b"RIFF", b"\x1aE\xdf\xa3")
+
+
+class ContentRejectedError(httpx.HTTPError):
+    """Raised when a response body is not a page worth downloading (binary or too large)"""
+
+
+class CrawlEngine:
+    """
+    Concurrent HTTP fetcher for crawlers.
+
+    All requests go through a global semaphore and a per-host semaphore, so a
+    run is bounded by the slowest host instead of the sum of all requests.
+    Transient errors are retried with backoff, and a host whose failure
+    budget is spent is not contacted again during the run.
+    Crawlers keep their parsing logic and only delegate I/O to the engine.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        validators: Optional[ValidatorCache] = None,
+        archive: Optional[PageArchive] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        failure_budget: Optional[FailureBudget] = None,
+        crawl_budget: Optional[CrawlBudget] = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.crawl_max_concurrency
+        self.per_host_concurrency = per_host_concurrency or settings.crawl_per_host_concurrency
+        self.timeout = timeout or settings.crawl_request_timeout
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.validators = validators if validators is not None else ValidatorCache()
+        self.archive = archive if archive is not None else get_page_archive()
+        self.failure_budget = failure_budget if failure_budget is not None else FailureBudget()
+        # Article pages the crawlers of the run may still fetch
+        self.crawl_budget = crawl_budget if crawl_budget is not None else CrawlBudget()
+        self.client = client or create_http_client(
+            max_connections=self.max_concurrency,
+            timeout=self.timeout,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "CrawlEngine":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client"""
+        await self.client.aclose()
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent requests to the URL's host"""
+        host = host_of(url)
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_host_concurrency)
+            self._host_limits[host] = limit
+        return limit
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                   stop_after: Optional[bytes] = None) -> Tuple[httpx.Response, bytes]:
+        """
+        Send a GET request within the concurrency limits, retrying transient errors
+
+        The body of a successful response is streamed (see _read_body) while
+        the concurrency slots are held; other responses are not read.
+
+        Returns:
+            Response and its body (empty unless the status is 2xx)
+
+        Raises:
+            HostUnavailableError: If the host's failure budget is spent
+            httpx.TransportError: On network errors after the last retry
+            ContentRejectedError: If the body is not a page or too large
+        """
+        host = host_of(url)
+        for attempt in range(settings.crawl_retry_attempts + 1):
+            if self.failure_budget.exhausted(host):
+                raise HostUnavailableError(f"Failure budget of {host} is spent, skipping {url}")
+
+            response = None
+            start = time.perf_counter()
+            try:
+                # Take the host slot first so waiting on a busy host does not hold a global slot
+                async with self._host_limit(url):
+                    async with self._global_limit:
+                        start = time.perf_counter()
+                        request = self.client.build_request("GET", url, headers=headers)
+                        response = await self.client.send(request, stream=True)
+                        try:
+                            body = b""
+                            if response.is_success:
+                                body = await self._read_body(url, response, stop_after)
+                        finally:
+                            await response.aclose()
+            except ContentRejectedError:
+                # The host answered, the page is just not worth downloading
+                self._record_fetch("rejected", response, start)
+                self.failure_budget.record_success(host)
+                raise
+            except httpx.TransportError as e:
+                self._record_fetch(type(e).__name__, response, start)
+                error = f"{type(e).__name__}: {e}"
+                if attempt == settings.crawl_retry_attempts:
+                    self.failure_budget.record_failure(host, error)
+                    raise
+            else:
+                self._record_fetch(response.status_code, response, start)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.failure_budget.record_success(host)
+                    return response, body
+                error = f"HTTP {response.status_code}"
+                if attempt == settings.crawl_retry_attempts:
+                    self.failure_budget.record_failure(host, error)
+                    return response, body
+
+            # Sleep without holding a concurrency slot
+            delay = retry_delay(attempt, response)
+            logger.debug(f"Retrying {url} in {delay:.1f}s after {error}")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _record_fetch(status, response: Optional[httpx.Response], start: float) -> None:
+        """Count a request in the metrics of the source being crawled, if measured"""
+        metrics = current_metrics()
+        if metrics:
+            nbytes = response.num_bytes_downloaded if response is not None else 0
+            metrics.record_fetch(status, nbytes, (time.perf_counter() - start) * 1000)
+
+    async def _read_body(self, url: str, response: httpx.Response, stop_after: Optional[bytes] = None) -> bytes:
+        """
+        Read a response body, giving up as early as possible on pages that are not worth it
+
+        Non-text content types and binary files served as text are rejected
+        before the body is downloaded, and reading stops at
+        `crawl_max_page_mb`. With `stop_after`, the rest of the page after
+        the first occurrence of that marker (e.g. b"</article>") is not
+        downloaded.
+
+        Raises:
+            ContentRejectedError: If the body is not a page or too large
+        """
+        body = bytearray()
+        async with aclosing(self._iter_body(url, response)) as chunks:
+            async for chunk in chunks:
+                search_from = max(len(body) - len(stop_after) + 1, 0) if stop_after else 0
+                body += chunk
+                if stop_after:
+                    end = body.find(stop_after, search_from)
+                    if end != -1:
+                        del body[end + len(stop_after):]
+                        break
+        return bytes(body)
+
+    async def _iter_body(self, url: str, response: httpx.Response,
+                         content_types: Tuple[str, ...] = TEXT_CONTENT_TYPES) -> AsyncIterator[bytes]:
+        """
+        Yield the decoded chunks of a response body, checking its type and size
+
+        Raises:
+            ContentRejectedError: If the content type is not one of `content_types`,
+                the body starts like a binary file or exceeds `crawl_max_page_mb`
+        """
+        content_type = response.headers.get("content-type", "").lower()
+        if content_type and not any(kind in content_type for kind in content_types):
+            raise ContentRejectedError(f"Not a page ({content_type}): {url}")
+
+        max_bytes = settings.crawl_max_page_mb * 1024 * 1024
+        content_length = response.headers.get("content-length")
+        # With Content-Encoding the header is the compressed size, the decoded body is checked below
+        if content_length and content_length.isdigit() and not response.headers.get("content-encoding"):
+            if int(content_length) > max_bytes:
+                raise ContentRejectedError(f"Page larger than {settings.crawl_max_page_mb} MB ({content_length} bytes): {url}")
+
+        size = 0
+        async for chunk in response.aiter_bytes():
+            if not size and chunk.lstrip()[:4].startswith(BINARY_SIGNATURES):
+                raise ContentRejectedError(f"Binary file served as {content_type or 'unknown type'}: {url}")
+            size += len(chunk)
+            if size > max_bytes:
+                raise ContentRejectedError(f"Page larger than {settings.crawl_max_page_mb} MB: {url}")
+            yield chunk
+
+    async def _archive(self, url: str, response: httpx.Response, body: bytes) -> None:
+        """Keep the raw page in the archive, if one is configured"""
+        if self.archive is None:
+            return
+        try:
+            # Compression and the locked file writes would block the event loop
+            await asyncio.to_thread(self.archive.store, url, body, response.headers.get("content-type"))
+        except OSError as e:
+            logger.error(f"Error archiving {url}: {e}")
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    stop_after: Optional[bytes] = None) -> bytes:
+        """
+        Fetch a URL and return the response body
+
+        Args:
+            url: Page URL
+            headers: Request headers
+            stop_after: Stop downloading after this marker, the page is complete enough
+
+        Raises:
+            httpx.HTTPError: On network errors, non-2xx responses or rejected content
+        """
+        response, body = await self._get(url, headers=headers, stop_after=stop_after)
+        response.raise_for_status()
+        await self._archive(url, response, body)
+        return body
+
+    async def stream(self, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncIterator[bytes]:
+        """
+        Fetch a URL and yield the (decoded) response body in chunks
+
+        The concurrency slots are held until the body is consumed. Streams
+        are not retried, but count against the host's failure budget. The
+        body gets the checks of _read_body, gzip files being accepted too.
+
+        Raises:
+            httpx.HTTPError: On network errors or non-2xx responses
+            ContentRejectedError: If the body is not a text/gzip file or too large
+        """
+        host = host_of(url)
+        if self.failure_budget.exhausted(host):
+            raise HostUnavailableError(f"Failure budget of {host} is spent, skipping {url}")
+
+        async with self._host_limit(url):
+            async with self._global_limit:
+                start = time.perf_counter()
+                try:
+                    async with self.client.stream("GET", url, headers=headers) as response:
+                        status = response.status_code
+                        try:
+                            if response.status_code in RETRYABLE_STATUS_CODES:
+                                self.failure_budget.record_failure(host, f"HTTP {response.status_code}")
+                            else:
+                                self.failure_budget.record_success(host)
+                            response.raise_for_status()
+                            async with aclosing(self._iter_body(url, response, STREAM_CONTENT_TYPES)) as chunks:
+                                async for chunk in chunks:
+                                    yield chunk
+                        except ContentRejectedError:
+                            status = "rejected"
+                            raise
+                        finally:
+                            self._record_fetch(status, response, start)
+                except httpx.TransportError as e:
+                    self._record_fetch(type(e).__name__, None, start)
+                    self.failure_budget.record_failure(host, f"{type(e).__name__}: {e}")
+                    raise
+
+    async def fetch_if_changed(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[bytes]:
+        """
+        Fetch a URL with a conditional GET
+
+        Sends the stored ETag / Last-Modified validators and compares the
+        body hash with the previous response, so an unchanged page costs a
+        single (usually 304) request and no parsing.
+
+        Returns:
+            Response body, or None if the page did not change since last run
+
+        Raises:
+            httpx.HTTPError: On network errors, non-2xx responses or rejected content
+        """
+        request_headers = dict(headers or {})
+        cached = self.validators.get(url)
+        if cached:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        response, body = await self._get(url, headers=request_headers)
+        if response.status_code == 304:
+            logger.info(f"Not modified since last crawl: {url}")
+            return None
+        response.raise_for_status()
+
+        await self._archive(url, response, body)
+        body_hash = hashlib.sha256(body).hexdigest()
+        self.validators.set(url, CachedValidator(
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            body_hash=body_hash,
+        ))
+
+        if cached and cached.body_hash == body_hash:
+            logger.info(f"Body unchanged since last crawl: {url}")
+            return None
+
+        return body
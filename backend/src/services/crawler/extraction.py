@@ -0,0 +1,85 @@
+"""
+Process-pool extraction stage for downloaded pages
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from ...config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# Crawler instances built inside a worker: (class, constructor args) -> crawler
+_worker_crawlers: Dict[Tuple[type, tuple], Any] = {}
+
+
+def get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the shared extraction pool, or None if extraction runs in-process"""
+    global _pool
+    if _pool is None and settings.crawl_extract_workers > 0:
+        # spawn: forking a process running an event loop and DB pool threads is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.crawl_extract_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Started extraction pool with {settings.crawl_extract_workers} workers")
+    return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the extraction workers"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        logger.info("Extraction pool stopped")
+
+
+def extract_with_crawler(init_args: Tuple[type, tuple], method: str, args: tuple) -> Any:
+    """Run an extraction method on a crawler cached in the current (worker) process"""
+    crawler = _worker_crawlers.get(init_args)
+    if crawler is None:
+        crawler_cls, crawler_args = init_args
+        crawler = crawler_cls(*crawler_args)
+        _worker_crawlers[init_args] = crawler
+    return getattr(crawler, method)(*args)
+
+
+async def run_extraction(crawler, method: str, *args) -> Any:
+    """
+    Run a CPU-bound extraction method of a crawler off the event loop
+
+    Only the crawler's init_args() and the raw page bytes are sent to the
+    worker, which rebuilds (and caches) the crawler there, so the compiled
+    rules and strainers are not pickled for every page.
+
+    Args:
+        crawler: Crawler owning the method
+        method: Name of a synchronous method taking picklable arguments
+        *args: Method arguments, typically the URL and raw HTML bytes
+
+    Returns:
+        The method's result
+    """
+    global _pool
+    pool = get_extraction_pool()
+    if pool is None:
+        return getattr(crawler, method)(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            pool, extract_with_crawler, crawler.init_args(), method, args
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page); start a fresh pool next time
+        logger.error("Extraction worker died, restarting pool")
+        if _pool is pool:
+            _pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
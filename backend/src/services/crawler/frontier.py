@@ -0,0 +1,163 @@
+"""
+Per-run link frontier and crawl budget
+
+Candidate links of a source are scored and kept in a heap, so the
+per-source limit is spent on the most valuable pages first; the crawl
+budget shares a global page limit of the run between the sources.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, List, Optional, Pattern, Sequence, Set, Tuple
+import heapq
+import math
+import re
+
+from .link_extractor import LinkRules
+
+# Score weights: the place of the link on the page and the age of the story
+POSITION_WEIGHT = 1.0
+FRESHNESS_WEIGHT = 1.5
+# Age (hours) at which the freshness of a dated link is halved
+FRESHNESS_HALF_LIFE_HOURS = 24
+# Freshness of links without a date or article ID
+UNKNOWN_FRESHNESS = 0.5
+
+# Trailing article ID, e.g. "-185251229.htm"; sites number articles in publication order
+_ARTICLE_ID = re.compile(r"(\d{6,})(?:\.[a-z]+)?/?$")
+
+
+@dataclass(order=True)
+class ScoredLink:
+    """A candidate link; the heap pops the highest score, then the earliest on the page"""
+    sort_key: Tuple[float, int]
+    url: str = field(compare=False)
+    score: float = field(compare=False)
+
+
+@lru_cache(maxsize=None)
+def _compile_sections(rules: LinkRules) -> Tuple[Tuple[Pattern, float], ...]:
+    return tuple((re.compile(pattern), weight) for pattern, weight in rules.sections)
+
+
+class LinkFrontier:
+    """
+    Scores the new links of a source and yields them best first.
+
+    A link scores for its position on the page (homepages lead with the
+    top stories), the section it belongs to (profile `sections` weights)
+    and its freshness: the date in its URL when the site has one, else the
+    rank of its article ID among the page's links. Links already stored are
+    dropped before they reach the frontier.
+    """
+
+    def __init__(self, rules: Optional[LinkRules] = None,
+                 url_date: Optional[Callable[[str], Optional[datetime]]] = None,
+                 now: Optional[datetime] = None):
+        self._sections = _compile_sections(rules) if rules else ()
+        self._url_date = url_date
+        self._now = now or datetime.now(timezone.utc)
+        self._heap: List[ScoredLink] = []
+        self._added = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _freshness(self, url: str, id_ranks: dict) -> float:
+        published = self._url_date(url) if self._url_date else None
+        if published is not None:
+            age_hours = (self._now - published).total_seconds() / 3600
+            if age_hours > -24:  # Digits that only look like a date are usually in the future
+                return math.pow(0.5, max(age_hours, 0) / FRESHNESS_HALF_LIFE_HOURS)
+        return id_ranks.get(url, UNKNOWN_FRESHNESS)
+
+    def extend(self, urls: Sequence[str]) -> None:
+        """
+        Add the links of a page, in page order
+
+        Args:
+            urls: New article links, as extracted from the page
+        """
+        if not urls:
+            return
+
+        # Rank article IDs from 0 (oldest) to 1 (newest) within the page
+        ids = {}
+        for url in urls:
+            match = _ARTICLE_ID.search(url)
+            if match:
+                ids[url] = int(match.group(1))
+        ranks = {article_id: rank for rank, article_id in enumerate(sorted(set(ids.values())))}
+        id_ranks = {
+            url: ranks[article_id] / (len(ranks) - 1) if len(ranks) > 1 else UNKNOWN_FRESHNESS
+            for url, article_id in ids.items()
+        }
+
+        total = len(urls)
+        for position, url in enumerate(urls):
+            score = POSITION_WEIGHT * (1 - position / total) + FRESHNESS_WEIGHT * self._freshness(url, id_ranks)
+            for pattern, weight in self._sections:
+                if pattern.search(url):
+                    score += weight
+            heapq.heappush(self._heap, ScoredLink((-score, self._added), url, score))
+            self._added += 1
+
+    def pop(self, count: int) -> List[str]:
+        """Remove and return the `count` best links"""
+        return [heapq.heappop(self._heap).url for _ in range(min(count, len(self._heap)))]
+
+
+class CrawlBudget:
+    """
+    Article pages the sources of a run may fetch in total.
+
+    Each source asks for the pages it wants once its links are known and
+    gets at most an equal share of what is left for the sources that have
+    not asked yet, so a source wanting fewer pages leaves the rest to the
+    others. Sources finishing without asking (unchanged homepage, failed
+    fetch) are released, so their share goes to the others too. Without a
+    total, every request is granted.
+    """
+
+    def __init__(self, total: Optional[int] = None, sources: int = 1):
+        self.total = total
+        self.remaining = total
+        self._sources_left = max(sources, 1)
+        # Sources that asked for pages or were released
+        self._settled: Set[str] = set()
+        self.spent = 0
+
+    def _settle(self, source: str) -> bool:
+        """Count a source out of the ones still to ask, once"""
+        if source in self._settled:
+            return False
+        self._settled.add(source)
+        return True
+
+    def allocate(self, source: str, wanted: int) -> int:
+        """
+        Reserve pages for a source
+
+        Args:
+            source: Source asking, by its URL
+            wanted: Pages the source would fetch without a global budget
+
+        Returns:
+            Pages the source may fetch
+        """
+        settled = self._settle(source)
+        if self.remaining is None:
+            granted = wanted
+        else:
+            share = math.ceil(self.remaining / self._sources_left)
+            granted = min(wanted, share)
+            self.remaining -= granted
+            if settled:
+                self._sources_left = max(self._sources_left - 1, 1)
+        self.spent += granted
+        return granted
+
+    def release(self, source: str) -> None:
+        """Give the share of a source that finished without asking for pages to the other sources"""
+        if self._settle(source) and self.remaining is not None:
+            self._sources_left = max(self._sources_left - 1, 1)
@@ -0,0 +1,248 @@
+"""
+Shared pooled HTTP transport for crawlers
+"""
+import asyncio
+import importlib.util
+import logging
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from ...config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Resolved addresses shared by every client of the process: (host, port) -> (expires_at, addresses)
+_dns_cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+# Hosts kept in the DNS cache; expired entries are evicted first, then the oldest
+DNS_CACHE_MAX_ENTRIES = 1024
+
+
+def _cache_addresses(key: Tuple[str, int], expires_at: float, addresses: List[str]) -> None:
+    """Store the addresses of a host, evicting expired entries when the cache is full"""
+    _dns_cache.pop(key, None)
+    if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for expired in [k for k, (expiry, _) in _dns_cache.items() if expiry <= now]:
+            del _dns_cache[expired]
+        while len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+            del _dns_cache[next(iter(_dns_cache))]
+    _dns_cache[key] = (expires_at, addresses)
+
+
+class DNSCachingBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that caches host name resolution for a TTL
+
+    Every A/AAAA record of a host is cached. A connection tries them in
+    order and the address that answered moves to the front, so an
+    unreachable server is skipped instead of being cached for the whole
+    TTL; when none answers the entry is dropped and resolved again.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl: float):
+        self._backend = backend
+        self._ttl = ttl
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        cached = _dns_cache.get(key)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        _cache_addresses(key, now + self._ttl, addresses)
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError as e:
+            logger.debug(f"DNS lookup failed for {host}: {e}")
+            addresses = [host]
+
+        # TLS still uses the origin host name for SNI and certificate checks
+        for address in addresses:
+            try:
+                stream = await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                logger.debug(f"Connecting to {host} at {address} failed: {e}")
+                error = e
+                continue
+            if address != addresses[0]:
+                # Later connections go straight to the address that answered
+                addresses.remove(address)
+                addresses.insert(0, address)
+            return stream
+
+        _dns_cache.pop((host, port), None)
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore errors and the httpx errors they are raised as, most specific first
+_HTTPCORE_ERRORS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+_HTTPCORE_BASE_ERRORS = (
+    httpcore.TimeoutException, httpcore.NetworkError, httpcore.ProtocolError,
+    httpcore.ProxyError, httpcore.UnsupportedProtocol,
+)
+
+
+def _httpx_error(error: Exception) -> Exception:
+    """The httpx exception a client raises for an httpcore error"""
+    for httpcore_error, httpx_error in _HTTPCORE_ERRORS:
+        if isinstance(error, httpcore_error):
+            return httpx_error(str(error))
+    return error
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """Body of a pooled response, raising httpx errors"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except _HTTPCORE_BASE_ERRORS as e:
+            raise _httpx_error(e) from e
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    Keep-alive connection pool with HTTP/2 and a DNS cache
+
+    Built on httpcore's public AsyncConnectionPool, so the network backend
+    resolving host names can be passed in rather than patched into the pool
+    httpx.AsyncHTTPTransport creates.
+    """
+
+    def __init__(self, dns_cache_ttl: float = 0, http2: bool = False, limits: Optional[httpx.Limits] = None,
+                 verify: bool = True):
+        limits = limits or httpx.Limits()
+        network_backend = httpcore.AnyIOBackend()
+        if dns_cache_ttl > 0:
+            network_backend = DNSCachingBackend(network_backend, dns_cache_ttl)
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(verify=verify),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self.pool.handle_async_request(core_request)
+        except _HTTPCORE_BASE_ERRORS as e:
+            raise _httpx_error(e) from e
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+def http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(
+    max_connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """
+    Create the HTTP client shared by all crawlers of a run
+
+    Connections are pooled and kept alive per host, HTTP/2 is negotiated
+    when the server supports it, and responses may be brotli/zstd/gzip
+    compressed (httpx advertises every encoding it can decode).
+
+    The connection pool belongs to the client and is closed with it, so it
+    lasts one run (scheduled runs are further apart than the keep-alive
+    expiry anyway); the DNS cache is shared by every client of the process.
+
+    Args:
+        max_connections: Maximum number of open connections
+        timeout: Request timeout in seconds
+        transport: Custom transport, e.g. to replay recorded pages
+
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    max_connections = max_connections or settings.crawl_max_concurrency
+
+    if transport is None:
+        http2 = settings.crawl_http2 and http2_available()
+        if settings.crawl_http2 and not http2:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+
+        transport = PooledTransport(
+            dns_cache_ttl=settings.crawl_dns_cache_ttl,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=settings.crawl_keepalive_expiry,
+            ),
+        )
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(timeout or settings.crawl_request_timeout, connect=settings.crawl_connect_timeout),
+        follow_redirects=True,
+    )
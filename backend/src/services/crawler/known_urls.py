@@ -0,0 +1,40 @@
+"""
+Resolution of candidate links against already stored articles
+"""
+from typing import List, Optional, TYPE_CHECKING
+import logging
+
+from .metrics import current_metrics
+
+if TYPE_CHECKING:
+    from ...repositories import ArticleRepository, CrawlFrontierRepository
+
+logger = logging.getLogger(__name__)
+
+
+class KnownUrls:
+    """
+    Drops links of articles that are already stored before they are fetched.
+
+    Crawlers call this right after link discovery so only new links consume
+    the per-source `crawl_articles_limit` budget. With a frontier, links
+    already waiting there for a crawl worker are dropped too.
+    """
+
+    def __init__(self, repo: "ArticleRepository", frontier_repo: Optional["CrawlFrontierRepository"] = None):
+        self.repo = repo
+        self.frontier_repo = frontier_repo
+
+    def filter_new(self, urls: List[str]) -> List[str]:
+        """Return the URLs that are not stored yet, keeping their order"""
+        if not urls:
+            return []
+        known = self.repo.get_existing_urls(urls)
+        if self.frontier_repo is not None:
+            known |= self.frontier_repo.get_queued_urls(url for url in urls if url not in known)
+        new_urls = [url for url in urls if url not in known]
+        logger.info(f"{len(known)} of {len(urls)} links already known")
+        metrics = current_metrics()
+        if metrics:
+            metrics.record_links(len(urls), len(new_urls))
+        return new_urls
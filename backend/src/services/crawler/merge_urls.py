@@ -0,0 +1,85 @@
+"""
+Merge stored articles whose URLs have the same canonical form
+
+One-off migration for articles stored before URL canonicalization: copies
+of an article stored under several URLs (tracking parameters, fragments,
+AMP or mobile pages, trailing slashes, host aliases) are merged into the
+oldest one, and every remaining URL is rewritten to its canonical form so
+the known-URL check matches new links. Reports only, unless --apply.
+
+    uv run python -m src.services.crawler.merge_urls
+    uv run python -m src.services.crawler.merge_urls --apply
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import argparse
+import logging
+
+from ...config.settings import settings
+from ...database.connection import get_db_session
+from ...database.models import Article
+from ...repositories import SourceRepository, ArticleRepository
+from .canonical import get_canonicalizer
+from .service import source_canonicalizer
+
+logger = logging.getLogger(__name__)
+
+
+def merge_duplicate_urls(apply: bool = False) -> Dict[str, int]:
+    """
+    Group stored articles by canonical URL and merge each group
+
+    Args:
+        apply: Merge and rewrite the URLs, otherwise only count them
+
+    Returns:
+        Counters: articles, groups (articles stored more than once),
+        merged (copies removed), renamed (URLs rewritten without a copy)
+    """
+    stats = {"articles": 0, "groups": 0, "merged": 0, "renamed": 0}
+
+    with get_db_session() as db:
+        canonicalizers = {source.id: source_canonicalizer(source) for source in SourceRepository(db).get_all()}
+        article_repo = ArticleRepository(db)
+
+        groups: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        for article_id, url, source_id in article_repo.get_all_urls():
+            canonicalizer = canonicalizers.get(source_id) or get_canonicalizer()
+            groups[canonicalizer.canonicalize(url)].append((article_id, url))
+            stats["articles"] += 1
+
+        for url, copies in groups.items():
+            if len(copies) == 1:
+                if copies[0][1] == url:
+                    continue
+                stats["renamed"] += 1
+            else:
+                stats["groups"] += 1
+                stats["merged"] += len(copies) - 1
+                logger.info(f"{len(copies)} copies of {url}: {', '.join(copy_url for _, copy_url in copies)}")
+
+            if apply:
+                keeper = db.get(Article, copies[0][0])
+                article_repo.merge_duplicates(keeper, [article_id for article_id, _ in copies[1:]], url)
+
+        if apply:
+            db.commit()
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="Merge the copies and rewrite the URLs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
+    stats = merge_duplicate_urls(apply=args.apply)
+
+    print(", ".join(f"{name}: {count}" for name, count in stats.items()))
+    if (stats["merged"] or stats["renamed"]) and not args.apply:
+        print("Run with --apply to merge the copies and rewrite the URLs")
+
+
+if __name__ == "__main__":
+    main()
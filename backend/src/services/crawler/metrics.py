@@ -0,0 +1,169 @@
+"""
+Crawl run metrics
+
+Every source crawled in a run collects its own metrics: requests, bytes
+transferred, HTTP statuses, fetch latency and parse time percentiles,
+new-vs-known links and which extraction fallbacks matched or failed. The
+metrics of the source being crawled are found through a context variable,
+so the engine, the known-URL filter and the crawlers record into them
+without passing them around; tasks started by a source's crawl inherit it.
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TYPE_CHECKING
+import math
+import time
+
+if TYPE_CHECKING:
+    from .base_crawler import ParseResult
+
+PERCENTILES = (50, 90, 99)
+
+_current: ContextVar[Optional["SourceMetrics"]] = ContextVar("crawl_source_metrics", default=None)
+
+
+def current_metrics() -> Optional["SourceMetrics"]:
+    """Metrics of the source crawled by the current task, if it is measured"""
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics(metrics: "SourceMetrics") -> Iterator["SourceMetrics"]:
+    """Record everything the current task (and the tasks it starts) does into `metrics`"""
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = PERCENTILES) -> Dict[str, float]:
+    """Nearest-rank percentiles of a list of values, e.g. {"p50": ..., "p90": ...}"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        f"p{point}": round(ordered[max(math.ceil(point / 100 * len(ordered)) - 1, 0)], 1)
+        for point in points
+    }
+
+
+@dataclass
+class SourceMetrics:
+    """What crawling a source cost and produced during a run"""
+    source_id: int
+    name: str
+    requests: int = 0
+    bytes: int = 0
+    statuses: Counter = field(default_factory=Counter)  # HTTP status (or error class) -> responses
+    fetch_ms: List[float] = field(default_factory=list)
+    parse_ms: List[float] = field(default_factory=list)
+    links_found: int = 0
+    links_new: int = 0
+    pages_parsed: int = 0
+    extraction_failures: Counter = field(default_factory=Counter)  # Failed field -> pages
+    # Field -> index of the matching fallback selector ("none" if none matched, "generic" for the
+    # readability extractor) -> pages
+    selector_matches: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    articles_stored: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    def record_fetch(self, status: Any, nbytes: int, elapsed_ms: float) -> None:
+        """Count a request: HTTP status or error name, bytes downloaded and latency"""
+        self.requests += 1
+        self.bytes += nbytes
+        self.statuses[str(status)] += 1
+        self.fetch_ms.append(elapsed_ms)
+
+    def record_links(self, found: int, new: int) -> None:
+        """Count discovered links and how many of them were not stored yet"""
+        self.links_found += found
+        self.links_new += new
+
+    def record_parse(self, result: "ParseResult") -> None:
+        """Count a parsed article page"""
+        self.pages_parsed += 1
+        self.parse_ms.append(result.parse_ms)
+        if result.failure:
+            self.extraction_failures[result.failure] += 1
+        for name, index in result.matches.items():
+            self.selector_matches[name]["none" if index is None else str(index)] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable metrics"""
+        return {
+            "source_id": self.source_id,
+            "name": self.name,
+            "seconds": round(self.seconds, 2),
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "statuses": dict(self.statuses),
+            "fetch_ms": percentiles(self.fetch_ms),
+            "parse_ms": percentiles(self.parse_ms),
+            "links_found": self.links_found,
+            "links_new": self.links_new,
+            "new_ratio": round(self.links_new / self.links_found, 3) if self.links_found else None,
+            "pages_parsed": self.pages_parsed,
+            "extraction_failures": dict(self.extraction_failures),
+            "selector_matches": {name: dict(counts) for name, counts in self.selector_matches.items()},
+            "articles_stored": self.articles_stored,
+            "error": self.error,
+        }
+
+
+class CrawlRunMetrics:
+    """Metrics of a crawl run, per source and in total"""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self._start = time.perf_counter()
+        self.seconds = 0.0
+        self.sources: Dict[int, SourceMetrics] = {}
+
+    def source(self, source_id: int, name: str) -> SourceMetrics:
+        """Metrics of a source, created on first use"""
+        metrics = self.sources.get(source_id)
+        if metrics is None:
+            metrics = SourceMetrics(source_id, name)
+            self.sources[source_id] = metrics
+        return metrics
+
+    def finish(self) -> None:
+        self.finished_at = datetime.now(timezone.utc)
+        self.seconds = time.perf_counter() - self._start
+
+    def totals(self) -> Dict[str, Any]:
+        """Metrics summed over the sources, percentiles over all their pages"""
+        sources = list(self.sources.values())
+        statuses = Counter()
+        for metrics in sources:
+            statuses.update(metrics.statuses)
+        return {
+            "sources": len(sources),
+            "failed_sources": sum(1 for metrics in sources if metrics.error),
+            "requests": sum(metrics.requests for metrics in sources),
+            "bytes": sum(metrics.bytes for metrics in sources),
+            "statuses": dict(statuses),
+            "fetch_ms": percentiles([ms for metrics in sources for ms in metrics.fetch_ms]),
+            "parse_ms": percentiles([ms for metrics in sources for ms in metrics.parse_ms]),
+            "links_found": sum(metrics.links_found for metrics in sources),
+            "links_new": sum(metrics.links_new for metrics in sources),
+            "pages_parsed": sum(metrics.pages_parsed for metrics in sources),
+            "extraction_failures": sum(sum(metrics.extraction_failures.values()) for metrics in sources),
+            "articles_stored": sum(metrics.articles_stored for metrics in sources),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable metrics: totals and per-source metrics, slowest source first"""
+        return {
+            "totals": self.totals(),
+            "sources": [
+                metrics.summary()
+                for metrics in sorted(self.sources.values(), key=lambda metrics: metrics.seconds, reverse=True)
+            ],
+        }
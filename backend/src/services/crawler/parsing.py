@@ -0,0 +1,65 @@
+"""
+HTML parsing helpers for article extraction
+"""
+from typing import Dict, Iterable, Optional
+import re
+
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+# Nodes the extractors remove before reading content
+_REMOVED_CONTAINERS = ("header", "nav", "footer", "aside", "figure")
+
+
+class SubtreeStrainer(ElementFilter):
+    """
+    Parse filter that only materializes the subtrees an extractor reads.
+
+    A top-level tag is built (with its whole subtree) when its name is in
+    `tags` or one of its attributes matches the regex given in `attrs`;
+    everything else, including scripts and styles outside kept subtrees, is
+    skipped by the parser. Nested matches keep their document order, so
+    `select_one`/`find` return the same elements as on the full tree.
+
+    With `keep_removed_containers` the header/nav/footer/aside/figure
+    subtrees are kept too, so an extractor decomposing them still drops any
+    matching element inside them, exactly as on the full tree.
+    """
+
+    def __init__(self, tags: Iterable[str], attrs: Optional[Dict[str, str]] = None,
+                 keep_removed_containers: bool = True):
+        super().__init__()
+        self.tags = frozenset(tags)
+        if keep_removed_containers:
+            self.tags |= frozenset(_REMOVED_CONTAINERS)
+        self.attrs = {name: re.compile(pattern) for name, pattern in (attrs or {}).items()}
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        if name in self.tags:
+            return True
+        if attrs:
+            for attr_name, pattern in self.attrs.items():
+                value = attrs.get(attr_name)
+                if value and pattern.search(value if isinstance(value, str) else " ".join(value)):
+                    return True
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+        # Strings outside kept subtrees are never read
+        return False
+
+
+def make_soup(html: bytes, strainer: Optional[SubtreeStrainer] = None) -> BeautifulSoup:
+    """
+    Parse a page
+
+    Args:
+        html: Raw page body
+        strainer: If given, parse with lxml and only build the matching subtrees
+
+    Returns:
+        Parsed document
+    """
+    if strainer is not None:
+        return BeautifulSoup(html, "lxml", parse_only=strainer)
+    return BeautifulSoup(html, "html.parser")
@@ -0,0 +1,231 @@
+"""
+Generic homepage crawler driven by a site profile
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+import logging
+
+from bs4 import BeautifulSoup
+
+from .base_crawler import HomepageCrawler, ArticleData, ParseResult
+from .dates import date_from_parts, parse_date
+from .parsing import make_soup
+from .readability import extract_main_content
+from .site_profile import DateRule, ParagraphRule, SiteProfile, get_profile
+
+logger = logging.getLogger(__name__)
+
+# Pages after which a fallback that never matched on the site is only tried when no other one matches
+SKIP_UNMATCHED_AFTER = 50
+
+
+class ProfileCrawler(HomepageCrawler):
+    """
+    Crawler executing a declarative SiteProfile.
+
+    Every field (title, content, date) is a list of fallbacks tried in the
+    declared order, most specific first. The order is never learned from
+    history (moving the usual winner first let a generic fallback shadow
+    the specific ones), but fallbacks that have not matched a single page
+    of the site after SKIP_UNMATCHED_AFTER pages are only tried when no
+    other one matches, so dead selectors for old layouts cost nothing.
+    """
+
+    profile_name: Optional[str] = None
+
+    def __init__(self, source_url: str, profile_name: Optional[str] = None):
+        self.profile: SiteProfile = get_profile(profile_name or self.profile_name)
+        self.profile_name = self.profile.name
+        self.site_name = self.profile.site_name
+        self.link_rules = self.profile.link_rules
+        self.canonical_rules = self.profile.canonical
+        self.article_strainer = self.profile.strainer
+        self.fast_parse = self.profile.fast_parse
+        self.sitemaps = self.profile.sitemaps
+        self.sitemaps_from_robots = self.profile.sitemaps_from_robots
+        self.stop_after = self.profile.stop_after
+        # Field -> pages it was extracted from, and indexes of the fallbacks that matched at least once
+        self._pages: Dict[str, int] = defaultdict(int)
+        self._matched: Dict[str, Set[int]] = defaultdict(set)
+        super().__init__(source_url)
+
+    def init_args(self) -> Tuple[type, tuple]:
+        return type(self), (self.source_url, self.profile_name)
+
+    def _first_match(self, field: str, candidates: Sequence, extract: Callable[[Any], Any],
+                     matches: Optional[Dict[str, Optional[int]]] = None) -> Any:
+        """
+        Return the first truthy extraction in declared order, trying fallbacks
+        that never matched on this site last; `matches` gets the winning index
+        """
+        matched = self._matched[field]
+        skip_unmatched = self._pages[field] >= SKIP_UNMATCHED_AFTER
+        self._pages[field] += 1
+
+        order: List[int] = list(range(len(candidates)))
+        if skip_unmatched:
+            order = [i for i in order if i in matched] + [i for i in order if i not in matched]
+
+        for i in order:
+            result = extract(candidates[i])
+            if result:
+                matched.add(i)
+                if matches is not None:
+                    matches[field] = i
+                return result
+        if matches is not None:
+            matches[field] = None
+        return None
+
+    def _parse_article(self, url: str, html: bytes) -> Optional[ArticleData]:
+        """Parse a single article page"""
+        return self._parse_page(url, html).article
+
+    def _parse_page(self, url: str, html: bytes) -> ParseResult:
+        """Parse a single article page, reporting which fallback of each field matched"""
+        matches: Dict[str, Optional[int]] = {}
+        try:
+            soup = self._make_article_soup(html)
+
+            # Extract title
+            title = self._extract_title(soup, matches)
+            if not title:
+                logger.warning(f"Could not extract title from {url}")
+                return ParseResult(None, "title", matches)
+
+            # Extract content
+            content = self._extract_content(soup, matches)
+            if not content or len(content) < self.profile.min_content_length:
+                # Layouts the profile does not know yet: generic extraction on the whole page
+                generic = extract_main_content(make_soup(html))
+                if generic:
+                    logger.info(f"No content selector of {self.profile_name} matched {url}, using generic extraction")
+                    content = self.clean_text(generic)
+                    matches["content"] = "generic"
+            if not content or len(content) < self.profile.min_content_length:
+                logger.warning(f"Content too short or empty from {url}")
+                return ParseResult(None, "content", matches)
+
+            # Extract published date
+            published_date = self._extract_published_date(soup, url, matches)
+
+            canonical_url = self._extract_canonical_url(soup, url)
+            link_url = self.canonicalizer.canonicalize(url)
+            return ParseResult(ArticleData(
+                url=canonical_url,
+                title=title,
+                content=content,
+                published_date=published_date,
+                link_url=link_url if link_url != canonical_url else None,
+            ), matches=matches)
+
+        except Exception as e:
+            logger.error(f"Error parsing article {url}: {e}")
+            return ParseResult(None, "error", matches)
+
+    def _extract_canonical_url(self, soup: BeautifulSoup, url: str) -> str:
+        """
+        Canonical URL of a page: its <link rel="canonical"> if it is an
+        article of the same site, else the canonical form of the fetched URL
+        """
+        url = self.canonicalizer.canonicalize(url)
+        link = soup.find("link", rel="canonical", href=True)
+        if not link:
+            return url
+
+        canonical = self.canonicalizer.canonicalize(urljoin(url, link["href"].strip()))
+        # Pages pointing to the homepage or another site (syndicated copies) keep their own URL
+        if urlsplit(canonical).netloc != urlsplit(url).netloc or not self.link_extractor.is_article_url(canonical):
+            return url
+        return canonical
+
+    def url_date(self, url: str) -> Optional[datetime]:
+        """Date of the first URL date rule matching the URL"""
+        for rule in self.profile.date_rules:
+            if rule.url:
+                match = rule.url.search(url)
+                if match:
+                    return date_from_parts(match.groups(), self.profile.timezone)
+        return None
+
+    def _extract_title(self, soup: BeautifulSoup, matches: Optional[Dict[str, Optional[int]]] = None) -> Optional[str]:
+        """Extract article title"""
+        def extract(selector) -> Optional[str]:
+            element = selector.select_one(soup)
+            if not element:
+                return None
+            title = element.get("content", "") if element.name == "meta" else element.get_text()
+            title = title.strip()
+            for pattern in self.profile.title_strip:
+                title = pattern.sub("", title)
+            return self.clean_text(title)
+
+        return self._first_match("title", self.profile.title_selectors, extract, matches)
+
+    def _paragraph_texts(self, element, rule: ParagraphRule) -> list:
+        """Get the kept paragraph texts of a content element"""
+        texts = []
+        for p in element.find_all("p"):
+            text = p.get_text().strip()
+            if len(text) < rule.min_length:
+                continue
+            if rule.skip and rule.skip.search(text.lower()):
+                continue
+            texts.append(text)
+        return texts
+
+    def _extract_content(self, soup: BeautifulSoup, matches: Optional[Dict[str, Optional[int]]] = None) -> Optional[str]:
+        """Extract article content"""
+        for element in soup(list(self.profile.content_remove)):
+            element.decompose()
+
+        def extract(selector) -> Optional[str]:
+            element = selector.select_one(soup)
+            if not element:
+                return None
+            texts = self._paragraph_texts(element, self.profile.paragraphs)
+            return "\n\n".join(texts) if texts else None
+
+        content = self._first_match("content", self.profile.content_selectors, extract, matches)
+
+        if not content:
+            # Fallback: the first existing main content area, whatever its paragraphs
+            for selector in self.profile.fallback_selectors:
+                element = selector.select_one(soup)
+                if element:
+                    texts = self._paragraph_texts(element, self.profile.fallback_paragraphs)
+                    if texts:
+                        content = "\n\n".join(texts)
+                    break
+
+        if content:
+            return self.clean_text(content)
+
+        return None
+
+    def _parse_date(self, value: str, rule: DateRule) -> Optional[datetime]:
+        """Parse a date string found by a rule"""
+        if rule.strip:
+            value = rule.strip.sub("", value)
+        return parse_date(value, rule.formats, self.profile.timezone, dayfirst=rule.dayfirst)
+
+    def _extract_published_date(self, soup: BeautifulSoup, url: str,
+                                matches: Optional[Dict[str, Optional[int]]] = None) -> Optional[datetime]:
+        """Extract published date from article"""
+        def extract(rule: DateRule) -> Optional[datetime]:
+            if rule.url:
+                match = rule.url.search(url)
+                return date_from_parts(match.groups(), self.profile.timezone) if match else None
+
+            element = rule.selector.select_one(soup)
+            if not element:
+                return None
+            value = element.get(rule.attr) if rule.attr else None
+            if not value and rule.text:
+                value = element.get_text()
+            value = (value or "").strip()
+            return self._parse_date(value, rule) if value else None
+
+        return self._first_match("date", self.profile.date_rules, extract, matches)
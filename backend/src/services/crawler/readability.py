@@ -0,0 +1,230 @@
+"""
+Generic main-content extraction for pages without a matching site profile
+
+Readability-style scoring: every paragraph of the page scores its parent
+and (less) its ancestors by its length and commas, class and id names hint
+at content or boilerplate, and every candidate container is discounted by
+its link density, since menus, related-link lists and tag clouds are
+mostly anchor text. The paragraphs of the best container, and of its
+siblings scoring close to it, are the article text. Pages whose article
+sits in a container named like boilerplate (VnExpress' "sidebar-1" main
+column) are scored again with those containers kept.
+"""
+from typing import Dict, List, Optional, Tuple
+import re
+
+from bs4 import BeautifulSoup, Tag
+
+# Never article text; figures are dropped like the profile extractors do
+_REMOVED_TAGS = (
+    "script", "style", "noscript", "template", "iframe", "svg", "form", "button", "select",
+    "nav", "header", "footer", "aside", "figure",
+)
+# Block elements: a div containing none of them is read as a paragraph
+_BLOCK_TAGS = (
+    "address", "article", "aside", "blockquote", "dl", "div", "fieldset", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre", "section", "table", "ul",
+)
+_PARAGRAPH_TAGS = ("p", "pre", "div")
+
+_NEGATIVE = re.compile(
+    r"comment|meta|footer|footnote|menu|nav|relate|share|social|sidebar|sponsor|promo|advert|banner|"
+    r"breadcrumb|widget|popup|cookie|subscribe|newsletter|tags?\b|hidden|byline|author|dateline|posted|\bdate\b",
+    re.I,
+)
+_POSITIVE = re.compile(r"article|body|content|entry|main|post\b|story|text|detail", re.I)
+
+# Attributes naming an element; component sites (BBC) name their blocks with data-* attributes
+_NAME_ATTRIBUTES = ("class", "id", "data-testid", "data-component")
+
+# Paragraphs shorter than this do not score their containers
+MIN_PARAGRAPH_LENGTH = 25
+# Results shorter than this are extracted again without removing boilerplate-named containers
+MIN_CONTENT_LENGTH = 250
+# Shares of a paragraph's score given to its parent, grandparent and great-grandparent
+_ANCESTOR_SHARES = (1.0, 0.5, 1 / 6)
+# Paragraphs with more anchor text than this are link lists, not article text
+MAX_PARAGRAPH_LINK_DENSITY = 0.5
+# Link density above which a block inside the article (related box, "more stories") is dropped,
+# for blocks without and with a content-like name
+MAX_BLOCK_LINK_DENSITY = 0.2
+MAX_CONTENT_BLOCK_LINK_DENSITY = 0.5
+_CLEANED_TAGS = ("div", "section", "ul", "ol", "dl", "table")
+
+_TAG_WEIGHTS = {
+    "div": 5, "article": 5, "pre": 3, "td": 3, "blockquote": 3,
+    "ol": -3, "ul": -3, "dl": -3, "li": -3, "form": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+
+
+def _names(element: Tag) -> str:
+    names = []
+    for attribute in _NAME_ATTRIBUTES:
+        value = element.get(attribute)
+        if value:
+            names.append(value if isinstance(value, str) else " ".join(value))
+    return " ".join(names)
+
+
+def _class_weight(element: Tag) -> int:
+    """+25 for class/id names of content containers, -25 for those of boilerplate"""
+    names = _names(element)
+    if not names.strip():
+        return 0
+    weight = 0
+    if _NEGATIVE.search(names):
+        weight -= 25
+    if _POSITIVE.search(names):
+        weight += 25
+    return weight
+
+
+def _is_paragraph(element: Tag) -> bool:
+    return element.name != "div" or element.find(_BLOCK_TAGS) is None
+
+
+def _text(element: Tag) -> str:
+    return " ".join(element.get_text(" ").split())
+
+
+def _link_density(element: Tag, text_length: int) -> float:
+    """Share of the element's text that is anchor text"""
+    if not text_length:
+        return 0.0
+    link_length = sum(len(_text(link)) for link in element.find_all("a"))
+    return min(link_length / text_length, 1.0)
+
+
+def _is_unlikely(element: Tag) -> bool:
+    """Containers named like boilerplate, unless also named like content ("article-meta" stays)"""
+    if element.name in ("html", "body", "article", "main"):
+        return False
+    names = _names(element)
+    return bool(names.strip()) and bool(_NEGATIVE.search(names)) and not _POSITIVE.search(names)
+
+
+def _is_link_block(element: Tag) -> bool:
+    text_length = len(_text(element))
+    limit = MAX_CONTENT_BLOCK_LINK_DENSITY if _class_weight(element) >= 25 else MAX_BLOCK_LINK_DENSITY
+    return _link_density(element, text_length) > limit
+
+
+def _remove_unlikely(soup: BeautifulSoup) -> List[Tuple[Tag, Tag, int]]:
+    """Detach the boilerplate-named containers, returning (element, parent, index) to put them back"""
+    removed = []
+    stack = [soup]
+    while stack:
+        parent = stack.pop()
+        index = 0
+        for child in list(parent.children):
+            if isinstance(child, Tag) and _is_unlikely(child):
+                child.extract()
+                removed.append((child, parent, index))
+                continue
+            if isinstance(child, Tag):
+                stack.append(child)
+            index += 1
+    return removed
+
+
+def _restore(removed: List[Tuple[Tag, Tag, int]]) -> None:
+    # Reverse order: every element goes back before the later siblings removed after it
+    for element, parent, index in reversed(removed):
+        parent.insert(index, element)
+
+
+def _scoring_parent(paragraph: Tag) -> Optional[Tag]:
+    """Parent of a paragraph, skipping divs wrapping only it (BBC text blocks)"""
+    parent = paragraph.parent
+    while (parent is not None and parent.name == "div" and parent.parent is not None
+           and len(parent.find_all(True, recursive=False)) == 1
+           and not "".join(parent.find_all(string=True, recursive=False)).strip()):
+        parent = parent.parent
+    return parent
+
+
+def _score_candidates(paragraphs: List[Tag]) -> Tuple[Dict[int, Tag], Dict[int, float]]:
+    """Containers of the paragraphs and their scores before the link density discount, keyed by id()"""
+    containers: Dict[int, Tag] = {}
+    scores: Dict[int, float] = {}
+    for paragraph in paragraphs:
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_LENGTH:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        ancestor = _scoring_parent(paragraph)
+        for share in _ANCESTOR_SHARES:
+            if ancestor is None or ancestor.name == "[document]":
+                break
+            key = id(ancestor)
+            if key not in scores:
+                containers[key] = ancestor
+                scores[key] = _TAG_WEIGHTS.get(ancestor.name, 0) + _class_weight(ancestor)
+            scores[key] += score * share
+            ancestor = ancestor.parent
+    return containers, scores
+
+
+def _extract(soup: BeautifulSoup) -> Optional[str]:
+    paragraphs = [element for element in soup.find_all(_PARAGRAPH_TAGS) if _is_paragraph(element)]
+    containers, scores = _score_candidates(paragraphs)
+    if not scores:
+        return None
+
+    final_scores = {}
+    for key, container in containers.items():
+        final_scores[key] = scores[key] * (1 - _link_density(container, len(_text(container))))
+    top_key = max(final_scores, key=final_scores.get)
+    top = containers[top_key]
+
+    # Articles split in several blocks (text, quote, text) keep the sibling blocks scoring close to the best
+    threshold = max(10.0, final_scores[top_key] * 0.2)
+    blocks = []
+    for sibling in (top.parent.find_all(True, recursive=False) if top.parent else [top]):
+        if sibling is top or final_scores.get(id(sibling), 0) >= threshold:
+            blocks.append(sibling)
+        elif sibling.name == "p":
+            text = _text(sibling)
+            if len(text) > 80 and _link_density(sibling, len(text)) < 0.25:
+                blocks.append(sibling)
+
+    texts = []
+    for block in blocks:
+        for element in block.find_all(_CLEANED_TAGS):
+            if not element.decomposed and _is_link_block(element):
+                element.decompose()
+        if block.name in _PARAGRAPH_TAGS and _is_paragraph(block):
+            candidates = [block]
+        else:
+            candidates = [element for element in block.find_all(_PARAGRAPH_TAGS) if _is_paragraph(element)]
+        for paragraph in candidates:
+            text = _text(paragraph)
+            if text and _link_density(paragraph, len(text)) <= MAX_PARAGRAPH_LINK_DENSITY:
+                texts.append(text)
+    return "\n\n".join(texts) if texts else None
+
+
+def extract_main_content(soup: BeautifulSoup) -> Optional[str]:
+    """
+    Extract the article text of a page, without menus, footers or link lists
+
+    The soup is modified (boilerplate is removed), parse the page again to
+    read anything else from it.
+
+    Args:
+        soup: Full parsed page
+
+    Returns:
+        Paragraphs separated by blank lines, or None if no container has article text
+    """
+    for element in soup(list(_REMOVED_TAGS)):
+        element.decompose()
+    removed = _remove_unlikely(soup)
+    content = _extract(soup)
+    if removed and (content is None or len(content) < MIN_CONTENT_LENGTH):
+        _restore(removed)
+        retry = _extract(soup)
+        if retry and len(retry) > len(content or ""):
+            content = retry
+    return content
@@ -0,0 +1,149 @@
+"""
+Re-extract archived article pages with the current extractors
+
+Replays the latest archived fetch of every article URL through the crawler
+of its source, in a process pool and without any network access, and
+reports (or with --update, stores) the articles whose extraction changed.
+
+    uv run python -m src.services.crawler.reextract --source bao-tuoi-tre
+    uv run python -m src.services.crawler.reextract --archive /data/archive --update
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import argparse
+import logging
+import os
+import time
+
+from ...config.settings import settings
+from ...database.connection import get_db_session
+from ...database.models import Source
+from ...repositories import SourceRepository, ArticleRepository
+from .archive import ArchiveEntry, PageArchive
+from .base_crawler import HomepageCrawler
+from .extraction import extract_with_crawler
+from .revisit import content_hash
+from .service import create_crawler
+
+logger = logging.getLogger(__name__)
+
+# Pages decompressed and sent to the pool at a time
+REEXTRACT_BATCH_SIZE = 512
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _select_pages(archive: PageArchive, sources: List[Source]) -> List[Tuple[Source, HomepageCrawler, ArchiveEntry]]:
+    """Match archived article pages with the crawler of their source"""
+    crawlers: Dict[str, Tuple[Source, HomepageCrawler]] = {}
+    for source in sources:
+        crawler = create_crawler(source)
+        if isinstance(crawler, HomepageCrawler):
+            crawlers[_host(source.url)] = (source, crawler)
+        else:
+            logger.info(f"Skipping {source.name}: only homepage crawlers can re-extract pages")
+
+    pages = []
+    for url, entry in archive.latest().items():
+        match = crawlers.get(_host(url))
+        if not match:
+            continue
+        source, crawler = match
+        if url.rstrip("/") == source.url.rstrip("/") or not crawler.link_extractor.is_article_url(url):
+            continue
+        pages.append((source, crawler, entry))
+    return pages
+
+
+def _compare(stats: Dict[str, int], article, article_data, update: bool) -> None:
+    """Count (and with update, apply) the difference between stored and re-extracted article"""
+    if article_data is None:
+        stats["failed"] += 1
+    elif article is None:
+        stats["not_stored"] += 1
+    elif (article.title, article.content) == (article_data.title, article_data.content):
+        stats["unchanged"] += 1
+    else:
+        stats["changed"] += 1
+        if update:
+            article.title = article_data.title
+            article.content = article_data.content
+            article.content_hash = content_hash(article_data.content)
+            if article_data.published_date:
+                article.published_date = article_data.published_date
+
+
+def reextract(archive: PageArchive, slug: Optional[str] = None, update: bool = False,
+              workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Re-extract archived articles and compare them with the stored ones
+
+    Args:
+        archive: Page archive to replay
+        slug: Only re-extract this source
+        update: Store changed titles, contents and dates
+        workers: Extraction processes (defaults to the CPU count)
+
+    Returns:
+        Counters: pages, failed, unchanged, changed, not_stored
+    """
+    stats = {"pages": 0, "failed": 0, "unchanged": 0, "changed": 0, "not_stored": 0}
+
+    with get_db_session() as db:
+        sources = SourceRepository(db).get_all()
+        if slug:
+            sources = [source for source in sources if source.slug == slug]
+        pages = _select_pages(archive, sources)
+        stats["pages"] = len(pages)
+        if not pages:
+            return stats
+
+        stored = ArticleRepository(db).get_by_urls(entry.url for _, _, entry in pages)
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            # Bounded batches keep only a slice of the decompressed pages in memory
+            for start in range(0, len(pages), REEXTRACT_BATCH_SIZE):
+                batch = pages[start:start + REEXTRACT_BATCH_SIZE]
+                tasks = [
+                    (crawler.init_args(), "_parse_article", (entry.url, archive.read(entry)))
+                    for _, crawler, entry in batch
+                ]
+                results = pool.map(extract_with_crawler, *zip(*tasks), chunksize=16)
+
+                for (_, _, entry), article_data in zip(batch, results):
+                    _compare(stats, stored.get(entry.url), article_data, update)
+
+        if update:
+            db.commit()
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", default=settings.crawl_archive_dir, help="Archive directory (default: CRAWL_ARCHIVE_DIR)")
+    parser.add_argument("--source", help="Only re-extract the source with this slug")
+    parser.add_argument("--update", action="store_true", help="Store the re-extracted articles")
+    parser.add_argument("--workers", type=int, help="Extraction processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not args.archive:
+        parser.error("no archive directory, set CRAWL_ARCHIVE_DIR or pass --archive")
+
+    logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
+    start = time.perf_counter()
+    stats = reextract(PageArchive(args.archive), slug=args.source, update=args.update, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(", ".join(f"{name}: {count}" for name, count in stats.items()))
+    print(f"{stats['pages'] / elapsed:.1f} pages/sec" if elapsed else "")
+    if stats["changed"] and not args.update:
+        print("Run with --update to store the changed articles")
+
+
+if __name__ == "__main__":
+    main()
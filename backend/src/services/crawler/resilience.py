@@ -0,0 +1,155 @@
+"""
+Retries, per-run failure budgets and per-source circuit breakers
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import random
+
+import httpx
+
+from ...config.settings import settings
+from ...database.models import SourceCrawlState
+
+# Responses worth retrying: rate limiting and temporary server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class HostUnavailableError(httpx.TransportError):
+    """Raised without sending a request once a host has spent its failure budget"""
+
+
+def host_of(url: str) -> str:
+    """Host a URL counts against in failure budgets"""
+    return urlparse(url).netloc.lower()
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Wait before retry number `attempt` (0-based)
+
+    Capped exponential backoff with jitter; a Retry-After header of the
+    failed response is honored up to the same cap.
+    """
+    delay = min(settings.crawl_retry_backoff * 2 ** attempt, settings.crawl_retry_max_backoff)
+    delay *= random.uniform(0.5, 1.0)
+
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(retry_after) - datetime.now().astimezone()).total_seconds()
+            except (TypeError, ValueError):
+                seconds = 0
+        delay = max(delay, min(seconds, settings.crawl_retry_max_backoff))
+    return delay
+
+
+@dataclass
+class HostHealth:
+    """Outcome of the requests to a host during a run"""
+    successes: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+class FailureBudget:
+    """
+    Counts failed requests per host during a run.
+
+    A request failing after its retries costs one unit; once a host has
+    spent its budget, further requests to it fail at once instead of
+    waiting for timeouts. Any response (even a 404) shows the host is up.
+    """
+
+    def __init__(self, default_budget: Optional[int] = None):
+        self.default_budget = default_budget or settings.crawl_host_failure_budget
+        self._budgets: Dict[str, int] = {}
+        self._health: Dict[str, HostHealth] = {}
+
+    def set_budget(self, host: str, budget: int) -> None:
+        """Give a host a different budget, e.g. a single failure for a probe"""
+        self._budgets[host] = budget
+
+    def health(self, host: str) -> HostHealth:
+        """Request outcomes of a host so far"""
+        health = self._health.get(host)
+        if health is None:
+            health = HostHealth()
+            self._health[host] = health
+        return health
+
+    def exhausted(self, host: str) -> bool:
+        """Check whether requests to the host should fail fast"""
+        return self.health(host).failures >= self._budgets.get(host, self.default_budget)
+
+    def record_success(self, host: str) -> None:
+        self.health(host).successes += 1
+
+    def record_failure(self, host: str, error: str) -> None:
+        health = self.health(host)
+        health.failures += 1
+        health.last_error = error[:500]
+
+    def failed(self, host: str) -> bool:
+        """Check whether the run counts as failed for the host: budget spent, or nothing but failures"""
+        health = self.health(host)
+        return self.exhausted(host) or (health.failures > 0 and health.successes == 0)
+
+
+def circuit_status(state: Optional[SourceCrawlState], now: datetime) -> str:
+    """
+    Circuit breaker state of a source
+
+    Returns:
+        CIRCUIT_CLOSED (crawled normally), CIRCUIT_OPEN (skipped) or
+        CIRCUIT_HALF_OPEN (cooldown over, the next run is a probe)
+    """
+    if state is None or state.circuit_open_until is None:
+        return CIRCUIT_CLOSED
+    if state.circuit_open_until > now:
+        return CIRCUIT_OPEN
+    return CIRCUIT_HALF_OPEN
+
+
+def record_source_failure(state: SourceCrawlState, error: Optional[str], now: datetime) -> None:
+    """
+    Count a failed run of a source and open its circuit if needed
+
+    After `crawl_circuit_failure_threshold` consecutive failed runs the
+    source is skipped for a cooldown that doubles with each failed probe,
+    up to `crawl_circuit_max_cooldown_minutes`.
+
+    Args:
+        state: Crawl state of the source, updated in place
+        error: Last error of the run
+        now: Time of the run
+    """
+    state.consecutive_failures = (state.consecutive_failures or 0) + 1
+    state.last_failure_at = now
+    state.last_error = error[:500] if error else None
+
+    opened = state.consecutive_failures - settings.crawl_circuit_failure_threshold
+    if opened >= 0:
+        cooldown = min(
+            settings.crawl_circuit_cooldown_minutes * 2 ** opened,
+            settings.crawl_circuit_max_cooldown_minutes,
+        )
+        state.circuit_open_until = now + timedelta(minutes=cooldown)
+        # An adaptive schedule would otherwise pick the source up before the cooldown ends
+        if state.next_crawl_at is None or state.next_crawl_at < state.circuit_open_until:
+            state.next_crawl_at = state.circuit_open_until
+
+
+def record_source_success(state: SourceCrawlState) -> None:
+    """Close the circuit of a source after a successful run"""
+    state.consecutive_failures = 0
+    state.circuit_open_until = None
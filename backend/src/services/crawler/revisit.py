@@ -0,0 +1,71 @@
+"""
+Content-change detection for revisited articles
+"""
+from datetime import datetime
+from typing import Optional
+import hashlib
+import re
+import unicodedata
+
+from ...config.settings import settings
+from ...database.models import Article
+from .base_crawler import ArticleData
+from .duplicates import minhash, pack_signature, similarity, unpack_signature
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(text: str) -> str:
+    """Normalize article text so formatting-only differences do not count as changes"""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip().lower()
+
+
+def content_hash(text: str) -> str:
+    """sha256 hex digest of the normalized article text"""
+    return hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+
+
+def apply_content_update(article: Article, article_data: ArticleData, now: datetime,
+                         min_change: Optional[float] = None) -> bool:
+    """
+    Store the re-extracted content of a revisited article if it changed
+
+    The size of a change is estimated from the MinHash signatures of the
+    old and new content (share of word shingles that differ). Small edits
+    only refresh the stored text; a change of at least `min_change` also
+    sets content_updated_at, which makes the article due for a new summary.
+
+    Args:
+        article: Stored article, updated in place
+        article_data: Freshly extracted article
+        now: Time of the revisit
+        min_change: Minimum changed share (defaults to revisit_min_change)
+
+    Returns:
+        True if the article needs a new summary
+    """
+    min_change = settings.revisit_min_change if min_change is None else min_change
+    old_hash = article.content_hash or content_hash(article.content)
+    new_hash = content_hash(article_data.content)
+    article.content_hash = old_hash
+    if new_hash == old_hash:
+        return False
+
+    old_signature = unpack_signature(article.minhash) if article.minhash else minhash(article.content or "")
+    new_signature = minhash(article_data.content)
+    if old_signature and new_signature:
+        change = 1 - similarity(old_signature, new_signature)
+    else:
+        # Too short to compare shingles, any edit is significant
+        change = 1.0
+
+    article.title = article_data.title
+    article.content = article_data.content
+    article.content_hash = new_hash
+    if new_signature:
+        article.minhash = pack_signature(new_signature)
+
+    if change < min_change:
+        return False
+    article.content_updated_at = now
+    return True
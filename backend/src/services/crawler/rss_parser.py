@@ -1,52 +1,91 @@
 import feedparser
-import requests
 from bs4 import BeautifulSoup
-from typing import List, Optional
-from datetime import datetime
+from typing import AsyncIterator, List, Optional, TYPE_CHECKING
+from datetime import datetime, timezone
+import asyncio
 import logging
 
 from .base_crawler import BaseCrawler, ArticleData
+from ...config.settings import settings
+from .extraction import run_extraction
+from .parsing import make_soup
+from .readability import extract_main_content
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+    from .known_urls import KnownUrls
 
 logger = logging.getLogger(__name__)
 
+# Entries with less text than this get the full article fetched from their page
+MIN_ENTRY_CONTENT_LENGTH = 200
+
 
 class RSSParser(BaseCrawler):
     """RSS feed parser and crawler"""
     
     def __init__(self, source_url: str):
         super().__init__(source_url)
-        self.timeout = 30
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
     
-    def crawl(self) -> List[ArticleData]:
-        """Parse RSS feed and extract articles"""
-        articles = []
+    async def stream(self, engine: "CrawlEngine", known_urls: Optional["KnownUrls"] = None) -> AsyncIterator[ArticleData]:
+        """Parse RSS feed and yield its articles one by one"""
+        crawled = 0
         
         try:
-            feed = feedparser.parse(self.source_url)
+            body = await engine.fetch_if_changed(self.source_url, headers=self.headers)
+            if body is None:
+                logger.info(f"RSS feed unchanged, skipping {self.source_url}")
+                return
+            
+            feed = feedparser.parse(body)
             
             if feed.bozo and feed.bozo_exception:
                 logger.warning(f"RSS parsing error: {feed.bozo_exception}")
-                return articles
+                return
+            
+            entries = feed.entries
             
-            for entry in feed.entries:
+            # Skip stored articles before any full-article fetch
+            if known_urls:
+                new_urls = set(known_urls.filter_new([self._entry_url(entry) for entry in entries]))
+                entries = [entry for entry in entries if self._entry_url(entry) in new_urls]
+            
+            # Parse every entry first, then fetch the pages of short ones concurrently
+            short_articles = []
+            for entry in entries:
                 try:
                     article = self._parse_entry(entry)
-                    if article:
-                        articles.append(article)
                 except Exception as e:
                     logger.error(f"Error parsing entry: {e}")
                     continue
+                if not article:
+                    continue
+                if len(article.content) < MIN_ENTRY_CONTENT_LENGTH:
+                    short_articles.append(article)
+                else:
+                    crawled += 1
+                    yield article
             
-            logger.info(f"Crawled {len(articles)} articles from {self.source_url}")
+            async for article in self._complete_articles(engine, short_articles):
+                crawled += 1
+                yield article
+            
+            logger.info(f"Crawled {crawled} articles from {self.source_url}")
             
         except Exception as e:
             logger.error(f"Error crawling RSS feed {self.source_url}: {e}")
-        
-        return articles
     
-    def _parse_entry(self, entry) -> Optional[ArticleData]:
-        """Parse a single RSS entry"""
+    def _entry_url(self, entry) -> str:
+        """Canonical article URL of an entry, or an empty string"""
         url = entry.get("link", "").strip()
+        return self.canonicalizer.canonicalize(url) if url else ""
+    
+    def _parse_entry(self, entry) -> Optional[ArticleData]:
+        """Parse a single RSS entry, without fetching its page"""
+        url = self._entry_url(entry)
         if not url:
             return None
         
@@ -71,16 +110,11 @@ class RSSParser(BaseCrawler):
         published_date = None
         if "published_parsed" in entry and entry.published_parsed:
             try:
-                published_date = datetime(*entry.published_parsed[:6])
+                # feedparser normalizes dates to UTC
+                published_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
             except Exception:
                 pass
         
-        # If content is too short, try to fetch full article
-        if len(content) < 200:
-            full_content = self._fetch_full_article(url)
-            if full_content:
-                content = full_content
-        
         return ArticleData(
             url=url,
             title=title,
@@ -88,6 +122,57 @@ class RSSParser(BaseCrawler):
             published_date=published_date
         )
     
+    async def _complete_articles(self, engine: "CrawlEngine", articles: List[ArticleData]) -> AsyncIterator[ArticleData]:
+        """
+        Fetch the full content of articles whose feed entry is too short
+        
+        Pages are fetched concurrently, at most crawl_rss_fetch_concurrency
+        at a time, and articles are yielded as their page arrives. Articles
+        still pending at the crawl_rss_fetch_deadline of the feed, and those
+        beyond the pages granted by the run's crawl budget (feed order, newest
+        first), are yielded with their entry content.
+        """
+        if not articles:
+            return
+        
+        allowed = engine.crawl_budget.allocate(self.source_url, len(articles))
+        for article in articles[allowed:]:
+            yield article
+        articles = articles[:allowed]
+        
+        semaphore = asyncio.Semaphore(settings.crawl_rss_fetch_concurrency)
+        tasks = {
+            asyncio.ensure_future(self._complete_article(engine, article, semaphore)): article
+            for article in articles
+        }
+        pending = set(tasks)
+        deadline = asyncio.get_running_loop().time() + settings.crawl_rss_fetch_deadline
+        try:
+            while pending:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        if pending:
+            logger.warning(f"{len(pending)} full articles of {self.source_url} missed the deadline, keeping feed content")
+            for task in pending:
+                yield tasks[task]
+    
+    async def _complete_article(self, engine: "CrawlEngine", article: ArticleData,
+                                semaphore: asyncio.Semaphore) -> ArticleData:
+        """Replace the content of an article with the text of its page, if it can be fetched"""
+        async with semaphore:
+            full_content = await self._fetch_full_article(engine, article.url)
+        if full_content:
+            article.content = full_content
+        return article
+    
     def _clean_html(self, html: str) -> str:
         """Remove HTML tags from content"""
         if not html:
@@ -103,46 +188,21 @@ class RSSParser(BaseCrawler):
         text = soup.get_text()
         return text
     
-    def _fetch_full_article(self, url: str) -> Optional[str]:
+    async def _fetch_full_article(self, engine: "CrawlEngine", url: str) -> Optional[str]:
         """Fetch full article content from URL"""
         try:
-            response = requests.get(url, timeout=self.timeout, headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            })
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # Remove script and style
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
-            
-            # Try to find main content
-            content_selectors = [
-                "article",
-                ".article-content",
-                ".post-content",
-                ".entry-content",
-                "main",
-                "#main-content",
-                ".content"
-            ]
-            
-            content = None
-            for selector in content_selectors:
-                content = soup.select_one(selector)
-                if content:
-                    break
-            
-            if not content:
-                content = soup.find("body")
-            
-            if content:
-                text = content.get_text()
-                return self.clean_text(text)
-            
+            html = await engine.fetch(url, headers=self.headers)
+            # Parsing is CPU-bound, run it in the extraction pool
+            return await run_extraction(self, "_extract_full_article", html)
         except Exception as e:
             logger.debug(f"Could not fetch full article from {url}: {e}")
         
         return None
-
+    
+    def _extract_full_article(self, html: bytes) -> Optional[str]:
+        """Extract the main text of a downloaded article page, without menus, footers or link lists"""
+        content = extract_main_content(make_soup(html))
+        if content:
+            return self.clean_text(content)
+        
+        return None
@@ -1,84 +1,542 @@
-from typing import List
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Dict, List, Optional
 from sqlalchemy.orm import Session
+import asyncio
 import logging
+import time
 
-from ...database.models import Source, Article
-from ...repositories import SourceRepository
+import httpx
+
+from ...database.models import Source, Article, SourceCrawlState, CrawlFrontierEntry
+from ...config.settings import settings
+from ...repositories import (
+    SourceRepository, HttpValidatorRepository, ArticleRepository, SourceCrawlStateRepository, ArticleFingerprintRepository,
+    CrawlFrontierRepository, CrawlRunRepository
+)
+from .base_crawler import ArticleData, HomepageCrawler
+from .crawl_schedule import is_due, postpone_crawl, update_crawl_schedule
+from .duplicates import NearDuplicateDetector, lsh_bands, unpack_signature
+from .extraction import run_extraction
+from .frontier import CrawlBudget
+from .engine import CrawlEngine
+from .known_urls import KnownUrls
+from .metrics import CrawlRunMetrics, collect_metrics, current_metrics
+from .validator_cache import ValidatorCache
 from .rss_parser import RSSParser
-from .news_sites import ThanhNienCrawler, TuoiTreCrawler, VietnamNetCrawler, BBCCrawler
+from .resilience import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, FailureBudget, circuit_status, host_of,
+    record_source_failure, record_source_success
+)
+from .revisit import apply_content_update, content_hash
+from .profile_crawler import ProfileCrawler
+from .site_profile import find_profile
+from .canonical import UrlCanonicalizer, get_canonicalizer
 
 logger = logging.getLogger(__name__)
 
 
+def create_crawler(source: Source):
+    """Create the crawler of a source from its slug"""
+    profile = find_profile(source.slug)
+    if profile:
+        return ProfileCrawler(source.url, profile.name)
+
+    # Default to RSS parser
+    return RSSParser(source.url)
+
+
+def source_canonicalizer(source: Source) -> UrlCanonicalizer:
+    """URL canonicalizer of a source: its profile rules, else the generic ones"""
+    profile = find_profile(source.slug)
+    return get_canonicalizer(profile.canonical if profile else None)
+
+
 class CrawlerService:
     """Service for crawling news from sources"""
-    
-    def __init__(self, db: Session):
+
+    def __init__(self, db: Session, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 on_articles_saved: Optional[Callable[[List[Article]], None]] = None):
         self.db = db
+        # Called with each batch of newly stored articles, e.g. to start summarizing them
+        self.on_articles_saved = on_articles_saved
+        # Custom HTTP transport for every engine of the service, e.g. replayed pages in benchmarks
+        self.transport = transport
         self.repo = SourceRepository(db)
-    
-    def crawl_all_sources(self) -> int:
-        """Crawl all active sources"""
+        self.validator_repo = HttpValidatorRepository(db)
+        self.article_repo = ArticleRepository(db)
+        self.state_repo = SourceCrawlStateRepository(db)
+        self.frontier_repo = CrawlFrontierRepository(db)
+        self.run_repo = CrawlRunRepository(db)
+        self.known_urls = KnownUrls(self.article_repo, self.frontier_repo if settings.crawl_frontier_enabled else None)
+        self.fingerprint_repo = ArticleFingerprintRepository(db)
+        self.duplicate_detector = NearDuplicateDetector(self.fingerprint_repo)
+        # Crawlers of the frontier entries fetched by this service, keyed by source ID
+        self._frontier_crawlers: Dict[int, HomepageCrawler] = {}
+
+    async def crawl_all_sources(self) -> int:
+        """Crawl all active sources concurrently"""
+        return await self._crawl_sources(self.repo.get_all())
+
+    async def crawl_due_sources(self, now: Optional[datetime] = None) -> int:
+        """Crawl the sources whose adaptive schedule says they are due"""
+        now = now or datetime.now(timezone.utc)
         sources = self.repo.get_all()
+        states = self.state_repo.get_by_source_ids([source.id for source in sources])
+        due_sources = [source for source in sources if is_due(states.get(source.id), now)]
+
+        logger.info(f"{len(due_sources)} of {len(sources)} sources are due for crawling")
+        return await self._crawl_sources(due_sources, states)
+
+    async def _crawl_sources(self, sources: List[Source], states: Optional[Dict[int, SourceCrawlState]] = None) -> int:
+        """Crawl sources concurrently, storing their articles as they are parsed"""
+        if not sources:
+            return 0
+
+        if states is None:
+            states = self.state_repo.get_by_source_ids([source.id for source in sources])
+        failure_budget = FailureBudget()
+        sources = self._filter_circuits(sources, states, failure_budget)
+        if not sources:
+            return 0
+        validators = ValidatorCache.load(self.validator_repo, [source.url for source in sources])
+        crawlers = self._get_crawlers(sources, states)
+        crawl_budget = CrawlBudget(settings.crawl_run_budget or None, len(sources))
+        run_metrics = CrawlRunMetrics()
+
+        async with CrawlEngine(validators=validators, transport=self.transport,
+                               failure_budget=failure_budget, crawl_budget=crawl_budget) as engine:
+            results = await asyncio.gather(
+                *(self._measure_source(run_metrics, engine, source, crawler, states.get(source.id), validators)
+                  for source, crawler in zip(sources, crawlers)),
+                return_exceptions=True
+            )
+        run_metrics.finish()
+
         total_articles = 0
-        
-        for source in sources:
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error crawling source {source.id} ({source.name}): {result}")
+            else:
+                total_articles += len(result)
+        if crawl_budget.total is not None:
+            logger.info(f"Crawl budget: {crawl_budget.spent} of {crawl_budget.total} article pages used")
+        self._save_run_metrics(run_metrics)
+        return total_articles
+
+    async def _measure_source(self, run_metrics: CrawlRunMetrics, engine: CrawlEngine, source: Source, crawler,
+                              state: Optional[SourceCrawlState], validators: ValidatorCache) -> List[Article]:
+        """Crawl a source (see _stream_source), recording its requests, pages and links into the run metrics"""
+        with collect_metrics(run_metrics.source(source.id, source.name)) as metrics:
+            start = time.perf_counter()
             try:
-                articles = self.crawl_source(source)
-                total_articles += len(articles)
-            except Exception as e:
-                logger.error(f"Error crawling source {source.id} ({source.name}): {e}")
+                saved_articles = await self._stream_source(engine, source, crawler, state, validators)
+                metrics.articles_stored = len(saved_articles)
+                return saved_articles
+            finally:
+                metrics.seconds = time.perf_counter() - start
+                # Sources that never asked for pages leave their share to the others
+                engine.crawl_budget.release(crawler.source_url)
+
+    def _save_run_metrics(self, run_metrics: CrawlRunMetrics) -> None:
+        """Persist the metrics of a crawl run, dropping runs older than the retention"""
+        try:
+            summary = run_metrics.summary()
+            totals = summary["totals"]
+            self.run_repo.create(
+                started_at=run_metrics.started_at,
+                finished_at=run_metrics.finished_at,
+                duration_seconds=run_metrics.seconds,
+                sources=totals["sources"],
+                requests=totals["requests"],
+                bytes=totals["bytes"],
+                articles_stored=totals["articles_stored"],
+                metrics=summary,
+            )
+            self.run_repo.delete_older_than(
+                run_metrics.started_at - timedelta(days=settings.crawl_runs_retention_days)
+            )
+            self.db.commit()
+            logger.info(
+                f"Crawl run: {totals['requests']} requests, {totals['bytes'] / 1024:.0f} KiB, "
+                f"fetch {totals['fetch_ms']}, parse {totals['parse_ms']}, "
+                f"{totals['articles_stored']} articles in {run_metrics.seconds:.1f}s"
+            )
+        except Exception as e:
+            logger.error(f"Error saving crawl run metrics: {e}")
+            self.db.rollback()
+
+    def _filter_circuits(self, sources: List[Source], states: Dict[int, SourceCrawlState],
+                         failure_budget: FailureBudget) -> List[Source]:
+        """Drop sources whose circuit is open; sources due for a probe may fail only once"""
+        now = datetime.now(timezone.utc)
+        allowed = []
+        for source in sources:
+            status = circuit_status(states.get(source.id), now)
+            if status == CIRCUIT_OPEN:
+                logger.info(f"Skipping {source.name}: circuit open until {states[source.id].circuit_open_until}")
                 continue
-        
-        return total_articles
-    
+            if status == CIRCUIT_HALF_OPEN:
+                logger.info(f"Probing {source.name} after {states[source.id].consecutive_failures} failed runs")
+                failure_budget.set_budget(host_of(source.url), 1)
+            allowed.append(source)
+        return allowed
+
+    async def _stream_source(self, engine: CrawlEngine, source: Source, crawler,
+                             state: Optional[SourceCrawlState], validators: ValidatorCache) -> List[Article]:
+        """
+        Crawl a source, storing its articles in small batches while it is still being crawled
+
+        Writes are synchronous calls between awaits, so sources crawled
+        concurrently never use the shared session at the same time.
+
+        Returns:
+            Articles stored from the source
+        """
+        saved_articles: List[Article] = []
+        batch: List[ArticleData] = []
+        try:
+            if self._uses_frontier(crawler):
+                new_articles = await self._enqueue_links(engine, source, crawler)
+            else:
+                async with aclosing(self._fetch_source(engine, source, crawler)) as articles_data:
+                    async for article_data in articles_data:
+                        batch.append(article_data)
+                        if len(batch) >= settings.crawl_write_batch_size:
+                            saved_articles.extend(self._save_batch(source, batch))
+                            batch = []
+                saved_articles.extend(self._save_batch(source, batch))
+                new_articles = len(saved_articles)
+
+            host = host_of(source.url)
+            if engine.failure_budget.failed(host):
+                # Crawlers skip pages they cannot fetch, the engine knows whether the host was down
+                health = engine.failure_budget.health(host)
+                logger.warning(
+                    f"Crawl of {source.name} failed: {health.failures} failed requests, last error: {health.last_error}"
+                )
+                self._record_source_failure(source, state, health.last_error, datetime.now(timezone.utc))
+                return saved_articles
+
+            # Only remember validators and watermarks once all of the source's articles are stored
+            self._save_validators(validators, source)
+            self._save_crawl_state(source, crawler, new_articles, state, datetime.now(timezone.utc))
+        except Exception as e:
+            # Batches stored so far are kept, known URLs skip them next time
+            logger.error(f"Error crawling source {source.id} ({source.name}): {e}")
+            self.db.rollback()
+            self._record_source_failure(source, state, str(e), datetime.now(timezone.utc))
+        return saved_articles
+
+    def _uses_frontier(self, crawler) -> bool:
+        """Check whether the article pages of a crawler are fetched by crawl workers"""
+        return settings.crawl_frontier_enabled and isinstance(crawler, HomepageCrawler)
+
+    async def _enqueue_links(self, engine: CrawlEngine, source: Source, crawler: HomepageCrawler) -> int:
+        """
+        Discover the new article links of a source and hand them to the crawl workers
+
+        Links keep their order as priority (1 for the best link of every
+        source), so workers interleave the top stories of all sources.
+
+        Returns:
+            Number of links added to the frontier
+        """
+        logger.info(f"Discovering links of source: {source.name} ({source.slug}) - {source.url}")
+        links = await crawler.discover(engine, known_urls=self.known_urls)
+        if not links:
+            return 0
+        queued = self.frontier_repo.enqueue(
+            source.id, [(url, 1 - rank / len(links)) for rank, url in enumerate(links)]
+        )
+        self.db.commit()
+        # Queued links are known from now on, the sitemap watermark moves past them
+        crawler.mark_links_done(links)
+        logger.info(f"Queued {queued} article links of {source.name} for crawl workers")
+        return queued
+
+    async def crawl_frontier_batch(self, engine: CrawlEngine, worker_id: str) -> int:
+        """
+        Fetch a batch of article pages leased from the crawl frontier
+
+        Fetched articles are stored and their entries removed; entries
+        whose page could not be fetched or parsed go back to the frontier
+        for a later attempt. With nothing ready, expired and failed
+        entries are cleaned up instead.
+
+        Args:
+            engine: Crawl engine of the worker
+            worker_id: Lease owner
+
+        Returns:
+            Number of leased entries, 0 if the frontier had none ready
+        """
+        now = datetime.now(timezone.utc)
+        entries = self.frontier_repo.lease(
+            worker_id, settings.crawl_worker_batch_size, settings.crawl_worker_lease_seconds,
+            settings.crawl_frontier_max_attempts, now
+        )
+        self.db.commit()
+        if not entries:
+            self._clean_frontier(now)
+            return 0
+
+        results = await asyncio.gather(
+            *(self._crawl_frontier_entry(engine, entry) for entry in entries), return_exceptions=True
+        )
+
+        articles_by_source: Dict[int, List[ArticleData]] = defaultdict(list)
+        sources: Dict[int, Source] = {}
+        done = []
+        now = datetime.now(timezone.utc)
+        retry_after = timedelta(minutes=settings.crawl_frontier_retry_minutes)
+        for entry, result in zip(entries, results):
+            if isinstance(result, ArticleData):
+                articles_by_source[entry.source_id].append(result)
+                sources[entry.source_id] = entry.source
+                done.append(entry.id)
+            else:
+                error = str(result) if isinstance(result, Exception) else "No article extracted"
+                logger.warning(f"Error crawling frontier entry {entry.url} (attempt {entry.attempts}): {error}")
+                if not self.frontier_repo.release(
+                    worker_id, entry, error, settings.crawl_frontier_max_attempts, retry_after, now
+                ):
+                    logger.warning(f"Lease of frontier entry {entry.url} expired, left to its new worker")
+
+        for source_id, articles_data in articles_by_source.items():
+            self._save_batch(sources[source_id], articles_data)
+        completed = self.frontier_repo.complete(worker_id, done)
+        if completed < len(done):
+            logger.warning(f"{len(done) - completed} frontier entries were leased to another worker after their lease expired")
+        self.db.commit()
+        return len(entries)
+
+    async def _crawl_frontier_entry(self, engine: CrawlEngine, entry: CrawlFrontierEntry) -> Optional[ArticleData]:
+        """Fetch and parse the page of a frontier entry, raising on fetch errors"""
+        crawler = self._frontier_crawlers.get(entry.source_id)
+        if crawler is None:
+            crawler = self._get_crawler(entry.source)
+            self._frontier_crawlers[entry.source_id] = crawler
+        if not isinstance(crawler, HomepageCrawler):
+            raise ValueError(f"Source {entry.source_id} has no homepage crawler")
+        html = await engine.fetch(entry.url, headers=crawler.headers, stop_after=crawler.stop_after)
+        return await run_extraction(crawler, "_parse_article", entry.url, html)
+
+    def _clean_frontier(self, now: datetime) -> None:
+        """Fail entries whose last lease expired and drop old failed entries"""
+        try:
+            expired = self.frontier_repo.expire_exhausted(settings.crawl_frontier_max_attempts, now)
+            purged = self.frontier_repo.purge_failed(now - timedelta(days=settings.crawl_frontier_retention_days))
+            self.db.commit()
+            if expired or purged:
+                logger.info(f"Crawl frontier: {expired} expired entries failed, {purged} failed entries purged")
+        except Exception as e:
+            logger.error(f"Error cleaning the crawl frontier: {e}")
+            self.db.rollback()
+
     def _get_crawler(self, source: Source):
         """Get appropriate crawler based on source slug"""
-        slug = source.slug.lower()
-        
-        if slug == "bao-thanh-nien":
-            return ThanhNienCrawler(source.url)
-        elif slug == "bao-tuoi-tre" or slug == "tuoi-tre" or "tuoitre" in slug:
-            return TuoiTreCrawler(source.url)
-        elif slug == "vietnamnet" or slug == "bao-vietnamnet" or "vietnamnet" in slug:
-            return VietnamNetCrawler(source.url)
-        elif slug == "bbc" or slug == "bbc-news" or "bbc" in slug:
-            return BBCCrawler(source.url)
-        else:
-            # Default to RSS parser
-            return RSSParser(source.url)
-    
-    def crawl_source(self, source: Source) -> List[Article]:
-        """Crawl articles from a specific source"""
+        return create_crawler(source)
+
+    def _get_crawlers(self, sources: List[Source], states: Dict[int, SourceCrawlState]) -> list:
+        """Create the crawlers of a list of sources, restoring their stored crawl state"""
+        crawlers = []
+        for source in sources:
+            # Get appropriate crawler based on source slug
+            crawler = self._get_crawler(source)
+            state = states.get(source.id)
+            if state and isinstance(crawler, HomepageCrawler):
+                crawler.sitemap_watermark = state.sitemap_watermark
+            crawlers.append(crawler)
+        return crawlers
+
+    def _fetch_source(self, engine: CrawlEngine, source: Source, crawler) -> AsyncIterator[ArticleData]:
+        """Download and parse articles of a source without touching the database"""
         logger.info(f"Crawling source: {source.name} ({source.slug}) - {source.url}")
-        
-        # Get appropriate crawler based on source slug
-        crawler = self._get_crawler(source)
-        articles_data = crawler.crawl()
-        
-        saved_articles = []
-        
-        for article_data in articles_data:
-            # Check if article already exists
-            existing = self.db.query(Article).filter(Article.url == article_data.url).first()
-            if existing:
+        return crawler.stream(engine, known_urls=self.known_urls)
+
+    async def crawl_source(self, source: Source, engine: Optional[CrawlEngine] = None) -> List[Article]:
+        """Crawl articles from a specific source"""
+        states = self.state_repo.get_by_source_ids([source.id])
+        crawler = self._get_crawlers([source], states)[0]
+        if engine is None:
+            validators = ValidatorCache.load(self.validator_repo, [source.url])
+            async with CrawlEngine(validators=validators, transport=self.transport) as own_engine:
+                return await self._stream_source(own_engine, source, crawler, states.get(source.id), validators)
+        return await self._stream_source(engine, source, crawler, states.get(source.id), engine.validators)
+
+    async def revisit_recent_articles(self, now: Optional[datetime] = None) -> int:
+        """
+        Re-fetch recent articles and store the ones whose content changed
+
+        Each due article costs one conditional GET; pages that are not
+        modified (304 or identical body) are not parsed. Only homepage
+        crawler sources are revisited, RSS articles come from their feed.
+
+        Returns:
+            Number of articles whose content changed enough to need a new summary
+        """
+        now = now or datetime.now(timezone.utc)
+        sources = self.repo.get_all()
+        states = self.state_repo.get_by_source_ids([source.id for source in sources])
+        crawlers = {}
+        for source in sources:
+            # Sources being skipped or probed are not revisited either
+            if circuit_status(states.get(source.id), now) != CIRCUIT_CLOSED:
                 continue
-            
-            # Create new article (category will be assigned by AI later)
-            article = Article(
-                url=article_data.url,
-                title=article_data.title,
-                content=article_data.content,
-                published_date=article_data.published_date,
-                source_id=source.id,
-                category_id=None  # Will be assigned by AI during summarization
+            crawler = self._get_crawler(source)
+            if isinstance(crawler, HomepageCrawler):
+                crawlers[source.id] = crawler
+
+        articles = self.article_repo.get_due_for_revisit(
+            crawlers.keys(),
+            crawled_since=now - timedelta(hours=settings.revisit_window_hours),
+            revisited_before=now - timedelta(minutes=settings.revisit_interval_minutes),
+            limit=settings.revisit_batch_size,
+        )
+        if not articles:
+            return 0
+
+        urls = [article.url for article in articles]
+        validators = ValidatorCache.load(self.validator_repo, urls)
+        async with CrawlEngine(validators=validators, transport=self.transport) as engine:
+            results = await asyncio.gather(
+                *(self._revisit_article(engine, crawlers[article.source_id], article) for article in articles),
+                return_exceptions=True
             )
-            
-            self.db.add(article)
-            saved_articles.append(article)
-        
+
+        changed = []
+        # Articles whose MinHash signature was rewritten, small edits included
+        reindexed = []
+        for article, result in zip(articles, results):
+            article.last_revisited_at = now
+            if isinstance(result, Exception):
+                logger.warning(f"Error revisiting article {article.id} ({article.url}): {result}")
+                continue
+            if result is None:
+                continue
+            signature = article.minhash
+            if apply_content_update(article, result, now):
+                changed.append(article)
+                logger.info(f"Article {article.id} was updated, it will be summarized again")
+            if article.minhash and article.minhash != signature:
+                reindexed.append(article)
+
+        try:
+            # Keep the near-duplicate index in line with the new content
+            self.fingerprint_repo.add_bands({
+                article.id: lsh_bands(unpack_signature(article.minhash)) for article in reindexed
+            })
+            validators.save(self.validator_repo, urls)
+            self.validator_repo.delete_not_updated_since(
+                now - timedelta(hours=2 * settings.revisit_window_hours), keep_urls=[source.url for source in sources]
+            )
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error saving revisited articles: {e}")
+            self.db.rollback()
+            return 0
+
+        logger.info(f"Revisited {len(articles)} articles, {len(changed)} changed")
+        return len(changed)
+
+    async def _revisit_article(self, engine: CrawlEngine, crawler: HomepageCrawler, article: Article) -> Optional[ArticleData]:
+        """Fetch an article again, returning None if the page did not change"""
+        html = await engine.fetch_if_changed(article.url, headers=crawler.headers)
+        if html is None:
+            return None
+        return await run_extraction(crawler, "_parse_article", article.url, html)
+
+    def _save_crawl_state(self, source: Source, crawler, new_articles: int,
+                          state: Optional[SourceCrawlState], now: datetime) -> None:
+        """Persist the sitemap watermark and the next crawl time of the source"""
+        if state is None:
+            state = self.state_repo.get_or_create(source.id)
+
+        watermark = getattr(crawler, "sitemap_watermark", None)
+        if watermark is not None:
+            state.sitemap_watermark = watermark
+        update_crawl_schedule(state, new_articles, now)
+        record_source_success(state)
+        self.db.commit()
+
+        logger.info(f"Next crawl of {source.name} in {state.crawl_interval_minutes:.0f} minutes")
+
+    def _record_source_failure(self, source: Source, state: Optional[SourceCrawlState],
+                               error: Optional[str], now: datetime) -> None:
+        """Delay the next crawl of a source whose run failed, opening its circuit after repeated failures"""
+        metrics = current_metrics()
+        if metrics:
+            metrics.error = error
+        try:
+            if state is None:
+                state = self.state_repo.get_or_create(source.id)
+            postpone_crawl(state, now)
+            record_source_failure(state, error, now)
+            self.db.commit()
+            if state.circuit_open_until:
+                logger.warning(f"Circuit of {source.name} open until {state.circuit_open_until}")
+        except Exception as e:
+            logger.error(f"Error saving crawl state for source {source.id} ({source.name}): {e}")
+            self.db.rollback()
+
+    def _save_validators(self, validators: ValidatorCache, source: Source) -> None:
+        """Persist conditional GET validators of the source's entry URL"""
+        if validators.save(self.validator_repo, [source.url]):
+            self.db.commit()
+
+    def _save_batch(self, source: Source, articles_data: List[ArticleData]) -> List[Article]:
+        """Store a batch of crawled articles and hand the new ones to on_articles_saved"""
+        if not articles_data:
+            return []
+        saved_articles = self._save_articles(source, articles_data)
+        if saved_articles and self.on_articles_saved:
+            try:
+                self.on_articles_saved(saved_articles)
+            except Exception as e:
+                logger.error(f"Error handing over saved articles of source {source.id} ({source.name}): {e}")
+        return saved_articles
+
+    def _save_articles(self, source: Source, articles_data: List[ArticleData]) -> List[Article]:
+        """Save crawled articles that are not stored yet in one bulk insert"""
+        canonicalizer = source_canonicalizer(source)
+        rows = [
+            {
+                "url": canonicalizer.canonicalize(article_data.url),
+                "title": article_data.title,
+                "content": article_data.content,
+                "published_date": article_data.published_date,
+                "content_hash": content_hash(article_data.content),
+                "source_id": source.id,
+                "category_id": None,  # Will be assigned by AI during summarization
+            }
+            for article_data in articles_data
+        ]
+
+        saved_articles = self.article_repo.insert_new(rows)
+        # Links whose page names another canonical URL are known from now on, stored now or before
+        aliases = {
+            canonicalizer.canonicalize(article_data.link_url): row["url"]
+            for article_data, row in zip(articles_data, rows)
+            if article_data.link_url
+        }
+        if aliases:
+            self.article_repo.add_url_aliases(aliases)
         self.db.commit()
-        
+
         logger.info(f"Saved {len(saved_articles)} new articles from {source.name}")
+        if settings.dedup_enabled and saved_articles:
+            self._link_duplicates(source, saved_articles)
         return saved_articles
 
+    def _link_duplicates(self, source: Source, articles: List[Article]) -> None:
+        """Link new articles to earlier copies of the same story, keeping them if this fails"""
+        try:
+            duplicates = self.duplicate_detector.link_duplicates(articles)
+            self.db.commit()
+            if duplicates:
+                logger.info(f"{duplicates} new articles from {source.name} are near-duplicates")
+        except Exception as e:
+            logger.error(f"Error detecting near-duplicates for source {source.id} ({source.name}): {e}")
+            self.db.rollback()
@@ -0,0 +1,199 @@
+"""
+Declarative site extraction profiles
+
+A profile is a JSON file in `profiles/` describing how to find article links
+(homepage rules, news sitemaps), how to canonicalize their URLs and how to
+extract the title, content and published date of an article page. Profiles are compiled once (selectors, regexes, strainer) and
+executed by ProfileCrawler, so adding a site needs no Python code.
+"""
+from dataclasses import dataclass
+from datetime import tzinfo
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Pattern, Tuple
+import json
+import logging
+import re
+
+import soupsieve
+from zoneinfo import ZoneInfoNotFoundError
+
+from .canonical import CanonicalRules
+from .dates import DateFormat, compile_format, get_timezone
+from .link_extractor import LinkRules
+from .parsing import SubtreeStrainer
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = Path(__file__).parent / "profiles"
+
+
+@dataclass(frozen=True)
+class ParagraphRule:
+    """Which paragraphs of a content element are kept"""
+    min_length: int = 1
+    skip: Optional[Pattern] = None  # Paragraphs whose lowercased text matches are dropped
+
+
+@dataclass(frozen=True)
+class DateRule:
+    """
+    One way of finding the published date
+
+    Either `selector` (read `attr`, falling back to the element text if
+    `text` is set) or `url` (regex whose groups are year, month, day and
+    optionally hour and minute). Dates without an offset are in the
+    profile's timezone.
+    """
+    selector: Optional[Any] = None
+    attr: Optional[str] = None
+    text: bool = False
+    strip: Optional[Pattern] = None
+    formats: Tuple[DateFormat, ...] = ()  # Tried before the default formats
+    dayfirst: bool = False
+    url: Optional[Pattern] = None
+
+
+@dataclass(frozen=True)
+class SiteProfile:
+    """Compiled extraction profile of a site"""
+    name: str
+    site_name: str
+    slugs: Tuple[str, ...]
+    slug_contains: Tuple[str, ...]
+    link_rules: LinkRules
+    canonical: CanonicalRules
+    strainer: Optional[SubtreeStrainer]
+    fast_parse: bool
+    sitemaps: Tuple[str, ...]
+    sitemaps_from_robots: bool
+    stop_after: Optional[bytes]
+    title_selectors: Tuple[Any, ...]
+    title_strip: Tuple[Pattern, ...]
+    content_remove: Tuple[str, ...]
+    content_selectors: Tuple[Any, ...]
+    paragraphs: ParagraphRule
+    fallback_selectors: Tuple[Any, ...]
+    fallback_paragraphs: ParagraphRule
+    min_content_length: int
+    date_rules: Tuple[DateRule, ...]
+    timezone: tzinfo
+
+    def matches(self, slug: str) -> bool:
+        """Check whether a source slug uses this profile"""
+        slug = slug.lower()
+        return slug in self.slugs or any(part in slug for part in self.slug_contains)
+
+
+def _compile_paragraphs(data: Dict[str, Any]) -> ParagraphRule:
+    skip = data.get("skip")
+    return ParagraphRule(
+        min_length=data.get("min_length", 1),
+        skip=re.compile("|".join(re.escape(phrase.lower()) for phrase in skip)) if skip else None,
+    )
+
+
+def _compile_date_rule(data: Dict[str, Any]) -> DateRule:
+    if "url" in data:
+        return DateRule(url=re.compile(data["url"]))
+    return DateRule(
+        selector=soupsieve.compile(data["selector"]),
+        attr=data.get("attr"),
+        text=data.get("text", False),
+        strip=re.compile(data["strip"], re.IGNORECASE) if data.get("strip") else None,
+        formats=tuple(compile_format(fmt) for fmt in data.get("formats", ())),
+        dayfirst=data.get("dayfirst", False),
+    )
+
+
+def compile_profile(name: str, data: Dict[str, Any]) -> SiteProfile:
+    """
+    Compile a profile definition
+
+    Args:
+        name: Profile name (file name without extension)
+        data: Parsed JSON definition
+
+    Returns:
+        Compiled SiteProfile
+
+    Raises:
+        ValueError: If the definition is invalid
+    """
+    try:
+        links = data.get("links", {})
+        strainer = data.get("strainer")
+        title = data["title"]
+        content = data["content"]
+        fallback = content.get("fallback", {})
+        sitemaps = data.get("sitemaps", {})
+        canonical = data.get("canonical", {})
+
+        return SiteProfile(
+            name=name,
+            site_name=data.get("site_name", name),
+            slugs=tuple(slug.lower() for slug in data.get("slugs", ())),
+            slug_contains=tuple(part.lower() for part in data.get("slug_contains", ())),
+            link_rules=LinkRules(
+                hosts=tuple(links.get("hosts", ())),
+                require=links.get("require"),
+                exclude=tuple(links.get("exclude", ())),
+                accept=tuple(links.get("accept", ())),
+                anchor_classes=tuple(links.get("anchor_classes", ())),
+                sections=tuple(links.get("sections", {}).items()),
+            ),
+            canonical=CanonicalRules(
+                host_aliases=tuple(sorted(canonical.get("host_aliases", {}).items())),
+                keep_params=tuple(canonical.get("keep_params", ())),
+                path_strip=tuple(canonical.get("path_strip", ())),
+                https=canonical.get("https", False),
+            ),
+            # <link rel="canonical"> is always kept for the canonical URL of the page
+            strainer=SubtreeStrainer([*strainer["tags"], "link"], strainer.get("attrs")) if strainer else None,
+            fast_parse=data.get("fast_parse", strainer is not None),
+            sitemaps=tuple(sitemaps.get("urls", ())),
+            sitemaps_from_robots=sitemaps.get("from_robots", False),
+            stop_after=data["stop_after"].encode("utf-8") if data.get("stop_after") else None,
+            title_selectors=tuple(soupsieve.compile(selector) for selector in title["selectors"]),
+            title_strip=tuple(re.compile(pattern, re.IGNORECASE) for pattern in title.get("strip", ())),
+            content_remove=tuple(content.get("remove", ("script", "style"))),
+            content_selectors=tuple(soupsieve.compile(selector) for selector in content["selectors"]),
+            paragraphs=_compile_paragraphs(content.get("paragraphs", {})),
+            fallback_selectors=tuple(soupsieve.compile(selector) for selector in fallback.get("selectors", ())),
+            fallback_paragraphs=_compile_paragraphs(fallback.get("paragraphs", {})),
+            min_content_length=content.get("min_length", 100),
+            date_rules=tuple(_compile_date_rule(rule) for rule in data.get("date", ())),
+            timezone=get_timezone(data.get("timezone")),
+        )
+    except (KeyError, TypeError, ValueError, re.error, soupsieve.SelectorSyntaxError, ZoneInfoNotFoundError) as e:
+        raise ValueError(f"Invalid site profile '{name}': {e}") from e
+
+
+@lru_cache(maxsize=None)
+def load_profiles() -> Dict[str, SiteProfile]:
+    """Load and compile every profile in PROFILES_DIR once per process"""
+    profiles = {}
+    for path in sorted(PROFILES_DIR.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            profiles[path.stem] = compile_profile(path.stem, json.load(f))
+    logger.info(f"Loaded {len(profiles)} site profiles")
+    return profiles
+
+
+def get_profile(name: str) -> SiteProfile:
+    """Get a compiled profile by name"""
+    return load_profiles()[name]
+
+
+def find_profile(slug: str) -> Optional[SiteProfile]:
+    """Find the profile used by a source slug, if any"""
+    slug = slug.lower()
+    profiles = load_profiles().values()
+    # Exact slugs win over substring matches
+    for profile in profiles:
+        if slug in profile.slugs:
+            return profile
+    for profile in profiles:
+        if profile.matches(slug):
+            return profile
+    return None
@@ -0,0 +1,182 @@
+"""
+Incremental article discovery from Google News sitemaps
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterator, List, Optional, TYPE_CHECKING
+from urllib.parse import urljoin
+import logging
+import zlib
+
+from lxml import etree
+
+from ...config.settings import settings
+from .dates import parse_iso
+from .engine import ContentRejectedError
+
+if TYPE_CHECKING:
+    from .engine import CrawlEngine
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    """A <url> of a sitemap, or a <sitemap> of a sitemap index"""
+    url: str
+    published: Optional[datetime] = None  # news:publication_date, else lastmod
+    is_sitemap: bool = False
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime, assuming UTC when no offset is given"""
+    if not value:
+        return None
+    return parse_iso(value.strip(), timezone.utc)
+
+
+def _read_entries(parser: etree.XMLPullParser) -> Iterator[SitemapEntry]:
+    """Turn the completed <url>/<sitemap> elements into entries and free them"""
+    for _, element in parser.read_events():
+        name = etree.QName(element).localname
+        if name not in ("url", "sitemap"):
+            continue
+
+        values: Dict[str, str] = {}
+        for child in element.iter(etree.Element):
+            child_name = etree.QName(child).localname
+            if child_name in ("loc", "lastmod", "publication_date") and child.text:
+                values[child_name] = child.text.strip()
+
+        # Drop parsed elements so memory stays flat on large sitemaps
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+        if values.get("loc"):
+            yield SitemapEntry(
+                url=values["loc"],
+                published=_parse_date(values.get("publication_date") or values.get("lastmod")),
+                is_sitemap=name == "sitemap",
+            )
+
+
+async def iter_sitemap(engine: "CrawlEngine", url: str, headers: Optional[Dict[str, str]] = None) -> AsyncIterator[SitemapEntry]:
+    """
+    Stream a sitemap (or sitemap index) and yield its entries as they are parsed
+
+    Gzipped sitemap files (.xml.gz) are decompressed on the fly, within
+    the same `crawl_max_page_mb` cap as the download.
+
+    Raises:
+        httpx.HTTPError: On network errors, non-2xx responses or rejected content
+        lxml.etree.XMLSyntaxError: On malformed XML
+    """
+    parser = etree.XMLPullParser(events=("end",), resolve_entities=False, no_network=True)
+    decompressor = None
+    first_chunk = True
+    max_bytes = settings.crawl_max_page_mb * 1024 * 1024
+    size = 0
+
+    async for chunk in engine.stream(url, headers=headers):
+        if first_chunk:
+            first_chunk = False
+            if chunk.startswith(_GZIP_MAGIC):
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor:
+            chunk = decompressor.decompress(chunk, max_bytes - size + 1)
+            size += len(chunk)
+            if size > max_bytes:
+                raise ContentRejectedError(f"Page larger than {settings.crawl_max_page_mb} MB: {url}")
+        parser.feed(chunk)
+        for entry in _read_entries(parser):
+            yield entry
+
+    parser.close()
+    for entry in _read_entries(parser):
+        yield entry
+
+
+def _entry_order(entry: SitemapEntry):
+    """Sort key: oldest first, undated entries last"""
+    return entry.published is None, entry.published or datetime.min.replace(tzinfo=timezone.utc)
+
+
+class SitemapDiscovery:
+    """
+    Finds article URLs published since a watermark in a site's news sitemaps.
+
+    Sitemaps are parsed incrementally while they download; only entries
+    dated at or after the watermark (or undated ones) are kept, and sitemap
+    index children older than the watermark are not fetched at all. Entries
+    dated at the watermark itself may be stored already, the known-URL
+    filter drops those.
+    """
+
+    def __init__(self, engine: "CrawlEngine", headers: Optional[Dict[str, str]] = None,
+                 max_children: Optional[int] = None):
+        self.engine = engine
+        self.headers = headers
+        self.max_children = max_children or settings.crawl_sitemap_max_children
+
+    async def find_sitemaps(self, base_url: str, sitemaps: List[str], from_robots: bool = False) -> List[str]:
+        """
+        Resolve the sitemap URLs of a site
+
+        Args:
+            base_url: Site root URL
+            sitemaps: Configured sitemap URLs or paths
+            from_robots: Also use the news sitemaps listed in robots.txt
+
+        Returns:
+            Absolute sitemap URLs without duplicates
+        """
+        urls = [urljoin(base_url, sitemap) for sitemap in sitemaps]
+
+        if from_robots:
+            robots = await self.engine.fetch(urljoin(base_url, "/robots.txt"), headers=self.headers)
+            for line in robots.decode("utf-8", "replace").splitlines():
+                key, _, value = line.partition(":")
+                # Only news sitemaps, full sitemaps list the whole archive
+                if key.strip().lower() == "sitemap" and "news" in value.lower():
+                    urls.append(value.strip())
+
+        return list(dict.fromkeys(urls))
+
+    async def discover(self, sitemap_urls: List[str], watermark: Optional[datetime] = None) -> List[SitemapEntry]:
+        """
+        Collect article entries dated at or after the watermark
+
+        Args:
+            sitemap_urls: Sitemaps or sitemap indexes to read
+            watermark: Newest publication date crawled by a previous run
+
+        Returns:
+            New entries, oldest first, undated entries last
+        """
+        entries: Dict[str, SitemapEntry] = {}
+        queue = list(sitemap_urls)
+        visited = set()
+        children = 0
+
+        while queue:
+            url = queue.pop(0)
+            if url in visited:
+                continue
+            visited.add(url)
+
+            async for entry in iter_sitemap(self.engine, url, headers=self.headers):
+                is_new = watermark is None or entry.published is None or entry.published >= watermark
+                if not is_new:
+                    continue
+                if entry.is_sitemap:
+                    if children < self.max_children:
+                        children += 1
+                        queue.append(entry.url)
+                elif entry.url not in entries:
+                    entries[entry.url] = entry
+
+        logger.info(f"Found {len(entries)} sitemap entries since {watermark}")
+        return sorted(entries.values(), key=_entry_order)
@@ -0,0 +1,81 @@
+"""
+Conditional GET validators (ETag / Last-Modified / body hash) for crawled URLs
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...repositories import HttpValidatorRepository
+
+
+@dataclass
+class CachedValidator:
+    """Validators remembered from the last successful response of a URL"""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+
+
+class ValidatorCache:
+    """
+    In-memory view of stored validators used by the crawl engine.
+
+    Validators are loaded in one query before a run and the changes made
+    during the run are written back explicitly, so the engine never touches
+    the database session from inside the event loop's fetch tasks.
+    """
+
+    def __init__(self, validators: Optional[Dict[str, CachedValidator]] = None):
+        self._validators = validators or {}
+        self._changed: Dict[str, CachedValidator] = {}
+        # Validators of changed URLs as loaded, to undo a change
+        self._loaded: Dict[str, Optional[CachedValidator]] = {}
+
+    @classmethod
+    def load(cls, repo: "HttpValidatorRepository", urls: Iterable[str]) -> "ValidatorCache":
+        """Load stored validators for the given URLs"""
+        validators = {
+            row.url: CachedValidator(etag=row.etag, last_modified=row.last_modified, body_hash=row.body_hash)
+            for row in repo.get_by_urls(urls)
+        }
+        return cls(validators)
+
+    def get(self, url: str) -> Optional[CachedValidator]:
+        """Get validators for a URL"""
+        return self._validators.get(url)
+
+    def set(self, url: str, validator: CachedValidator) -> None:
+        """Remember new validators for a URL"""
+        if url not in self._changed:
+            self._loaded[url] = self._validators.get(url)
+        self._validators[url] = validator
+        self._changed[url] = validator
+
+    def discard(self, url: str) -> None:
+        """Undo the change of a URL made during the run, so the page is fetched and parsed again next run"""
+        if url not in self._changed:
+            return
+        del self._changed[url]
+        previous = self._loaded.pop(url)
+        if previous is None:
+            self._validators.pop(url, None)
+        else:
+            self._validators[url] = previous
+
+    def save(self, repo: "HttpValidatorRepository", urls: Optional[Iterable[str]] = None) -> int:
+        """
+        Persist validators changed during the run
+
+        Args:
+            repo: Validator repository bound to the session to write with
+            urls: Only persist these URLs (all changed URLs if None)
+
+        Returns:
+            Number of validators written
+        """
+        urls = list(self._changed) if urls is None else [url for url in urls if url in self._changed]
+        for url in urls:
+            validator = self._changed.pop(url)
+            self._loaded.pop(url, None)
+            repo.upsert(url, validator.etag, validator.last_modified, validator.body_hash)
+        return len(urls)
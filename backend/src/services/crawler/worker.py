@@ -0,0 +1,111 @@
+"""
+Crawl worker fetching article pages from the crawl frontier
+
+With CRAWL_FRONTIER_ENABLED the scheduler only discovers the new links of
+homepage sources and queues them in the crawl_frontier table; any number
+of workers, in any process on any node sharing the database, lease
+batches of links (SELECT ... FOR UPDATE SKIP LOCKED), fetch and store the
+articles. Links leased by a worker that died are taken again once their
+lease expires.
+
+    uv run python -m src.services.crawler.worker
+    uv run python -m src.services.crawler.worker --id node-2 --once
+"""
+from typing import Optional
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+import httpx
+
+from ...config.settings import settings
+from ...database.connection import get_db_session
+from .engine import CrawlEngine
+from .extraction import shutdown_extraction_pool
+from .http_client import create_http_client
+from .service import CrawlerService
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """Lease owner name of this process"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+async def run_worker(worker_id: Optional[str] = None, once: bool = False, stop: Optional[asyncio.Event] = None,
+                     transport: Optional[httpx.AsyncBaseTransport] = None) -> int:
+    """
+    Crawl frontier entries until stopped
+
+    Each batch gets a fresh engine (sharing the HTTP client), so host
+    failure budgets apply per batch rather than for the worker's lifetime.
+
+    Args:
+        worker_id: Lease owner (default: host name and PID)
+        once: Return as soon as the frontier has nothing ready
+        stop: Event stopping the worker after the current batch
+        transport: Custom HTTP transport, e.g. replayed pages in benchmarks
+
+    Returns:
+        Number of frontier entries processed
+    """
+    worker_id = worker_id or default_worker_id()
+    client = create_http_client(transport=transport)
+    processed = 0
+    logger.info(f"Crawl worker {worker_id} started")
+    try:
+        with get_db_session() as db:
+            service = CrawlerService(db)
+            while stop is None or not stop.is_set():
+                try:
+                    leased = await service.crawl_frontier_batch(CrawlEngine(client=client), worker_id)
+                except Exception as e:
+                    logger.error(f"Crawl worker {worker_id} batch failed: {e}")
+                    db.rollback()
+                    leased = 0
+                processed += leased
+                if leased:
+                    continue
+                if once:
+                    break
+                if stop is None:
+                    await asyncio.sleep(settings.crawl_worker_idle_seconds)
+                    continue
+                try:
+                    await asyncio.wait_for(stop.wait(), settings.crawl_worker_idle_seconds)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        await client.aclose()
+    logger.info(f"Crawl worker {worker_id} stopped after {processed} entries")
+    return processed
+
+
+async def _main(worker_id: Optional[str], once: bool) -> int:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    return await run_worker(worker_id, once=once, stop=stop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--id", help="Worker name used as lease owner (default: host name and PID)")
+    parser.add_argument("--once", action="store_true", help="Exit when the frontier has nothing ready")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
+    try:
+        processed = asyncio.run(_main(args.id, args.once))
+    finally:
+        shutdown_extraction_pool()
+    print(f"{processed} frontier entries processed")
+
+
+if __name__ == "__main__":
+    main()
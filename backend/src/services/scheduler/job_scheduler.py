@@ -1,9 +1,11 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
 import logging
 import asyncio
 
@@ -28,23 +30,45 @@ class JobScheduler:
         self.summarizer = Summarizer()
         self.notification_sender = NotificationSender()
     
-    def _crawl_articles(self, db: Session) -> int:
+    async def _crawl_articles(self, db: Session,
+                              on_articles_saved: Optional[Callable[[List[Article]], None]] = None) -> int:
         """Step 1: Crawl new articles from all sources"""
         logger.info("Step 1: Crawling articles from sources...")
-        crawler = CrawlerService(db)
-        total_crawled = crawler.crawl_all_sources()
+        crawler = CrawlerService(db, on_articles_saved=on_articles_saved)
+        if settings.crawl_adaptive_schedule:
+            total_crawled = await crawler.crawl_due_sources()
+        else:
+            total_crawled = await crawler.crawl_all_sources()
         logger.info(f"Crawled {total_crawled} new articles")
+        
+        if settings.revisit_enabled:
+            total_updated = await crawler.revisit_recent_articles()
+            logger.info(f"{total_updated} recent articles were updated")
+            total_crawled += total_updated
         return total_crawled
     
     def _get_articles_to_process(self, db: Session) -> List[Article]:
-        """Step 2: Get new articles without summaries (from last 24 hours)"""
+        """Step 2: Get new articles without summaries, or updated since their summary (from last 24 hours)"""
         logger.info("Step 2: Getting articles to process...")
         one_day_ago = datetime.now(timezone.utc) - timedelta(days=1)
-        new_articles = db.query(Article).filter(
-            ~Article.id.in_(
-                db.query(Summary.article_id).distinct()
+        latest_summaries = db.query(
+            Summary.article_id,
+            func.max(Summary.created_at).label("created_at")
+        ).group_by(Summary.article_id).subquery()
+        
+        new_articles = db.query(Article).outerjoin(
+            latest_summaries, latest_summaries.c.article_id == Article.id
+        ).filter(
+            or_(
+                latest_summaries.c.article_id.is_(None),
+                Article.content_updated_at > latest_summaries.c.created_at
             ),
-            Article.crawled_at >= one_day_ago
+            or_(
+                Article.crawled_at >= one_day_ago,
+                Article.content_updated_at >= one_day_ago
+            ),
+            # Near-duplicates share the summary and notification of their canonical article
+            Article.canonical_article_id.is_(None)
         ).all()
         
         logger.info(f"Found {len(new_articles)} articles to process")
@@ -117,7 +141,9 @@ class JobScheduler:
         
         # Summarize and classify in a single AI query
         logger.info(f"Summarizing and classifying {len(articles_data)} articles in batch...")
-        results = self.summarizer.summarize_and_classify_batch(
+        # In a worker thread, so crawling on the event loop goes on meanwhile
+        results = await asyncio.to_thread(
+            self.summarizer.summarize_and_classify_batch,
             articles=articles_data,
             categories=categories_data,
             max_length=200
@@ -189,7 +215,8 @@ class JobScheduler:
         """Process a single article individually (fallback method)"""
         try:
             # Summarize
-            summary_text = self.summarizer.summarize_article(
+            summary_text = await asyncio.to_thread(
+                self.summarizer.summarize_article,
                 title=article.title,
                 content=article.content,
                 max_length=200
@@ -201,7 +228,8 @@ class JobScheduler:
             
             # Classify category
             if categories_data and not article.category_id:
-                category_slug = self.summarizer.classify_category(
+                category_slug = await asyncio.to_thread(
+                    self.summarizer.classify_category,
                     title=article.title,
                     content=article.content,
                     categories=categories_data
@@ -289,27 +317,95 @@ class JobScheduler:
             
             return total_processed
     
+    def _enqueue_new_articles(self, queue: asyncio.Queue, articles: List[Article]) -> None:
+        """Queue newly stored articles for summarization, near-duplicates excepted"""
+        for article in articles:
+            if article.canonical_article_id is None:
+                queue.put_nowait(article.id)
+    
+    async def _summarize_stream(self, queue: asyncio.Queue) -> int:
+        """
+        Summarize articles while they are being crawled
+        
+        Article IDs are read from the queue until None. A batch is processed
+        once summary_batch_size articles are queued, or after
+        summary_flush_seconds without a new article.
+        
+        Args:
+            queue: IDs of newly stored articles, None when crawling is done
+            
+        Returns:
+            Number of articles processed
+        """
+        total_processed = 0
+        pending: List[int] = []
+        finished = False
+        
+        try:
+            # Own session: the crawler keeps using its session meanwhile
+            with get_db_session() as db:
+                all_categories, categories_data = self._get_categories_data(db)
+                
+                while not finished:
+                    try:
+                        article_id = await asyncio.wait_for(
+                            queue.get(), timeout=settings.summary_flush_seconds if pending else None
+                        )
+                    except asyncio.TimeoutError:
+                        # Crawling is slow, do not hold a partial batch back
+                        flush = True
+                    else:
+                        if article_id is None:
+                            finished = flush = True
+                        else:
+                            pending.append(article_id)
+                            flush = len(pending) >= settings.summary_batch_size
+                    
+                    if flush and pending:
+                        articles = db.query(Article).filter(Article.id.in_(pending)).all()
+                        pending = []
+                        total_processed += await self._process_articles(
+                            db, articles, all_categories, categories_data, []
+                        )
+        except Exception as e:
+            logger.error(f"Error summarizing crawled articles: {e}")
+        
+        return total_processed
+    
     async def crawl_and_process_job(self):
         """Crawl job: crawl, summarize, and classify articles (no notifications)"""
         logger.info("Starting crawl and process job...")
         
         try:
             with get_db_session() as db:
-                # Step 1: Crawl new articles
-                self._crawl_articles(db)
+                # Step 1: Crawl new articles, summarizing each stored batch right away
+                queue: asyncio.Queue = asyncio.Queue()
+                summarize_task = asyncio.create_task(self._summarize_stream(queue))
+                try:
+                    total_crawled = await self._crawl_articles(
+                        db, on_articles_saved=lambda articles: self._enqueue_new_articles(queue, articles)
+                    )
+                finally:
+                    queue.put_nowait(None)
+                    total_processed = await summarize_task
                 
-                # Step 2: Get articles to process
+                # Frequent adaptive ticks only summarize when something new arrived; with the
+                # frontier, articles stored by crawl workers are only picked up by step 2
+                if settings.crawl_adaptive_schedule and not total_crawled and not settings.crawl_frontier_enabled:
+                    return
+                
+                # Step 2: Get articles left to process (updated articles, earlier failures)
                 new_articles = self._get_articles_to_process(db)
                 
                 if not new_articles:
-                    logger.info("No articles to process")
+                    logger.info(f"Crawl and process job completed. Processed {total_processed} articles.")
                     return
                 
                 # Get categories
                 all_categories, categories_data = self._get_categories_data(db)
                 
                 # Step 3: Process articles (summarize and classify only, no notifications)
-                total_processed = await self._process_articles(
+                total_processed += await self._process_articles(
                     db, new_articles, all_categories, categories_data, []
                 )
                 
@@ -323,8 +419,9 @@ class JobScheduler:
         from sqlalchemy import and_, not_
         
         # Get articles with summaries
-        query = db.query(Article).join(Summary).filter(
-            Summary.article_id == Article.id
+        query = db.query(Article).filter(
+            Article.id.in_(db.query(Summary.article_id)),
+            Article.canonical_article_id.is_(None)
         )
         
         # Filter by user's category preferences
@@ -394,7 +491,7 @@ class JobScheduler:
                                 # Get summary for this article
                                 summary = db.query(Summary).filter(
                                     Summary.article_id == article.id
-                                ).first()
+                                ).order_by(Summary.created_at.desc()).first()
                                 
                                 if not summary:
                                     logger.warning(f"No summary found for article {article.id}, skipping")
@@ -450,11 +547,15 @@ class JobScheduler:
         #     asyncio.create_task(self.discord_bot.start())
         #     logger.info("Discord bot starting...")
         
-        trigger = CronTrigger(
-            hour=settings.crawl_at_hours,
-            minute=settings.crawl_at_minutes,
-            timezone=settings.timezone
-        )
+        if settings.crawl_adaptive_schedule:
+            # Each tick crawls only the sources that are due
+            trigger = IntervalTrigger(minutes=settings.crawl_tick_minutes, timezone=settings.timezone)
+        else:
+            trigger = CronTrigger(
+                hour=settings.crawl_at_hours,
+                minute=settings.crawl_at_minutes,
+                timezone=settings.timezone
+            )
         
         # Schedule recurring job
         self.scheduler.add_job(
@@ -462,7 +563,9 @@ class JobScheduler:
             trigger=trigger,
             id="crawl_and_process",
             name="Crawl and Process News",
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
 
           # Schedule notification job to run every hour
@@ -481,7 +584,10 @@ class JobScheduler:
         logger.info("Scheduled notification job to run every hour")
         
         self.scheduler.start()
-        logger.info(f"Scheduler started. Crawl jobs will run at {settings.crawl_at_hours}:{settings.crawl_at_minutes} every day.")
+        if settings.crawl_adaptive_schedule:
+            logger.info(f"Scheduler started. Due sources are crawled every {settings.crawl_tick_minutes} minutes.")
+        else:
+            logger.info(f"Scheduler started. Crawl jobs will run at {settings.crawl_at_hours}:{settings.crawl_at_minutes} every day.")
         logger.info("Notification job will run every hour to send pending notifications.")
     
     async def shutdown(self):
@@ -0,0 +1,30 @@
+"""
+Page archive shared by several crawler processes
+"""
+from src.services.crawler.archive import PageArchive
+
+
+def test_store_and_read(tmp_path):
+    archive = PageArchive(str(tmp_path))
+
+    entry = archive.store("https://example.com/a", b"<html>a</html>", "text/html; charset=utf-8")
+
+    assert archive.read(entry) == b"<html>a</html>"
+    assert archive.latest()["https://example.com/a"] == entry
+
+
+def test_body_stored_by_another_process_is_not_stored_again(tmp_path):
+    # Two instances on one directory stand for two crawler processes
+    first = PageArchive(str(tmp_path))
+    second = PageArchive(str(tmp_path))
+
+    stored = first.store("https://example.com/a", b"<html>same</html>")
+    revisit = second.store("https://example.com/a?utm_source=x", b"<html>same</html>")
+
+    assert (revisit.segment, revisit.offset, revisit.length) == (stored.segment, stored.offset, stored.length)
+    assert second.read(revisit) == b"<html>same</html>"
+    # A third body written by the second process is deduplicated by the first
+    other = second.store("https://example.com/b", b"<html>other</html>")
+    again = first.store("https://example.com/b", b"<html>other</html>")
+    assert (again.segment, again.offset) == (other.segment, other.offset)
+    assert len(list(first.entries())) == 4
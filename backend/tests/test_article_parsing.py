@@ -0,0 +1,114 @@
+"""
+Article parsing of the profile sites: lxml + SubtreeStrainer vs full html.parser trees
+
+fast_parse only builds the subtrees the extractors read, so it must give
+exactly the ArticleData of a full parse of the same saved page.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.config.settings import settings
+from src.services.crawler.news_sites.bbc import BBCCrawler
+from src.services.crawler.news_sites.thanh_nien import ThanhNienCrawler
+from src.services.crawler.news_sites.tuoi_tre import TuoiTreCrawler
+from src.services.crawler.news_sites.vietnamnet import VietnamNetCrawler
+from src.services.crawler.profile_crawler import SKIP_UNMATCHED_AFTER
+
+ARTICLE_FIXTURES = Path(__file__).parent / "fixtures" / "articles"
+
+# Fixture page -> crawler, source URL, article URL and the expected title and date
+PAGES = {
+    "thanh_nien": (
+        ThanhNienCrawler, "https://thanhnien.vn/",
+        "https://thanhnien.vn/gia-xang-dau-dong-loat-giam-tu-15-gio-chieu-nay-185250109151234567.htm",
+        "Giá xăng dầu đồng loạt giảm từ 15 giờ chiều nay", datetime(2025, 1, 9, 8, 12, tzinfo=timezone.utc),
+    ),
+    "tuoi_tre": (
+        TuoiTreCrawler, "https://tuoitre.vn/",
+        "https://tuoitre.vn/metro-so-1-cho-hon-2-trieu-luot-khach-sau-mot-thang-van-hanh-20250122093015482.htm",
+        "Metro số 1 chở hơn 2 triệu lượt khách sau một tháng vận hành", datetime(2025, 1, 22, 2, 30, tzinfo=timezone.utc),
+    ),
+    "vietnamnet": (
+        VietnamNetCrawler, "https://vietnamnet.vn/",
+        "https://vietnamnet.vn/hoc-sinh-ha-noi-nghi-tet-nguyen-dan-9-ngay-2359713.html",
+        "Học sinh Hà Nội nghỉ Tết Nguyên đán 9 ngày", datetime(2025, 1, 6, 3, 45, tzinfo=timezone.utc),
+    ),
+    "bbc": (
+        BBCCrawler, "https://www.bbc.com/news",
+        "https://www.bbc.com/news/articles/c0l8z1pd1d5o",
+        "Heathrow third runway backed by government", datetime(2025, 1, 29, 10, 2, 14, tzinfo=timezone.utc),
+    ),
+}
+
+
+@pytest.fixture(autouse=True)
+def fast_parse_setting(monkeypatch):
+    monkeypatch.setattr(settings, "crawl_fast_parse", True)
+
+
+def _parse(name: str, fast_parse: bool):
+    crawler_cls, source_url, url, _, _ = PAGES[name]
+    crawler = crawler_cls(source_url)
+    crawler.fast_parse = fast_parse
+    assert crawler._fast_parse_enabled() is fast_parse
+    return crawler._parse_article(url, (ARTICLE_FIXTURES / f"{name}.html").read_bytes())
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_fast_parse_matches_full_parse(name):
+    full = _parse(name, fast_parse=False)
+    fast = _parse(name, fast_parse=True)
+
+    assert full is not None
+    assert fast == full
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_profile_extraction(name):
+    _, _, url, title, published_date = PAGES[name]
+
+    article = _parse(name, fast_parse=True)
+
+    assert article.url == url
+    assert article.title == title
+    assert article.published_date == published_date
+    assert len(article.content) >= 100
+
+
+def test_link_url_kept_when_canonical_differs():
+    crawler_cls, source_url, url, _, _ = PAGES["thanh_nien"]
+    html = (ARTICLE_FIXTURES / "thanh_nien.html").read_bytes()
+
+    fetched_as_canonical = crawler_cls(source_url)._parse_article(url, html)
+    fetched_as_variant = crawler_cls(source_url)._parse_article("https://thanhnien.vn/gia-xang-dau-giam-185250109151234567.htm?utm_source=home", html)
+
+    assert fetched_as_canonical.link_url is None
+    assert fetched_as_variant.url == url
+    assert fetched_as_variant.link_url == "https://thanhnien.vn/gia-xang-dau-giam-185250109151234567.htm"
+
+
+def test_fallbacks_that_never_match_are_tried_last():
+    crawler = ThanhNienCrawler("https://thanhnien.vn/")
+    tried = []
+
+    def extract(candidate):
+        tried.append(candidate)
+        return candidate if candidate in present else None
+
+    # The specific selector never matches on this site, the generic one always does
+    present = {"generic"}
+    for _ in range(SKIP_UNMATCHED_AFTER):
+        assert crawler._first_match("title", ["specific", "generic"], extract) == "generic"
+    assert tried == ["specific", "generic"] * SKIP_UNMATCHED_AFTER
+
+    tried.clear()
+    assert crawler._first_match("title", ["specific", "generic"], extract) == "generic"
+    assert tried == ["generic"]
+
+    # Still used when nothing else matches, and in declared order again once it has matched
+    present = {"specific"}
+    assert crawler._first_match("title", ["specific", "generic"], extract) == "specific"
+    present = {"specific", "generic"}
+    assert crawler._first_match("title", ["specific", "generic"], extract) == "specific"
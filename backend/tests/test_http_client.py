@@ -0,0 +1,106 @@
+"""
+Pooled transport: requests, httpx errors and the DNS cache, against a local server
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.services.crawler import http_client
+from src.services.crawler.http_client import PooledTransport
+
+
+async def _serve(handler):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _ok(reader, writer):
+    # Keep-alive: answer every request of the connection until the client closes it
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok")
+            await writer.drain()
+    except asyncio.IncompleteReadError:
+        writer.close()
+
+
+async def _stall(reader, writer):
+    await reader.readuntil(b"\r\n\r\n")
+    await asyncio.sleep(5)
+
+
+def test_request_through_dns_cache():
+    async def run():
+        server, port = await _serve(_ok)
+        async with server, httpx.AsyncClient(transport=PooledTransport(dns_cache_ttl=60)) as client:
+            first = await client.get(f"http://localhost:{port}/")
+            second = await client.get(f"http://localhost:{port}/")
+        return first, second, port
+
+    http_client._dns_cache.clear()
+    first, second, port = asyncio.run(run())
+
+    assert (first.status_code, first.text) == (200, "ok")
+    assert second.text == "ok"
+    assert ("localhost", port) in http_client._dns_cache
+
+
+def test_errors_are_raised_as_httpx_errors():
+    async def run(url, timeout=None):
+        async with httpx.AsyncClient(transport=PooledTransport(), timeout=timeout) as client:
+            await client.get(url)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run("http://127.0.0.1:1/"))
+
+    async def stalled():
+        server, port = await _serve(_stall)
+        async with server:
+            await run(f"http://127.0.0.1:{port}/", timeout=0.2)
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(stalled())
+
+
+def test_dns_cache_falls_back_to_the_next_address():
+    async def run():
+        server, port = await _serve(_ok)
+        # The first cached address refuses connections, the second answers
+        http_client._dns_cache[("localhost", port)] = (time.monotonic() + 60, ["127.0.0.2", "127.0.0.1"])
+        async with server, httpx.AsyncClient(transport=PooledTransport(dns_cache_ttl=60)) as client:
+            response = await client.get(f"http://localhost:{port}/")
+        return response, port
+
+    http_client._dns_cache.clear()
+    response, port = asyncio.run(run())
+
+    assert response.text == "ok"
+    assert http_client._dns_cache[("localhost", port)][1] == ["127.0.0.1", "127.0.0.2"]
+
+
+def test_dns_cache_drops_hosts_that_cannot_be_reached():
+    async def run():
+        async with httpx.AsyncClient(transport=PooledTransport(dns_cache_ttl=60)) as client:
+            await client.get("http://localhost:1/")
+
+    http_client._dns_cache.clear()
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run())
+
+    assert ("localhost", 1) not in http_client._dns_cache
+
+
+def test_dns_cache_evicts_expired_entries_first(monkeypatch):
+    monkeypatch.setattr(http_client, "DNS_CACHE_MAX_ENTRIES", 2)
+    http_client._dns_cache.clear()
+    now = time.monotonic()
+
+    http_client._cache_addresses(("fresh", 80), now + 60, ["10.0.0.1"])
+    http_client._cache_addresses(("expired", 80), now - 1, ["10.0.0.2"])
+    http_client._cache_addresses(("new", 80), now + 60, ["10.0.0.3"])
+    assert set(http_client._dns_cache) == {("fresh", 80), ("new", 80)}
+
+    http_client._cache_addresses(("newer", 80), now + 60, ["10.0.0.4"])
+    assert set(http_client._dns_cache) == {("new", 80), ("newer", 80)}
@@ -0,0 +1,56 @@
+"""
+Generic main-content extraction on saved article pages
+
+Every fixtures/articles/<name>.html page (menus, share bars, related boxes,
+comments, sidebars and footers around the article) has the article text
+expected from it in <name>.txt, one paragraph per blank-line separated block.
+"""
+from pathlib import Path
+
+import pytest
+
+from src.services.crawler.parsing import make_soup
+from src.services.crawler.readability import extract_main_content
+from src.services.crawler.rss_parser import RSSParser
+
+ARTICLE_FIXTURES = Path(__file__).parent / "fixtures" / "articles"
+PAGES = sorted(path.stem for path in ARTICLE_FIXTURES.glob("*.html"))
+
+
+def _expected_paragraphs(name: str) -> list:
+    return (ARTICLE_FIXTURES / f"{name}.txt").read_text(encoding="utf-8").strip().split("\n\n")
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_extracts_article_paragraphs(name):
+    html = (ARTICLE_FIXTURES / f"{name}.html").read_bytes()
+
+    content = extract_main_content(make_soup(html))
+
+    assert content is not None
+    assert content.split("\n\n") == _expected_paragraphs(name)
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_rss_full_article_is_the_cleaned_article_text(name):
+    html = (ARTICLE_FIXTURES / f"{name}.html").read_bytes()
+
+    content = RSSParser("https://example.com/rss")._extract_full_article(html)
+
+    assert content == " ".join(" ".join(_expected_paragraphs(name)).split())
+
+
+def test_boilerplate_named_main_column_is_extracted_again():
+    # VnExpress names its main column "sidebar-1"
+    html = (ARTICLE_FIXTURES / "vnexpress.html").read_bytes()
+
+    content = extract_main_content(make_soup(html))
+
+    assert content is not None
+    assert content.startswith("Không khí lạnh tăng cường")
+
+
+def test_page_without_article_text():
+    html = b"<html><body><nav><a href='/'>Home</a></nav><footer><p>Copyright 2025, all rights reserved.</p></footer></body></html>"
+
+    assert extract_main_content(make_soup(html)) is None
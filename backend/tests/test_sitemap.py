@@ -0,0 +1,64 @@
+"""
+Sitemap streaming: entries of plain and gzipped files, and the same limits as article pages
+"""
+import asyncio
+import gzip
+
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.services.crawler.engine import ContentRejectedError, CrawlEngine
+from src.services.crawler.sitemap import iter_sitemap
+
+SITEMAP_URL = "https://example.com/sitemap.xml"
+
+
+def _sitemap(count: int) -> bytes:
+    urls = "".join(
+        f"<url><loc>https://example.com/tin-{i}.htm</loc><lastmod>2025-01-09T08:00:00+07:00</lastmod></url>"
+        for i in range(count)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'.encode()
+
+
+def _entries(content: bytes, content_type: str):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": content_type}, content=content)
+
+    async def run():
+        async with CrawlEngine(transport=httpx.MockTransport(handler)) as engine:
+            return [entry async for entry in iter_sitemap(engine, SITEMAP_URL)]
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def one_mb_pages(monkeypatch):
+    monkeypatch.setattr(settings, "crawl_max_page_mb", 1)
+
+
+def test_plain_and_gzipped_sitemaps():
+    plain = _entries(_sitemap(3), "application/xml")
+    gzipped = _entries(gzip.compress(_sitemap(3)), "application/octet-stream")
+
+    assert [entry.url for entry in plain] == [f"https://example.com/tin-{i}.htm" for i in range(3)]
+    assert gzipped == plain
+
+
+def test_sitemap_larger_than_the_page_cap_is_rejected(one_mb_pages):
+    body = _sitemap(20000)
+    assert len(body) > 1024 * 1024
+
+    with pytest.raises(ContentRejectedError, match="larger than 1 MB"):
+        _entries(body, "application/xml")
+    # Decompressed size counts too, a small gzip file may expand past the cap
+    with pytest.raises(ContentRejectedError, match="larger than 1 MB"):
+        _entries(gzip.compress(body), "application/x-gzip")
+
+
+def test_sitemap_that_is_not_xml_is_rejected():
+    with pytest.raises(ContentRejectedError, match="Not a page"):
+        _entries(b"\xff\xd8\xff\xe0", "image/jpeg")
+    with pytest.raises(ContentRejectedError, match="Binary file"):
+        _entries(b"%PDF-1.7", "text/xml")
@@ -0,0 +1,70 @@
+"""
+Links whose page names another rel=canonical URL are known after the first crawl
+"""
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.database.models import Article, HttpValidator, SourceCrawlState
+from src.repositories import SourceRepository
+from src.services.crawler.service import CrawlerService
+
+ARTICLE_FIXTURES = Path(__file__).parent / "fixtures" / "articles"
+
+SOURCE_URL = "https://thanhnien.vn/"
+# Old slug with a tracking parameter; the page's rel=canonical has the current slug
+LINK = "/gia-xang-dau-giam-185250109151234567.htm?utm_source=home"
+CANONICAL_URL = "https://thanhnien.vn/gia-xang-dau-dong-loat-giam-tu-15-gio-chieu-nay-185250109151234567.htm"
+
+
+class SiteTransport(httpx.AsyncBaseTransport):
+    """A homepage (changing on every request) linking to one article, counting article fetches"""
+
+    def __init__(self):
+        self.homepages = 0
+        self.article_fetches = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        html = {"content-type": "text/html; charset=utf-8"}
+        if request.url.path == "/":
+            self.homepages += 1
+            body = (
+                f'<html><body><p>Cập nhật lần {self.homepages}</p>'
+                f'<h3><a class="box-category-link-title" href="{LINK}">Giá xăng dầu giảm</a></h3></body></html>'
+            )
+            return httpx.Response(200, headers=html, content=body.encode("utf-8"))
+        if request.url.path == "/gia-xang-dau-giam-185250109151234567.htm":
+            self.article_fetches += 1
+            return httpx.Response(200, headers=html, content=(ARTICLE_FIXTURES / "thanh_nien.html").read_bytes())
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def source(db):
+    repo = SourceRepository(db)
+    if repo.get_by_url(SOURCE_URL):
+        pytest.skip(f"{SOURCE_URL} is already a source, use a scratch database")
+    source = repo.create("Thanh Niên", SOURCE_URL, "bao-thanh-nien")
+    try:
+        yield source
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source_id == source.id).delete(synchronize_session=False)
+        db.query(SourceCrawlState).filter(SourceCrawlState.source_id == source.id).delete(synchronize_session=False)
+        db.query(HttpValidator).filter(HttpValidator.url == SOURCE_URL).delete(synchronize_session=False)
+        db.commit()
+        repo.delete(source.id)
+
+
+def test_link_to_other_canonical_url_is_fetched_once(db, source):
+    transport = SiteTransport()
+
+    first = asyncio.run(CrawlerService(db, transport=transport).crawl_source(source))
+    second = asyncio.run(CrawlerService(db, transport=transport).crawl_source(source))
+
+    assert [article.url for article in first] == [CANONICAL_URL]
+    assert second == []
+    assert transport.homepages == 2
+    assert transport.article_fetches == 1